@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Aim - Erwartungswert-Heatmaps und optimaler Zielpunkt je Streuung
+
+Ein Spieler mit Streuung ``sigma`` (mm pro Achse, wie im Simulator) trifft
+beim Zielen auf a den Punkt a + e mit e ~ N(0, sigma²). Der Erwartungswert
+für jeden Zielpunkt ist die Faltung der Punkte-Karte des Boards mit dem
+Gauß-Kern, für alle Zielpunkte auf einmal per FFT:
+
+    Punkte-Karte   Raster über das Board (``step`` mm pro Zelle), jede Zelle
+                   der Mittelwert aus ``supersample``² Abtastpunkten, außerhalb
+                   des Double-Rings 0
+    Kern           exp(-r² / 2 sigma²) / (2 pi sigma²) * step², abgeschnitten
+                   bei 4 sigma (höchstens auf Board-Breite)
+    Heatmap        irfft2(rfft2(Karte) * rfft2(Kern)), auf das Board zugeschnitten
+
+Mit ``target=max`` ist die Karte die Punktzahl (Erwartungswert pro Dart),
+mit einem Segment (z.B. ``D16``) die Indikator-Karte des Segments (Trefferquote).
+Bei 1 mm Raster kostet eine Heatmap einige zehn Millisekunden. Heatmaps
+werden je (sigma auf 0.1 mm, Ziel) in einem LRU-Cache gehalten, eine
+wiederholte Abfrage ist damit ein Dictionary-Zugriff.
+
+Konfiguration im Abschnitt 'aim' der ``autodarts_config.json``::
+
+    "aim": {"step": 1.0, "supersample": 2, "min_sigma": 1.0, "max_sigma": 100.0, "cache_size": 32}
+
+NumPy wird benötigt, ``GET /aim`` antwortet ohne NumPy mit 503.
+"""
+
+import json
+import logging
+import math
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from autodarts_board_geometry import (DOUBLE_OUTER, SEGMENT_CODES, aim_point, code_points,
+                                      segment_at, segment_codes)
+from autodarts_segments import MISS, lookup
+
+logger = logging.getLogger(__name__)
+
+MAX_TARGET = 'max'
+DEFAULT_STEP = 1.0
+DEFAULT_SUPERSAMPLE = 2
+DEFAULT_MIN_SIGMA = 1.0
+DEFAULT_MAX_SIGMA = 100.0
+DEFAULT_CACHE_SIZE = 32
+KERNEL_SIGMAS = 4.0
+REFERENCE_AIM = 'T20'
+
+
+def load_aim_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'aim' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('aim', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Aim-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+def _fft_size(n):
+    """Kleinste Länge >= n aus Faktoren 2, 3 und 5 (schnelle FFT-Größe)"""
+    while True:
+        m = n
+        for factor in (2, 3, 5):
+            while m % factor == 0:
+                m //= factor
+        if m == 1:
+            return n
+        n += 1
+
+
+class AimEngine:
+    """Heatmaps per FFT-Faltung und bester Zielpunkt je sigma und Ziel"""
+
+    def __init__(self, step=DEFAULT_STEP, supersample=DEFAULT_SUPERSAMPLE, min_sigma=DEFAULT_MIN_SIGMA,
+                 max_sigma=DEFAULT_MAX_SIGMA, cache_size=DEFAULT_CACHE_SIZE):
+        if np is None:
+            raise RuntimeError("numpy ist nicht installiert - Aim-Heatmaps nicht verfügbar")
+        self.step = float(step)
+        self.supersample = max(1, int(supersample))
+        self.min_sigma = float(min_sigma)
+        self.max_sigma = float(max_sigma)
+        self.cache_size = int(cache_size)
+        # Zellmittelpunkte bei (i - half) * step, das Raster deckt das ganze Board ab
+        self.half = int(math.ceil(DOUBLE_OUTER / self.step))
+        self.size = 2 * self.half + 1
+        self._maps = {}
+        self._heatmaps = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path='autodarts_config.json'):
+        """Erzeugt die Engine mit Raster und Cache-Größe aus der Konfigurationsdatei"""
+        config = load_aim_config(path)
+        return cls(
+            step=config.get('step', DEFAULT_STEP),
+            supersample=config.get('supersample', DEFAULT_SUPERSAMPLE),
+            min_sigma=config.get('min_sigma', DEFAULT_MIN_SIGMA),
+            max_sigma=config.get('max_sigma', DEFAULT_MAX_SIGMA),
+            cache_size=config.get('cache_size', DEFAULT_CACHE_SIZE)
+        )
+
+    def target(self, value):
+        """Normalisiertes Ziel ('max' oder Segment-Bezeichnung), None wenn ungültig"""
+        if value is None or str(value).strip().lower() == MAX_TARGET:
+            return MAX_TARGET
+        segment = lookup(value)
+        if segment is None or segment is MISS:
+            return None
+        return segment.label
+
+    def _codes(self):
+        """Segment-Codes aller Abtastpunkte, Form (size, size, supersample²)"""
+        codes = self._maps.get('codes')
+        if codes is None:
+            k = self.supersample
+            offsets = (np.arange(k) + 0.5) / k - 0.5
+            centers = (np.arange(self.size) - self.half) * self.step
+            axis = (centers[:, None] + offsets[None, :] * self.step).ravel()
+            # Zeile = y (oben positiv), Spalte = x
+            y = axis[::-1][:, None]
+            x = axis[None, :]
+            codes = segment_codes(np.broadcast_to(x, (axis.size, axis.size)),
+                                  np.broadcast_to(y, (axis.size, axis.size)))
+            codes = codes.reshape(self.size, k, self.size, k).transpose(0, 2, 1, 3).reshape(self.size, self.size, k * k)
+            self._maps['codes'] = codes
+        return codes
+
+    def score_map(self, target):
+        """Punkte-Karte (max) bzw. Indikator-Karte eines Segments, je Zelle gemittelt"""
+        board = self._maps.get(target)
+        if board is None:
+            codes = self._codes()
+            if target == MAX_TARGET:
+                values = code_points().astype(np.float64)[codes]
+            else:
+                values = (codes == SEGMENT_CODES[lookup(target)]).astype(np.float64)
+            board = self._maps[target] = values.mean(axis=2)
+        return board
+
+    def _kernel(self, sigma, radius, shape):
+        offsets = np.arange(-radius, radius + 1) * self.step
+        # Dichte * Zellfläche, separabel in x und y
+        g = np.exp(-offsets ** 2 / (2 * sigma ** 2)) * (self.step / (math.sqrt(2 * math.pi) * sigma))
+        return np.fft.rfft2(np.outer(g, g), shape)
+
+    def _compute(self, sigma, target):
+        board = self.score_map(target)
+        # Treffer weiter als eine Board-Breite vom Zielpunkt liegen immer daneben
+        radius = min(int(math.ceil(KERNEL_SIGMAS * sigma / self.step)), self.size - 1)
+        n = _fft_size(self.size + 2 * radius)
+        kernel = self._kernel(sigma, radius, (n, n))
+        full = np.fft.irfft2(np.fft.rfft2(board, (n, n)) * kernel, (n, n))
+        heatmap = full[radius:radius + self.size, radius:radius + self.size]
+        # Rundungsrauschen der FFT (~1e-16) nicht als negative Werte durchreichen
+        return np.maximum(heatmap, 0.0)
+
+    def _entry(self, sigma, target):
+        """(Heatmap, Zelle des Maximums) aus dem Cache, beim ersten Mal berechnet"""
+        key = (round(float(sigma), 1), target)
+        with self._lock:
+            entry = self._heatmaps.get(key)
+            if entry is not None:
+                self._heatmaps.move_to_end(key)
+                return entry
+        # Außerhalb des Locks rechnen, damit Cache-Treffer nicht auf eine kalte Heatmap warten
+        heatmap = self._compute(key[0], target)
+        heatmap.setflags(write=False)
+        row, col = np.unravel_index(int(np.argmax(heatmap)), heatmap.shape)
+        entry = (heatmap, (int(row), int(col)))
+        with self._lock:
+            self._heatmaps[key] = entry
+            if len(self._heatmaps) > self.cache_size:
+                self._heatmaps.popitem(last=False)
+        return entry
+
+    def heatmap(self, sigma, target=MAX_TARGET):
+        """Heatmap (Zeile = y von oben, Spalte = x) für sigma und Ziel, aus dem Cache wenn vorhanden"""
+        return self._entry(sigma, target)[0]
+
+    def _cell(self, x, y):
+        col = min(max(int(round(x / self.step)) + self.half, 0), self.size - 1)
+        row = min(max(self.half - int(round(y / self.step)), 0), self.size - 1)
+        return row, col
+
+    def _point(self, heatmap, x, y, value_name):
+        segment = segment_at(x, y)
+        return {'x': round(x, 1), 'y': round(y, 1), 'segment': segment.label,
+                value_name: round(float(heatmap[self._cell(x, y)]), 4)}
+
+    def best(self, sigma, target=MAX_TARGET, heatmap_step=None):
+        """Antwort für /aim: bester Zielpunkt, Vergleichspunkt und optional die Heatmap
+
+        Der Vergleichspunkt ist bei 'max' die Mitte der T20, sonst die Mitte
+        des Zielsegments. heatmap_step (mm, Vielfaches von step) hängt die
+        ausgedünnte Heatmap an.
+        """
+        sigma = round(float(sigma), 1)
+        heatmap, (row, col) = self._entry(sigma, target)
+        value_name = 'expected' if target == MAX_TARGET else 'probability'
+        best_x, best_y = (col - self.half) * self.step, (self.half - row) * self.step
+        reference = aim_point(REFERENCE_AIM if target == MAX_TARGET else target)
+        result = {
+            'success': True,
+            'sigma': sigma,
+            'target': target,
+            'aim': self._point(heatmap, best_x, best_y, value_name),
+            'reference': self._point(heatmap, *reference, value_name)
+        }
+        if heatmap_step:
+            stride = max(1, int(round(heatmap_step / self.step)))
+            # Ausdünnen symmetrisch um den Mittelpunkt, damit (0, 0) enthalten bleibt
+            start = self.half % stride
+            sampled = heatmap[start::stride, start::stride]
+            result['heatmap'] = {
+                'step': stride * self.step,
+                'origin': [(start - self.half) * self.step, (self.half - start) * self.step],
+                'values': np.round(sampled, 3).tolist()
+            }
+        return result
+
+    def valid_sigma(self, sigma):
+        return math.isfinite(sigma) and self.min_sigma <= sigma <= self.max_sigma
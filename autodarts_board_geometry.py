@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Board Geometry - Dartboard-Geometrie und Abbildung (x, y) -> Segment
+
+Koordinaten in Millimetern vom Board-Mittelpunkt, x nach rechts, y nach
+oben (die 20 liegt oben). Maße nach den Regeln des Dartverbands:
+
+    Bullseye           r <= 6.35
+    Single Bull        r <= 15.9
+    Triple-Ring        99 < r <= 107
+    Double-Ring        162 < r <= 170
+    außerhalb          r > 170 ist ein Miss
+
+Die Sektoren sind 18° breit, die 20 ist um 0° (oben) zentriert, im
+Uhrzeigersinn folgen 1, 18, 4, ...
+
+Segmente werden intern als kompakte Codes geführt, damit ganze Arrays mit
+einem Aufruf abgebildet werden können:
+
+    0        Miss
+    1-20     S1-S20
+    21-40    D1-D20
+    41-60    T1-T20
+    61, 62   Single Bull (25), Bullseye (50)
+
+``CODE_SEGMENTS[code]`` ist der zugehörige ``Segment``-Eintrag aus
+``autodarts_segments``. ``segment_at`` bildet einen Punkt in reinem Python ab,
+``segment_codes`` ganze NumPy-Arrays (NumPy ist optional und wird nur dafür
+gebraucht).
+
+``segment_codes`` rechnet nur Radius und ``arctan2`` und liest Ring und
+Sektor dann aus zwei vorberechneten Tabellen:
+
+    Radius   0.05 mm pro Eintrag bis zum Double-Ring, Ring-Basis und ob die
+             Sektor-Zahl addiert wird
+    Winkel   0.1° pro Eintrag, Sektor-Zahl
+
+Alle Ring- und Sektorgrenzen liegen auf Vielfachen dieser Schrittweiten, die
+Tabellen sind also bis auf Rundung direkt auf dem Draht exakt. 100.000 Punkte
+werden so in wenigen Millisekunden abgebildet.
+"""
+
+import math
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from autodarts_segments import BULLSEYE, MISS, SEGMENTS, SINGLE_BULL
+
+BULLSEYE_RADIUS = 6.35
+BULL_RADIUS = 15.9
+TRIPLE_INNER = 99.0
+TRIPLE_OUTER = 107.0
+DOUBLE_INNER = 162.0
+DOUBLE_OUTER = 170.0
+SECTOR_ANGLE = 18.0
+
+SECTOR_ORDER = (20, 1, 18, 4, 13, 6, 10, 15, 2, 17, 3, 19, 7, 16, 8, 11, 14, 9, 12, 5)
+
+# Ringe von innen nach außen: Obergrenze des Radius, Code-Basis, Sektor-Zahl addieren
+RING_EDGES = (BULLSEYE_RADIUS, BULL_RADIUS, TRIPLE_INNER, TRIPLE_OUTER, DOUBLE_INNER, DOUBLE_OUTER)
+RING_BASE = (62, 61, 0, 40, 0, 20, 0)
+RING_NUMBERED = (0, 0, 1, 1, 1, 1, 0)
+
+CODE_SEGMENTS = ((MISS,)
+                 + tuple(SEGMENTS[f'S{n}'] for n in range(1, 21))
+                 + tuple(SEGMENTS[f'D{n}'] for n in range(1, 21))
+                 + tuple(SEGMENTS[f'T{n}'] for n in range(1, 21))
+                 + (SINGLE_BULL, BULLSEYE))
+SEGMENT_CODES = {segment: code for code, segment in enumerate(CODE_SEGMENTS)}
+
+RADIUS_STEP = 0.05
+ANGLE_BINS = 3600
+
+# Mittlerer Radius der Ringe, auf die beim Zielen gehalten wird
+_AIM_RADIUS = {1: (TRIPLE_OUTER + DOUBLE_INNER) / 2, 2: (DOUBLE_INNER + DOUBLE_OUTER) / 2,
+               3: (TRIPLE_INNER + TRIPLE_OUTER) / 2}
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("numpy ist nicht installiert - vektorisierte Board-Geometrie nicht verfügbar")
+
+
+def segment_at(x, y):
+    """Segment-Eintrag für einen Punkt (mm), Miss außerhalb des Double-Rings und für NaN"""
+    r = math.hypot(x, y)
+    if not r <= DOUBLE_OUTER:
+        return MISS
+    ring = 0
+    while ring < len(RING_EDGES) and r > RING_EDGES[ring]:
+        ring += 1
+    if not RING_NUMBERED[ring]:
+        return CODE_SEGMENTS[RING_BASE[ring]]
+    angle = math.degrees(math.atan2(x, y)) % 360.0
+    number = SECTOR_ORDER[int((angle + SECTOR_ANGLE / 2) // SECTOR_ANGLE) % 20]
+    return CODE_SEGMENTS[RING_BASE[ring] + number]
+
+
+@lru_cache(maxsize=None)
+def _lookup_tables():
+    """Radius- und Winkel-Tabellen für segment_codes, einmal beim ersten Aufruf gebaut"""
+    radius_bins = int(round(DOUBLE_OUTER / RADIUS_STEP)) + 2
+    # Eintrag k deckt (k-1, k] * RADIUS_STEP ab, der letzte alles außerhalb
+    # Division statt Multiplikation, damit k / 20 genau die Grenzen (6.35, 15.9) trifft
+    radii = np.arange(radius_bins) / (1.0 / RADIUS_STEP)
+    ring = np.searchsorted(np.asarray(RING_EDGES), radii, side='left')
+    ring[-1] = len(RING_EDGES)
+    base = np.asarray(RING_BASE, dtype=np.uint8)[ring]
+    numbered = np.asarray(RING_NUMBERED, dtype=np.uint8)[ring]
+
+    # Eintrag k deckt [k, k+1) * 0.1° im Uhrzeigersinn ab 0° (oben) ab
+    angles = np.arange(ANGLE_BINS) / (ANGLE_BINS / 360.0)
+    sector = ((angles + SECTOR_ANGLE / 2) // SECTOR_ANGLE).astype(np.intp) % 20
+    numbers = np.asarray(SECTOR_ORDER, dtype=np.uint8)[sector]
+    return base, numbered, numbers
+
+
+def segment_codes(x, y):
+    """Segment-Codes für Arrays von Koordinaten (mm), ein vektorisierter Aufruf
+
+    Punkte außerhalb des Double-Rings, unendliche und NaN-Koordinaten sind Miss.
+    """
+    _require_numpy()
+    base, numbered, numbers = _lookup_tables()
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        # x*x + y*y und sqrt sind deutlich schneller als np.hypot
+        radius = np.sqrt(x * x + y * y) * (1.0 / RADIUS_STEP)
+        # Vor dem Cast begrenzen: riesige Radien liefen sonst über, fmin macht aus NaN den Miss-Eintrag
+        ring = np.ceil(np.fmin(radius, len(base) - 1)).astype(np.intp)
+        angle = np.arctan2(x, y) * (ANGLE_BINS / (2 * math.pi))
+        sector = np.floor(np.fmax(angle, -ANGLE_BINS)).astype(np.intp)
+
+    # clip: alles außerhalb des Double-Rings landet im letzten Eintrag (Miss),
+    # wrap: negative Winkel (links der 20) zählen vom Tabellenende
+    return base.take(ring, mode='clip') + numbered.take(ring, mode='clip') * numbers.take(sector, mode='wrap')
+
+
+def map_points(xs, ys):
+    """Segment-Einträge für Listen von Koordinaten, vektorisiert wenn NumPy vorhanden ist"""
+    if np is None:
+        return [segment_at(x, y) for x, y in zip(xs, ys)]
+    return [CODE_SEGMENTS[code] for code in segment_codes(xs, ys).tolist()]
+
+
+def code_points():
+    """Punkte je Segment-Code als Array (Index = Code)"""
+    _require_numpy()
+    return np.array([segment.points for segment in CODE_SEGMENTS], dtype=np.int16)
+
+
+def aim_point(label):
+    """Zielpunkt (x, y) in der Mitte eines Segments, ValueError bei unbekanntem Segment"""
+    segment = SEGMENTS.get(str(label).strip().upper())
+    if segment is None or segment is MISS:
+        raise ValueError(f"Kein Zielpunkt für Segment {label!r}")
+    if segment is BULLSEYE:
+        return 0.0, 0.0
+    if segment is SINGLE_BULL:
+        return 0.0, (BULLSEYE_RADIUS + BULL_RADIUS) / 2
+    angle = math.radians(SECTOR_ORDER.index(segment.number) * SECTOR_ANGLE)
+    radius = _AIM_RADIUS[segment.multiplier]
+    return radius * math.sin(angle), radius * math.cos(angle)
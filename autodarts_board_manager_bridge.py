@@ -8,26 +8,47 @@ import json
 import logging
 import time
 import threading
-import requests
 import subprocess
 import websocket
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
-import re
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, StatusField, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_capture import StreamCapture
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_http_client import get_http_client
+from autodarts_poller import AdaptivePoller
+from autodarts_board_status import parse_status
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server
+from autodarts_ws_server import BroadcastServer
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class AutodartsBoardManagerBridge:
+    # Änderungen lösen ein 'status'-Event aus und invalidieren den Response-Cache
+    board_connected = StatusField()
+
     def __init__(self):
         self.board_manager_url = "http://192.168.2.72:3180"  # Von deinen Logs
         self.last_score = 0
-        self.score_history = []
+        self.score_history = ScoreHistory.from_config()
+        # Sequenznummer und Journal-Reihenfolge gemeinsam vergeben (HTTP- und Poll-Threads)
+        self._history_lock = threading.Lock()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.http = get_http_client()
+        self.journal = ThrowJournal.from_config('board_manager')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
+        self.capture = StreamCapture.from_config('board_manager')
         self.board_connected = False
         self.auto_score_active = False
         self.score_polling_thread = None
         self.stop_polling = threading.Event()
+        # Jede Poll-Antwort (auch fehlgeschlagene) geht an die Aufzeichnung, falls aktiv
+        self.poller = AdaptivePoller.from_config(lambda: self.capture.poll(self.fetch_board_status()))
         self.logger = logging.getLogger(__name__)
         
         # Prüfe Board Manager Verbindung
@@ -41,7 +62,7 @@ class AutodartsBoardManagerBridge:
     def check_board_manager(self):
         """Überprüft ob der Board Manager erreichbar ist"""
         try:
-            response = requests.get(f"{self.board_manager_url}/api/board/status", timeout=5)
+            response = self.http.get(f"{self.board_manager_url}/api/board/status", timeout=5)
             if response.status_code == 200:
                 self.board_connected = True
                 logger.info(f"✅ Board Manager verbunden: {self.board_manager_url}")
@@ -59,7 +80,7 @@ class AutodartsBoardManagerBridge:
             return None
             
         try:
-            response = requests.get(f"{self.board_manager_url}/api/board/status", timeout=2)
+            response = self.http.get(f"{self.board_manager_url}/api/board/status", timeout=2)
             if response.status_code == 200:
                 return response.text
             else:
@@ -70,71 +91,8 @@ class AutodartsBoardManagerBridge:
             return None
 
     def parse_score_from_status(self, status_text):
-        """Parst Score aus dem Board Status"""
-        try:
-            # Suche nach "Throw detected" und Segment-Informationen
-            if "Throw detected" in status_text:
-                # Suche nach Segment-Patterns
-                segment_patterns = [
-                    r'segment[=:]\s*([A-Z0-9]+)',
-                    r'Segment[=:]\s*([A-Z0-9]+)',
-                    r'([A-Z]\d+)',  # D7, T20, S20, etc.
-                    r'(\d+)'  # Einfache Zahlen
-                ]
-                
-                for pattern in segment_patterns:
-                    matches = re.findall(pattern, status_text, re.IGNORECASE)
-                    if matches:
-                        segment = matches[0]
-                        score = self.parse_segment_to_score(segment)
-                        if score > 0:
-                            return score
-            
-            # Suche nach Score-Patterns
-            score_patterns = [
-                r'score[=:]\s*(\d+)',
-                r'points[=:]\s*(\d+)',
-                r'value[=:]\s*(\d+)'
-            ]
-            
-            for pattern in score_patterns:
-                matches = re.findall(pattern, status_text, re.IGNORECASE)
-                if matches:
-                    return int(matches[0])
-            
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Score-Parsing Fehler: {e}")
-            return None
-
-    def parse_segment_to_score(self, segment):
-        """Parst Dart-Segment zu Score"""
-        try:
-            if not segment:
-                return 0
-                
-            # Double (D7 = 14)
-            if segment.startswith('D'):
-                return int(segment[1:]) * 2
-            # Triple (T20 = 60)
-            elif segment.startswith('T'):
-                return int(segment[1:]) * 3
-            # Single (S20 = 20)
-            elif segment.startswith('S'):
-                return int(segment[1:])
-            # Bull (BULL = 50)
-            elif segment.upper() == 'BULL':
-                return 50
-            # Miss (M = 0)
-            elif segment.startswith('M'):
-                return 0
-            # Einfache Zahl
-            else:
-                return int(segment)
-                
-        except ValueError:
-            return 0
+        """Parst Score aus dem Board Status (Punkte des neuesten Darts oder explizite Punktzahl)"""
+        return parse_status(status_text).points
 
     def start_score_polling(self):
         """Startet das Polling für Scores vom Board Manager"""
@@ -145,6 +103,7 @@ class AutodartsBoardManagerBridge:
         self.stop_polling.clear()
         self.score_polling_thread = threading.Thread(target=self._score_polling_worker, daemon=True)
         self.score_polling_thread.start()
+        self.events.publish('status', {'auto_score_active': True})
         logger.info("▶️ Board Manager Score-Polling gestartet")
 
     def stop_score_polling(self):
@@ -155,35 +114,43 @@ class AutodartsBoardManagerBridge:
         self.auto_score_active = False
         self.stop_polling.set()
         self.score_polling_thread.join(timeout=1)
+        self.events.publish('status', {'auto_score_active': False})
         logger.info("⏹️ Board Manager Score-Polling gestoppt")
 
     def _score_polling_worker(self):
-        """Worker Thread für das Abrufen von Scores vom Board Manager"""
+        """Worker Thread für das Abrufen von Scores vom Board Manager
+
+        Ein Wurf ist ein Übergang in einen neuen "Throw detected"-Status, nicht
+        ein anderer Score als zuletzt. Unveränderte Status werden nicht geparst.
+        """
         while not self.stop_polling.is_set():
             try:
                 if self.board_connected:
-                    status = self.fetch_board_status()
-                    if status:
-                        score = self.parse_score_from_status(status)
-                        if score is not None and score > 0 and score != self.last_score:
+                    change = self.poller.poll()
+                    if change is None:
+                        # Board Manager nicht erreichbar - Fallback
+                        import random
+                        fallback_score = random.choice([20, 25, 30, 40, 50, 60, 100, 120, 180])
+                        self.add_score(fallback_score, "board_manager_offline")
+                    elif change.throw:
+                        score = self.parse_score_from_status(change.text)
+                        if score is not None and score > 0:
                             self.add_score(score, "board_manager")
-                        elif "Throw detected" in status:
+                        else:
                             # Fallback: Generiere Score wenn Throw erkannt aber kein Score geparst
                             import random
                             fallback_score = random.choice([20, 25, 30, 40, 50, 60, 100, 120, 180])
                             self.add_score(fallback_score, "board_manager_fallback")
-                    else:
-                        # Board Manager nicht erreichbar - Fallback
-                        import random
-                        fallback_score = random.choice([20, 25, 30, 40, 50, 60, 100, 120, 180])
-                        self.add_score(fallback_score, "board_manager_offline")
+                    interval = self.poller.next_interval()
                 else:
                     # Board Manager nicht verbunden - Fallback
                     import random
                     fallback_score = random.choice([20, 25, 30, 40, 50, 60, 100, 120, 180])
                     self.add_score(fallback_score, "board_manager_disconnected")
+                    interval = self.poller.base_interval
                 
-                time.sleep(2)  # Poll alle 2 Sekunden
+                # Schnell nach einem Wurf, mit Backoff im Leerlauf
+                self.stop_polling.wait(interval)
                 
             except Exception as e:
                 logger.error(f"Fehler im Score-Polling-Worker: {e}")
@@ -192,11 +159,10 @@ class AutodartsBoardManagerBridge:
     def add_score(self, score, source):
         """Fügt Score zur Historie hinzu"""
         self.last_score = score
-        self.score_history.append({
-            'score': score,
-            'timestamp': time.time(),
-            'source': source
-        })
+        with self._history_lock:
+            entry = self.score_history.append(score, source)
+            self.journal.append(entry)
+        self.events.publish('score', entry)
         
         logger.info(f"🎯 Score empfangen: {score} ({source})")
 
@@ -212,7 +178,17 @@ class AutodartsBoardManagerBridge:
             'board_manager_url': self.board_manager_url
         }
 
-class BoardManagerBridgeHandler(BaseHTTPRequestHandler):
+    def get_score(self):
+        """Gibt den letzten Score zurück"""
+        latest = self.score_history.latest()
+        return {
+            'success': True,
+            'score': self.last_score,
+            'timestamp': latest['timestamp'] if latest else time.time(),
+            'source': 'board_manager'
+        }
+
+class BoardManagerBridgeHandler(BridgeRequestHandler):
     def __init__(self, *args, **kwargs):
         self.bridge = kwargs.pop('bridge')
         super().__init__(*args, **kwargs)
@@ -229,25 +205,26 @@ class BoardManagerBridgeHandler(BaseHTTPRequestHandler):
         self._set_headers()
 
     def do_GET(self):
-        path = urlparse(self.path).path
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
         
         if path == '/status':
-            self._set_headers()
-            self.wfile.write(json.dumps(self.bridge.get_status()).encode())
-        
+            serve_cached(self, self.bridge.responses, 'status', self.bridge.get_status)
+            
         elif path == '/score':
-            self._set_headers()
-            response = {
-                'success': True,
-                'score': self.bridge.last_score,
-                'timestamp': time.time(),
-                'source': 'board_manager'
-            }
-            self.wfile.write(json.dumps(response).encode())
+            serve_cached(self, self.bridge.responses, 'score', self.bridge.get_score)
+            
+        elif path == '/events':
+            stream_events(self, self.bridge.events, parsed_url.query)
 
         elif path == '/scores':
             self._set_headers()
-            self.wfile.write(json.dumps(self.bridge.score_history).encode())
+            cursor = parse_cursor_query(parsed_url.query)
+            if cursor is not None:
+                scores = self.bridge.score_history.since(*cursor)
+            else:
+                scores = self.bridge.score_history.to_list()
+            self.wfile.write(json.dumps(scores).encode())
 
         else:
             self._set_headers(status_code=404)
@@ -286,12 +263,16 @@ class BoardManagerBridgeHandler(BaseHTTPRequestHandler):
 def main():
     bridge = AutodartsBoardManagerBridge()
     handler = lambda *args, **kwargs: BoardManagerBridgeHandler(bridge=bridge, *args, **kwargs)
-    server = HTTPServer(('localhost', 8766), handler)
+    server = create_bridge_server(handler, 8766)
+    push_server = BroadcastServer(bridge.events)
+    push_server.start()
     
     print("🚀 Autodarts Board Manager Bridge läuft auf Port 8766")
     print("📡 Status: http://localhost:8766/status")
     print("🎯 Scores: http://localhost:8766/score")
     print("📊 Score History: http://localhost:8766/scores")
+    print("📣 Live-Events (SSE): http://localhost:8766/events")
+    print(f"🔌 Live-Events (WebSocket): ws://localhost:{push_server.port}")
     print("▶️  Start Auto-Score: http://localhost:8766/start_auto_score")
     print("⏹️  Stop Auto-Score: http://localhost:8766/stop_auto_score")
     print("💡 Tipp: Öffnen Sie http://localhost:8080/index.html")
@@ -304,6 +285,10 @@ def main():
     except KeyboardInterrupt:
         print("\n🛑 Bridge wird gestoppt...")
         bridge.stop_score_polling()
+        push_server.stop()
+        bridge.events.close()
+        bridge.journal.close()
+        bridge.capture.close()
         server.shutdown()
 
 if __name__ == "__main__":
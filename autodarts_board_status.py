@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Board Status - Parser für den Status-Text des Board Managers
+
+``/api/board/status`` liefert Klartext wie
+
+    Throw detected: dart=2 segment=T20
+    Board status: Throw detected (D7), cameras=3
+    Takeout in progress
+
+Der Parser zerlegt den Text mit einer vorberechneten ``bytes.translate``-Tabelle
+und einem ``split()`` in Tokens und geht die Tokens einmal durch. Segment-Labels
+werden in der gemeinsamen Tabelle aus ``autodarts_segments`` nachgeschlagen.
+Ergebnis sind strukturierte Wurf-Events (Segment, Multiplikator, Zahl, Punkte,
+Dart-Index) mit kanonischem Label (``BULL`` wird zu ``50``).
+Erkannt werden:
+
+    Throw detected          Zustand "Wurf erkannt"
+    segment=<label>         Segment eines Darts (auch ``segment:``)
+    dart=<n>, Dart <n>      Dart-Index für das folgende Segment
+    score/points/value=<n>  Explizite Punktzahl
+    S20, D7, T20, BULL ...  freistehende Segment-Labels
+
+Labels gelten nur als ganzes Token (``abcT20`` ist kein Segment). Freistehende
+Zahlen werden bewusst nicht als Segment gelesen, Kamera-Anzahl oder
+Versionsnummern im Text erzeugen also keine Würfe.
+"""
+
+from collections import namedtuple
+from autodarts_segments import SEGMENTS
+
+ThrowEvent = namedtuple('ThrowEvent', 'segment multiplier number points dart')
+
+
+def _separator_table():
+    """bytes.translate-Tabelle: ASCII-Großbuchstaben klein, Satzzeichen zu Leerzeichen"""
+    table = bytearray(range(256))
+    for code in range(128):
+        char = chr(code)
+        if char.isupper():
+            table[code] = ord(char.lower())
+        elif not char.isalnum() and not char.isspace():
+            table[code] = ord(' ')
+    return bytes(table)
+
+
+_SEPARATORS = _separator_table()
+
+# Freistehend (ohne "segment=" davor) zählen nur Labels mit S/D/T-Präfix und
+# eindeutige Bull-/Miss-Wörter, keine nackten Zahlen und keine Wörter wie "out"
+_FREESTANDING = frozenset(('BULL', 'DBULL', 'BULLSEYE', 'DB', 'SB', 'MISS'))
+
+
+def _build_tables():
+    """Segment-Tabelle als bytes-Tokens, einmal beim Import aufgebaut"""
+    values = {label.lower().encode('ascii'): segment for label, segment in SEGMENTS.items()}
+    labels = {label.lower().encode('ascii'): segment for label, segment in SEGMENTS.items()
+              if label in _FREESTANDING or (label[0] in 'SDT' and label[1:].isdigit() and segment.points)}
+    return labels, values
+
+
+_LABELS, _SEGMENT_VALUES = _build_tables()
+_KEYWORDS = frozenset((b'throw', b'segment', b'dart', b'score', b'points', b'value'))
+
+
+def _tokenize(text):
+    if isinstance(text, str):
+        text = text.encode('utf-8', 'replace')
+    return text.translate(_SEPARATORS).split()
+
+
+class BoardStatus(namedtuple('BoardStatus', 'throw_detected throws score')):
+    """Ergebnis von ``parse_status``"""
+
+    __slots__ = ()
+
+    @property
+    def points(self):
+        """Punkte des neuesten Darts bei "Throw detected", sonst die explizite Punktzahl"""
+        if self.throw_detected and self.throws:
+            return self.throws[-1].points
+        return self.score
+
+
+def parse_status(text):
+    """Parst einen Status-Text (str oder bytes) in einem Durchlauf zu einem BoardStatus"""
+    throw_detected = False
+    throws = []
+    score = None
+    dart = None
+    keyword = None
+
+    for token in _tokenize(text):
+        segment = None
+
+        # Wert zum vorherigen Schlüsselwort, passt er nicht, zählt das Token normal
+        if keyword is not None:
+            key, keyword = keyword, None
+            if key == b'throw':
+                if token == b'detected':
+                    throw_detected = True
+                    continue
+            elif key == b'segment':
+                if token in _SEGMENT_VALUES:
+                    segment = token
+            elif token.isdigit():
+                if key == b'dart':
+                    dart = int(token)
+                else:
+                    score = int(token)
+                continue
+
+        if segment is None:
+            if token in _LABELS:
+                segment = token
+            elif token in _KEYWORDS:
+                keyword = token
+                continue
+            else:
+                continue
+
+        record = _SEGMENT_VALUES[segment]
+        throws.append(ThrowEvent(record.label, record.multiplier, record.number,
+                                 record.points, dart if dart is not None else len(throws) + 1))
+        dart = None
+
+    return BoardStatus(throw_detected, tuple(throws), score)
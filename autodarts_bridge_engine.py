@@ -0,0 +1,841 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Bridge Engine - Eine Bridge, mehrere Score-Quellen
+
+Statt für jede Erkennungsart ein eigenes Bridge-Skript auf Port 8766 zu
+starten (WebSocket, Board Manager, Desktop REST, Simulation, manuell), laufen
+hier alle Quellen als Plugins in einem Prozess. Sie teilen sich Historie,
+Journal, EventBus und den Keep-Alive-HTTP-Client und speisen eine gemeinsame Pipeline:
+
+    Quelle -> normalisieren -> deduplizieren -> speichern -> Aufnahme zuordnen -> veröffentlichen
+
+Welche Quellen laufen, steht im Abschnitt 'engine' der
+``autodarts_config.json``:
+
+    "engine": {
+      "sources": {
+        "manual": {"enabled": true},
+        "board_manager": {"enabled": true, "url": "http://192.168.2.72:3180"},
+        "websocket": {"enabled": false}
+      }
+    }
+
+Jede Quelle meldet entweder einzelne Darts (``"unit": "dart"``, Standard) oder
+Aufnahme-Summen (``"unit": "visit"``, z.B. die Simulation), der ``VisitTracker``
+fasst die Darts zu Aufnahmen zusammen (``GET /visits``). Laufende Aggregate
+(Durchschnitte, 100+/140+/180, Segment-Histogramm) stehen unter ``GET /stats``,
+für Zeitfenster unter ``GET /stats?window=15m`` (oder ``2h``, ``7d``, ``today``).
+Finish-Wege für jeden Rest liefert ``GET /checkout/<rest>?darts=<n>&out=<regel>``.
+Treffpunkte in mm (z.B. von einer Kamera) nimmt ``POST /add_coordinates`` als
+Batch an (``{"points": [[x, y], ...]}``), abgebildet in einem vektorisierten Aufruf.
+Den besten Zielpunkt für eine Streuung liefert ``GET /aim?sigma=<mm>&target=<segment|max>``.
+
+Eigene Quellen leiten von ``ScoreSource`` ab und werden mit
+``register_source`` oder über ``"plugin": "modul.Klasse"`` in der
+Konfiguration eingebunden.
+"""
+
+import importlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+try:
+    import websocket
+except ImportError:
+    websocket = None
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_capture import StreamCapture
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_discovery import DiscoveryCache
+from autodarts_poller import AdaptivePoller
+from autodarts_board_status import parse_status
+from autodarts_segments import lookup, segment_points
+from autodarts_throws import VisitTracker
+from autodarts_stats import RunningStats, WindowStats
+from autodarts_checkout import MAX_DARTS, OUT_RULES, CheckoutSolver
+from autodarts_simulator import DartSimulator
+from autodarts_aim import AimEngine
+from autodarts_board_geometry import map_points, segment_at
+try:
+    from autodarts_http_client import get_http_client
+except ImportError:
+    get_http_client = None
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server
+from autodarts_ws_server import BroadcastServer
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8766
+DEDUPE_WINDOW = 256
+MAX_SCORE = 180
+SIMULATION_SCORES = [20, 25, 30, 40, 50, 60, 100, 120, 180]
+MAX_COORDINATE_BATCH = 10000
+
+
+def load_engine_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'engine' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('engine', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Engine-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+def parse_segment(segment):
+    """Parst ein Dart-Segment (S20, D7, T20, 25, BULL, M) zu Punkten, None wenn ungültig"""
+    return segment_points(segment)
+
+
+def normalize_score(raw):
+    """Bringt einen Rohwert einer Quelle auf einen Score 0..180, None wenn ungültig"""
+    if isinstance(raw, bool):
+        return None
+    if isinstance(raw, (int, float)):
+        score = int(raw)
+    elif isinstance(raw, str):
+        # Segment-Bezeichnung oder bereits berechnete Punkte ("60")
+        score = parse_segment(raw)
+        if score is None and raw.strip().isdigit():
+            score = int(raw)
+    else:
+        return None
+    if score is None or not 0 <= score <= MAX_SCORE:
+        return None
+    return score
+
+
+def extract_score_from_message(data):
+    """Extrahiert einen Score aus einer WebSocket-Nachricht der Desktop App"""
+    for field in ('score', 'points', 'value', 'segment_value'):
+        value = data.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            return int(value)
+    segment = data.get('segment')
+    if isinstance(segment, str):
+        return parse_segment(segment)
+    return None
+
+
+def _coordinate(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(value)
+    try:
+        value = float(value)
+    except OverflowError:
+        raise ValueError(value)
+    if not math.isfinite(value):
+        raise ValueError(value)
+    return value
+
+
+def parse_coordinates(data):
+    """Liest Treffpunkte aus {"points": [[x, y], ...]} oder {"x": [...], "y": [...]}
+
+    Gibt (xs, ys) zurück, None wenn ungültig, leer oder größer als
+    MAX_COORDINATE_BATCH.
+    """
+    try:
+        if 'points' in data:
+            points = data['points']
+            if not isinstance(points, list) or any(not isinstance(p, list) or len(p) != 2 for p in points):
+                return None
+            xs = [_coordinate(x) for x, _ in points]
+            ys = [_coordinate(y) for _, y in points]
+        else:
+            xs, ys = data.get('x'), data.get('y')
+            if not isinstance(xs, list) or not isinstance(ys, list) or len(xs) != len(ys):
+                return None
+            xs = [_coordinate(x) for x in xs]
+            ys = [_coordinate(y) for y in ys]
+    except ValueError:
+        return None
+    if not 0 < len(xs) <= MAX_COORDINATE_BATCH:
+        return None
+    return xs, ys
+
+
+def parse_board_status(status_text):
+    """Parst einen Score aus dem Status-Text des Board Managers, None wenn kein Wurf"""
+    return parse_status(status_text).points
+
+
+class ScoreSource:
+    """Basisklasse aller Score-Quellen
+
+    Eine Quelle läuft in eigenen Threads und meldet Rohwerte über
+    ``emit``. ``key`` identifiziert einen Wurf für die Deduplizierung,
+    z.B. eine Nachrichten-ID oder den Zustand eines gepollten Endpunkts.
+    """
+
+    name = 'source'
+    automatic = True  # Läuft nur solange Auto-Score aktiv ist
+    unit = 'dart'  # Meldet einzelne Darts ('dart') oder Aufnahme-Summen ('visit')
+
+    def __init__(self, engine, config):
+        self.engine = engine
+        self.config = config
+        self.unit = config.get('unit', self.unit)
+        self.running = False
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_safe, name=f"source-{self.name}", daemon=True)
+        self._thread.start()
+        logger.info(f"▶️ Quelle gestartet: {self.name}")
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self.set_connected(False)
+        logger.info(f"⏹️ Quelle gestoppt: {self.name}")
+
+    def _run_safe(self):
+        try:
+            self.run()
+        except Exception as e:
+            logger.error(f"❌ Quelle {self.name} beendet: {e}")
+            self.running = False
+            self.set_connected(False)
+
+    def run(self):
+        """Hauptschleife der Quelle, läuft bis ``self._stop`` gesetzt ist"""
+
+    def emit(self, raw, key=None, player=None):
+        return self.engine.ingest(self.name, raw, key=key, player=player)
+
+    def set_connected(self, connected):
+        if connected != self.connected:
+            self.connected = connected
+            self.engine.events.publish('status', {'source': self.name, 'connected': connected})
+
+    def status(self):
+        return {'running': self.running, 'connected': self.connected}
+
+
+class ManualSource(ScoreSource):
+    """Manuell eingegebene Scores über POST /add_score"""
+
+    name = 'manual'
+    automatic = False
+
+    def start(self):
+        self.running = True
+        self.connected = True
+
+    def stop(self):
+        self.running = False
+
+
+class SimulationSource(ScoreSource):
+    """Zufällige Scores für Tests ohne Board"""
+
+    name = 'simulation'
+    unit = 'visit'
+
+    def run(self):
+        scores = self.config.get('scores', SIMULATION_SCORES)
+        low, high = self.config.get('interval', [3, 8])
+        self.set_connected(True)
+        while not self._stop.wait(random.uniform(low, high)):
+            self.emit(random.choice(scores))
+
+
+class SimulatorSource(ScoreSource):
+    """Simulierte Darts auf echter Board-Geometrie, Spieler aus dem Abschnitt 'simulator'"""
+
+    name = 'simulator'
+
+    def run(self):
+        simulator = DartSimulator.from_config(seed=self.config.get('seed'), speed=self.config.get('speed'))
+        self.set_connected(True)
+        for dart in simulator.stream(self._stop, aim=self.aim, turn_over=self.turn_over):
+            self.emit(dart.segment.label, player=dart.player)
+
+    def aim(self, player):
+        """Erster Dart des besten Checkout-Wegs für den Rest des Spielers, sonst Standardziel"""
+        visits = self.engine.visits
+        routes = self.engine.checkout.table(visits.out).routes(visits.remaining(player.name), limit=1)
+        return routes[0][0] if routes else None
+
+    def turn_over(self, player):
+        """Der VisitTracker hat die Aufnahme geschlossen (Darts pro Aufnahme, Checkout oder Bust)"""
+        return self.engine.visits.open_visit(player.name) is None
+
+
+class WebSocketSource(ScoreSource):
+    """Scores aus dem WebSocket-Stream der Desktop App"""
+
+    name = 'websocket'
+    default_urls = [
+        "ws://localhost:3180/ws",
+        "ws://localhost:3180/websocket",
+        "ws://localhost:3180/socket.io",
+        "ws://192.168.2.72:3180/ws",
+        "ws://192.168.2.72:3180/websocket"
+    ]
+
+    def __init__(self, engine, config):
+        super().__init__(engine, config)
+        self.ws = None
+        self.url = None
+
+    def run(self):
+        if websocket is None:
+            logger.error("❌ websocket-client nicht installiert - WebSocket-Quelle deaktiviert")
+            return
+
+        urls = self.config.get('urls', self.default_urls)
+        # Die zuletzt funktionierende URL zuerst
+        cached = self.engine.discovery.get('websocket_url')
+        if cached:
+            urls = [cached] + [url for url in urls if url != cached]
+        reconnect = float(self.config.get('reconnect_interval', 5.0))
+        attempt = 0
+        while not self._stop.is_set():
+            self.url = urls[attempt % len(urls)]
+            self.ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self.on_open,
+                on_message=self.on_message,
+                on_close=lambda ws, code, msg: self.set_connected(False)
+            )
+            self.ws.run_forever()
+            if not self.connected:
+                attempt += 1
+            self._stop.wait(reconnect)
+
+    def stop(self):
+        self._stop.set()
+        if self.ws:
+            self.ws.close()
+        super().stop()
+
+    def on_open(self, ws):
+        self.set_connected(True)
+        self.engine.discovery.put('websocket_url', self.url)
+
+    def on_message(self, ws, message):
+        self.engine.capture.frame(message, self.name)
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+        # Mit gültigem Segment bleibt die Segment-Information für das Wurf-Modell erhalten,
+        # reine Treffpunkte (x, y in mm) werden über die Board-Geometrie abgebildet
+        segment = data.get('segment')
+        if isinstance(segment, str) and lookup(segment):
+            score = segment
+        elif 'x' in data and 'y' in data:
+            try:
+                score = segment_at(_coordinate(data['x']), _coordinate(data['y'])).label
+            except ValueError:
+                return
+        else:
+            score = extract_score_from_message(data)
+        if score:
+            self.emit(score, key=data.get('id'))
+
+    def status(self):
+        return {**super().status(), 'url': self.url}
+
+
+class BoardManagerSource(ScoreSource):
+    """Pollt den Status-Endpunkt des Board Managers"""
+
+    name = 'board_manager'
+
+    def __init__(self, engine, config):
+        super().__init__(engine, config)
+        self.poller = None
+
+    def run(self):
+        url = self.config.get('url', "http://192.168.2.72:3180").rstrip('/')
+        self.use_fetch(lambda: self.engine.http_get_text(f"{url}/api/board/status"))
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.poller.next_interval())
+
+    def use_fetch(self, fetch):
+        """Setzt die Status-Abfrage (HTTP oder z.B. eine abgespielte Aufzeichnung)"""
+        self.poller = AdaptivePoller.from_config(
+            lambda: self.engine.capture.poll(fetch(), self.name),
+            base_interval=self.config.get('poll_interval')
+        )
+
+    def poll_once(self):
+        """Ein Poll: Antwort holen, Wurf-Übergang erkennen, Dart melden"""
+        change = self.poller.poll()
+        self.set_connected(change is not None)
+        if change and change.throw:
+            # Jeder Übergang in "Throw detected" ist ein eigener Wurf, kein Dedupe-Key nötig.
+            # Der Dart wird als Segment gemeldet, auch ein Miss zählt in der Aufnahme.
+            status = parse_status(change.text)
+            if status.throws:
+                self.emit(status.throws[-1].segment)
+            elif status.points:
+                self.emit(status.points)
+
+    def status(self):
+        status = {**super().status(), 'url': self.config.get('url', "http://192.168.2.72:3180")}
+        if self.poller:
+            status['poller'] = self.poller.stats()
+        return status
+
+
+class DesktopRestSource(ScoreSource):
+    """Pollt den /status-Endpunkt der Desktop App"""
+
+    name = 'desktop_rest'
+    default_urls = [
+        "http://localhost:8080",
+        "http://localhost:8081",
+        "http://localhost:3180",
+        "http://192.168.2.72:3180"
+    ]
+
+    def __init__(self, engine, config):
+        super().__init__(engine, config)
+        self.url = None
+
+    def run(self):
+        urls = self.config.get('urls', self.default_urls)
+        interval = float(self.config.get('poll_interval', 2.0))
+        while not self._stop.is_set():
+            if self.url is None:
+                self.url = self.engine.discovery.resolve(
+                    'api_url',
+                    validate=lambda u: self.engine.http_get_json(f"{u}/status") is not None,
+                    discover=lambda: next((u for u in urls if self.engine.http_get_json(f"{u}/status") is not None), None)
+                )
+            data = self.engine.http_get_json(f"{self.url}/status") if self.url else None
+            self.set_connected(data is not None)
+            if data is None:
+                self.url = None
+            elif data.get('last_score', 0) > 0:
+                key = (data.get('score_history_count'), data['last_score'])
+                self.emit(data['last_score'], key=key)
+            self._stop.wait(interval)
+
+    def status(self):
+        return {**super().status(), 'url': self.url}
+
+
+SOURCE_TYPES = {}
+
+
+def register_source(cls):
+    """Registriert eine Quellen-Klasse unter ihrem Namen"""
+    SOURCE_TYPES[cls.name] = cls
+    return cls
+
+
+for _cls in (ManualSource, SimulationSource, SimulatorSource, WebSocketSource, BoardManagerSource, DesktopRestSource):
+    register_source(_cls)
+
+
+def _load_plugin(path):
+    module_name, _, class_name = path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class AutodartsBridgeEngine:
+    """Bridge mit gemeinsamer Ingest-Pipeline für alle konfigurierten Quellen"""
+
+    def __init__(self, config=None):
+        self.config = load_engine_config() if config is None else config
+        self.last_score = 0
+        self.score_history = ScoreHistory.from_config()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.visits = VisitTracker.from_config()
+        self.stats = RunningStats(self.visits.darts_per_visit)
+        self.windows = WindowStats.from_config(self.visits.darts_per_visit)
+        self.journal = ThrowJournal.from_config('engine')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
+        self.capture = StreamCapture.from_config('engine')
+        self.checkout = CheckoutSolver.from_config()
+        # Tabelle der gespielten Out-Regel schon beim Start, die übrigen im Hintergrund
+        self.checkout.warm(self.visits.out)
+        try:
+            self.aim = AimEngine.from_config()
+        except RuntimeError as e:
+            logger.warning(f"⚠️ {e}")
+            self.aim = None
+        self.auto_score_active = False
+        self.http = get_http_client() if get_http_client else None
+        self.discovery = DiscoveryCache.from_config()
+        self.http_timeout = float(self.config.get('http_timeout', 2.0))
+
+        self._lock = threading.Lock()
+        self._recent = {}
+        self.sources = {}
+        for name, source_config in self.config.get('sources', {'manual': {}}).items():
+            if not source_config.get('enabled', True):
+                continue
+            try:
+                cls = _load_plugin(source_config['plugin']) if 'plugin' in source_config else SOURCE_TYPES[name]
+            except (KeyError, ImportError, AttributeError) as e:
+                logger.error(f"❌ Unbekannte Quelle '{name}': {e}")
+                continue
+            source = cls(self, source_config)
+            source.name = name
+            self.sources[name] = source
+
+        # Erst mit den Quellen ist bekannt, ob ein Eintrag ein Dart oder eine Aufnahme-Summe ist
+        self._replay_history()
+        logger.info(f"🚀 Autodarts Bridge Engine initialisiert (Quellen: {', '.join(self.sources) or 'keine'})")
+
+    def start(self):
+        """Startet alle Quellen"""
+        for source in self.sources.values():
+            if not source.automatic:
+                source.start()
+        self.start_auto_score()
+
+    def stop(self):
+        """Stoppt alle Quellen"""
+        for source in self.sources.values():
+            source.stop()
+
+    def start_auto_score(self):
+        """Startet alle automatischen Quellen"""
+        automatic = [s for s in self.sources.values() if s.automatic]
+        for source in automatic:
+            source.start()
+        self.auto_score_active = bool(automatic)
+        self.events.publish('status', {'auto_score_active': self.auto_score_active})
+
+    def stop_auto_score(self):
+        """Stoppt alle automatischen Quellen, manuelle Eingabe bleibt möglich"""
+        for source in self.sources.values():
+            if source.automatic:
+                source.stop()
+        self.auto_score_active = False
+        self.events.publish('status', {'auto_score_active': False})
+
+    def http_get_text(self, url):
+        """GET über den gemeinsamen Keep-Alive-Client, None bei Fehler"""
+        if self.http is None:
+            return None
+        return self.http.get_text(url, timeout=self.http_timeout)
+
+    def http_get_json(self, url):
+        """Wie http_get_text, mit JSON-Body"""
+        if self.http is None:
+            return None
+        return self.http.get_json(url, timeout=self.http_timeout)
+
+    def ingest(self, source, raw, key=None, player=None):
+        """Pipeline: normalisieren -> deduplizieren -> speichern -> Aufnahme zuordnen -> veröffentlichen
+
+        raw ist eine Punktzahl oder eine Segment-Bezeichnung. Gibt den
+        gespeicherten Eintrag (mit Segment, Dart-Nr., Aufnahme und Spieler)
+        zurück oder None wenn verworfen.
+        """
+        score = normalize_score(raw)
+        if score is None:
+            logger.debug(f"Ungültiger Score von {source} verworfen: {raw!r}")
+            return None
+        segment = raw if isinstance(raw, str) and lookup(raw) else None
+        unit = getattr(self.sources.get(source), 'unit', ScoreSource.unit)
+
+        with self._lock:
+            if key is not None:
+                recent = self._recent.setdefault(source, OrderedDict())
+                if key in recent:
+                    return None
+                recent[key] = None
+                if len(recent) > DEDUPE_WINDOW:
+                    recent.popitem(last=False)
+
+            self.last_score = score
+            entry = self.score_history.append(score, source)
+            self.journal.append(entry)
+            throw, visit = self.visits.ingest(entry, segment, player, unit)
+            self.stats.add(entry, throw, visit)
+            self.windows.add(entry, throw, visit)
+        entry['segment'] = throw.segment if throw else None
+        entry['dart'] = throw.dart if throw else None
+        entry['visit'] = visit.id
+        entry['player'] = visit.player
+        self.events.publish('score', entry)
+        if visit.closed:
+            self.events.publish('visit', visit.to_dict())
+
+        logger.info(f"🎯 Score empfangen: {score} ({source})")
+        return entry
+
+    def _replay_history(self):
+        """Führt die aus dem Journal wiederhergestellten Würfe durch Aufnahmen, Statistik und Zeitfenster
+
+        Das Journal kennt nur Score und Quelle, Segment und Spieler der alten
+        Würfe fehlen daher (Standardspieler, Dart ohne Segment).
+        """
+        entries = self.score_history.to_list()
+        if not entries:
+            return
+        self.stats.started = entries[0]['timestamp']
+        for entry in entries:
+            unit = getattr(self.sources.get(entry['source']), 'unit', ScoreSource.unit)
+            throw, visit = self.visits.ingest(entry, None, None, unit)
+            self.stats.add(entry, throw, visit)
+            # Zeitfenster mit dem ursprünglichen Zeitstempel des Eintrags, zu alte fallen heraus
+            self.windows.add(entry, throw, visit)
+
+    def add_score(self, score, source='manual', player=None):
+        """Fügt einen Score ohne Deduplizierung hinzu"""
+        return self.ingest(source, score, player=player)
+
+    def add_coordinates(self, xs, ys, source='manual', player=None):
+        """Bildet Treffpunkte (mm) in einem Aufruf auf Segmente ab und speist sie der Reihe nach ein"""
+        return [self.ingest(source, segment.label, player=player) for segment in map_points(xs, ys)]
+
+    def get_status(self):
+        """Gibt den aktuellen Status zurück"""
+        sources = {name: source.status() for name, source in self.sources.items()}
+        connected = lambda name: sources.get(name, {}).get('connected', False)
+        return {
+            'connected': True,
+            'desktop_connected': connected('websocket') or connected('desktop_rest'),
+            'websocket_connected': connected('websocket'),
+            'board_connected': connected('board_manager'),
+            'auto_score_active': self.auto_score_active,
+            'last_score': self.last_score,
+            'score_history_count': len(self.score_history),
+            'sources': sources
+        }
+
+    def get_score(self):
+        """Gibt den letzten Score zurück"""
+        latest = self.score_history.latest()
+        return {
+            'success': True,
+            'score': self.last_score,
+            'timestamp': latest['timestamp'] if latest else time.time(),
+            'source': latest['source'] if latest else 'engine'
+        }
+
+    def get_checkout(self, remaining, query):
+        """Antwort für /checkout/<remaining>, None bei ungültigen Parametern"""
+        params = parse_qs(query)
+        out = params.get('out', [self.visits.out])[0]
+        try:
+            darts = int(params.get('darts', [MAX_DARTS])[0])
+            limit = int(params['limit'][0]) if 'limit' in params else None
+        except ValueError:
+            return None
+        if out not in OUT_RULES or not 1 <= darts <= MAX_DARTS or (limit is not None and limit < 1):
+            return None
+        return self.checkout.suggest(remaining, darts, out, limit)
+
+    def get_aim(self, query):
+        """Antwort für /aim?sigma=<mm>&target=<segment|max>, None bei ungültigen Parametern"""
+        params = parse_qs(query)
+        target = self.aim.target(params.get('target', [None])[0])
+        try:
+            sigma = float(params['sigma'][0])
+            heatmap_step = float(params['heatmap'][0]) if 'heatmap' in params else None
+        except (KeyError, ValueError):
+            return None
+        if target is None or not self.aim.valid_sigma(sigma):
+            return None
+        if heatmap_step is not None and not (math.isfinite(heatmap_step) and heatmap_step > 0):
+            return None
+        return self.aim.best(sigma, target, heatmap_step)
+
+    def get_visits(self):
+        """Gibt die gespeicherten Aufnahmen zurück (älteste zuerst)"""
+        return {
+            'success': True,
+            'visits': self.visits.to_list(),
+            'remaining': self.visits.standings()
+        }
+
+    def close(self):
+        self.stop()
+        self.events.close()
+        self.journal.close()
+        self.capture.close()
+
+
+class BridgeEngineHandler(BridgeRequestHandler):
+    def __init__(self, *args, **kwargs):
+        self.bridge = kwargs.pop('bridge')
+        super().__init__(*args, **kwargs)
+
+    def _send_json(self, data, status_code=200):
+        self.send_response(status_code)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(data).encode())
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def do_GET(self):
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
+
+        if path == '/status':
+            serve_cached(self, self.bridge.responses, 'status', self.bridge.get_status)
+
+        elif path == '/score':
+            serve_cached(self, self.bridge.responses, 'score', self.bridge.get_score)
+
+        elif path == '/events':
+            stream_events(self, self.bridge.events, parsed_url.query)
+
+        elif path == '/stats':
+            window = parse_qs(parsed_url.query).get('window', [None])[0]
+            if window is None:
+                serve_cached(self, self.bridge.responses, 'stats', self.bridge.stats.to_dict)
+            else:
+                # Fenster verschieben sich mit der Zeit, daher nicht über den Response-Cache
+                stats = self.bridge.windows.window(window)
+                if stats is None:
+                    self._send_json({'success': False, 'message': 'Ungültiges Zeitfenster'}, 400)
+                else:
+                    self._send_json(stats)
+
+        elif path.startswith('/checkout/'):
+            remaining = path[len('/checkout/'):]
+            # isdigit allein lässt Unicode-Ziffern wie '²' durch, an denen int() scheitert
+            valid = remaining.isascii() and remaining.isdigit()
+            result = self.bridge.get_checkout(int(remaining), parsed_url.query) if valid else None
+            if result is None:
+                self._send_json({'success': False, 'message': 'Ungültige Checkout-Anfrage'}, 400)
+            else:
+                self._send_json(result)
+
+        elif path == '/aim':
+            if self.bridge.aim is None:
+                self._send_json({'success': False, 'message': 'numpy nicht installiert'}, 503)
+                return
+            result = self.bridge.get_aim(parsed_url.query)
+            if result is None:
+                aim = self.bridge.aim
+                self._send_json({'success': False, 'message': f'Ungültige Aim-Anfrage (sigma {aim.min_sigma}-{aim.max_sigma} mm)'}, 400)
+            else:
+                self._send_json(result)
+
+        elif path == '/visits':
+            serve_cached(self, self.bridge.responses, 'visits', self.bridge.get_visits)
+
+        elif path == '/scores':
+            cursor = parse_cursor_query(parsed_url.query)
+            if cursor is not None:
+                self._send_json(self.bridge.score_history.since(*cursor))
+            else:
+                self._send_json(self.bridge.score_history.to_list())
+
+        else:
+            self._send_json({'success': False, 'message': 'Unbekannter Endpunkt'}, 404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(content_length).decode('utf-8')) if content_length else {}
+        except ValueError:
+            data = {}
+
+        if path == '/start_auto_score':
+            self.bridge.start_auto_score()
+            self._send_json({'success': True, 'message': 'Auto-Score gestartet'})
+
+        elif path == '/stop_auto_score':
+            self.bridge.stop_auto_score()
+            self._send_json({'success': True, 'message': 'Auto-Score gestoppt'})
+
+        elif path in ('/add_score', '/test_score'):
+            score = data.get('segment') or data.get('score', 180 if path == '/test_score' else None)
+            entry = self.bridge.add_score(score, 'manual' if path == '/add_score' else 'test', data.get('player'))
+            if entry is None:
+                self._send_json({'success': False, 'message': 'Ungültiger Score'}, 400)
+            else:
+                self._send_json({'success': True, 'score': entry['score'], 'seq': entry['seq']})
+
+        elif path == '/add_coordinates':
+            coordinates = parse_coordinates(data)
+            if coordinates is None:
+                self._send_json({'success': False, 'message': f'Ungültige Koordinaten (1-{MAX_COORDINATE_BATCH} Punkte)'}, 400)
+                return
+            entries = self.bridge.add_coordinates(*coordinates, player=data.get('player'))
+            self._send_json({
+                'success': True,
+                'count': len(entries),
+                'segments': [entry['segment'] for entry in entries],
+                'scores': [entry['score'] for entry in entries],
+                'first_seq': entries[0]['seq'],
+                'last_seq': entries[-1]['seq']
+            })
+
+        else:
+            self._send_json({'success': False, 'message': 'Unbekannter Endpunkt'}, 404)
+
+
+def main():
+    bridge = AutodartsBridgeEngine()
+    port = int(bridge.config.get('port', DEFAULT_PORT))
+    handler = lambda *args, **kwargs: BridgeEngineHandler(*args, bridge=bridge, **kwargs)
+    server = create_bridge_server(handler, port)
+    push_server = BroadcastServer(bridge.events)
+    push_server.start()
+    bridge.start()
+
+    print(f"🚀 Autodarts Bridge Engine läuft auf Port {port}")
+    print(f"🧩 Quellen: {', '.join(bridge.sources) or 'keine'}")
+    print(f"📡 Status: http://localhost:{port}/status")
+    print(f"🎯 Scores: http://localhost:{port}/score")
+    print(f"📊 Score History: http://localhost:{port}/scores")
+    print(f"🎯 Aufnahmen: http://localhost:{port}/visits")
+    print(f"📈 Statistik: http://localhost:{port}/stats")
+    print(f"🏁 Checkout: http://localhost:{port}/checkout/170")
+    print(f"🎯 Zielpunkt: http://localhost:{port}/aim?sigma=20&target=max")
+    print(f"📣 Live-Events (SSE): http://localhost:{port}/events")
+    print(f"🔌 Live-Events (WebSocket): ws://localhost:{push_server.port}")
+    print(f"✍️  Manueller Score: POST http://localhost:{port}/add_score")
+    print("🔄 Drücken Sie Ctrl+C zum Beenden")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Bridge wird gestoppt...")
+        push_server.stop()
+        bridge.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
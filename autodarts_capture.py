@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Capture - Mitschnitt der rohen Upstream-Daten einer Bridge
+
+Performance-Probleme aus einem Trainingsabend lassen sich nur nachstellen,
+wenn bekannt ist, was genau wann ankam. Ist die Aufzeichnung aktiv, schreibt
+die Bridge jeden rohen WebSocket-Frame (``on_ws_message``) und jede Antwort
+des Status-Pollings (``_score_polling_worker`` bzw. Board-Manager-Quelle)
+mit Zeitstempel in Nanosekunden in eine kompakte Datei. Abgespielt wird sie
+mit ``benchmarks/replay_capture.py``.
+
+Aufbau:
+    captures/<bridge>-<JJJJMMTT-HHMMSS>.adcap
+
+Kopf:
+
+    magic     6 Byte  b'ADCAP\\x01'
+    started   u64     Wanduhr beim Start (time.time_ns)
+    name_len  u16     Länge des Bridge-Namens, danach der Name (utf-8)
+
+Danach folgen Records:
+
+    kind      u8      CHANNEL, TEXT, BINARY, POLL, POLL_SAME, POLL_FAIL
+    channel   u8      Code der Quelle (z.B. websocket, board_manager)
+    offset    u64     Nanosekunden seit dem Start (perf_counter_ns)
+    length    u32     Länge der Nutzdaten, danach die Nutzdaten
+
+Ein CHANNEL-Record definiert den Namen eines Codes einmal pro Datei. Eine
+Poll-Antwort, die der vorigen desselben Kanals gleicht (der Normalfall beim
+Board Manager im Leerlauf), wird als POLL_SAME ohne Nutzdaten geschrieben,
+ein fehlgeschlagener Poll als POLL_FAIL. Ein Record kostet damit 14 Byte plus
+Nutzdaten.
+
+Geschrieben wird gepuffert, ein Hintergrund-Thread leert den Puffer alle
+``flush_interval`` Sekunden. Ein abgerissener letzter Record wird beim Lesen
+ignoriert.
+
+    "capture": {"enabled": false, "directory": "captures", "flush_interval": 1.0}
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ADCAP\x01'
+HEADER = struct.Struct('<QH')
+RECORD = struct.Struct('<BBQI')
+
+CHANNEL = 0
+TEXT = 1
+BINARY = 2
+POLL = 3
+POLL_SAME = 4
+POLL_FAIL = 5
+
+DEFAULT_DIRECTORY = 'captures'
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+CapturedFrame = namedtuple('CapturedFrame', 'offset channel kind payload')
+
+
+def load_capture_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'capture' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('capture', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Capture-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class StreamCapture:
+    """Schreibt rohe Frames und Poll-Antworten mit Zeitstempel, ohne Aufzeichnung ein No-op"""
+
+    def __init__(self, path=None, name='bridge', flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 clock=time.perf_counter_ns):
+        self.path = path
+        self.clock = clock
+        self.enabled = path is not None
+        self.records = 0
+        self._channels = {}
+        self._last_poll = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._stop = threading.Event()
+        if not self.enabled:
+            return
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'wb')
+        self.started = time.time_ns()
+        self._origin = clock()
+        encoded = name.encode('utf-8')[:65535]
+        self._file.write(MAGIC + HEADER.pack(self.started, len(encoded)) + encoded)
+        self._flush_thread = threading.Thread(target=self._flush_worker, args=(float(flush_interval),),
+                                              daemon=True)
+        self._flush_thread.start()
+        logger.info(f"🎙️ Aufzeichnung der Upstream-Daten: {path}")
+
+    @classmethod
+    def from_config(cls, name, path='autodarts_config.json'):
+        """Erzeugt die Aufzeichnung einer Bridge, deaktiviert wenn 'capture.enabled' nicht gesetzt ist"""
+        config = load_capture_config(path)
+        if not config.get('enabled', False):
+            return cls()
+        filename = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.adcap"
+        return cls(os.path.join(config.get('directory', DEFAULT_DIRECTORY), filename), name,
+                   flush_interval=config.get('flush_interval', DEFAULT_FLUSH_INTERVAL))
+
+    def _write(self, kind, channel, payload=b''):
+        """Schreibt einen Record, der Lock muss gehalten werden"""
+        code = self._channels.get(channel)
+        if code is None:
+            code = self._channels[channel] = len(self._channels) % 256
+            name = channel.encode('utf-8')
+            self._file.write(RECORD.pack(CHANNEL, code, 0, len(name)) + name)
+        offset = self.clock() - self._origin
+        self._file.write(RECORD.pack(kind, code, offset, len(payload)))
+        if payload:
+            self._file.write(payload)
+        self.records += 1
+
+    def frame(self, message, channel='websocket'):
+        """Zeichnet einen rohen WebSocket-Frame (str oder bytes) auf"""
+        if not self.enabled:
+            return
+        if isinstance(message, str):
+            kind, payload = TEXT, message.encode('utf-8')
+        else:
+            kind, payload = BINARY, bytes(message)
+        with self._lock:
+            if self._file is not None:
+                self._write(kind, channel, payload)
+
+    def poll(self, text, channel='board_manager'):
+        """Zeichnet eine Poll-Antwort auf (None = fehlgeschlagen) und gibt sie unverändert zurück"""
+        if not self.enabled:
+            return text
+        with self._lock:
+            if self._file is not None:
+                if text is None:
+                    self._write(POLL_FAIL, channel)
+                elif self._last_poll.get(channel) == text:
+                    self._write(POLL_SAME, channel)
+                else:
+                    self._last_poll[channel] = text
+                    self._write(POLL, channel, text.encode('utf-8'))
+        return text
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                try:
+                    self._file.flush()
+                except OSError as e:
+                    logger.error(f"❌ Fehler beim Schreiben der Aufzeichnung: {e}")
+
+    def _flush_worker(self, interval):
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def close(self):
+        """Schreibt den Puffer und schließt die Datei"""
+        self._stop.set()
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        logger.info(f"🎙️ Aufzeichnung beendet: {self.records} Records in {self.path}")
+
+
+def read_capture(path):
+    """Liest eine Aufzeichnung
+
+    Gibt (kopf, frames) zurück; kopf enthält 'name' und 'started' (ns),
+    frames ist eine Liste von ``CapturedFrame(offset, channel, kind, payload)``
+    mit offset in Nanosekunden und dem Kanal-Namen. TEXT- und POLL-Nutzdaten
+    sind str, POLL_SAME ist zu POLL mit der vorigen Antwort aufgelöst,
+    POLL_FAIL hat payload None.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} ist keine Autodarts-Aufzeichnung")
+    started, name_length = HEADER.unpack_from(data, len(MAGIC))
+    pos = len(MAGIC) + HEADER.size
+    header = {'name': data[pos:pos + name_length].decode('utf-8', 'replace'), 'started': started}
+    pos += name_length
+
+    channels = {}
+    last_poll = {}
+    frames = []
+    size = len(data)
+    while pos + RECORD.size <= size:
+        kind, code, offset, length = RECORD.unpack_from(data, pos)
+        start = pos + RECORD.size
+        if start + length > size:
+            break
+        payload = data[start:start + length]
+        pos = start + length
+        if kind == CHANNEL:
+            channels[code] = payload.decode('utf-8', 'replace')
+            continue
+        channel = channels.get(code, 'unknown')
+        if kind == TEXT:
+            payload = payload.decode('utf-8', 'replace')
+        elif kind == POLL:
+            payload = last_poll[channel] = payload.decode('utf-8', 'replace')
+        elif kind == POLL_SAME:
+            kind, payload = POLL, last_poll.get(channel)
+        elif kind == POLL_FAIL:
+            payload = None
+        frames.append(CapturedFrame(offset, channel, kind, payload))
+    return header, frames
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Checkout - Alle Finish-Wege für 1, 2 und 3 Darts
+
+Für jede Out-Regel wird einmal eine Tabelle mit allen gültigen Finishes
+aufgebaut (Rest -> sortierte Wege), danach ist jede Abfrage ein
+Index-Zugriff plus Slice:
+
+    double    letzter Dart Double oder Bullseye (2-170)
+    master    letzter Dart Double, Triple oder Bullseye (2-180)
+    straight  letzter Dart beliebig (1-180)
+
+Setup-Darts werden ohne Reihenfolge gezählt (``T20 S1 D20`` und
+``S1 T20 D20`` sind ein Weg, der höhere Dart steht vorne). Sortiert wird
+nach:
+
+    1. weniger Darts
+    2. Schwierigkeit der Setup-Darts (``double_penalty`` je Double,
+       ``treble_penalty`` je Triple, ``bull_penalty`` je Bull, Singles 0)
+    3. Rang des letzten Darts in ``preferred_doubles``
+    4. höherer erster Dart
+
+Die Wege eines Rests sind nach Dart-Anzahl sortiert, die Wege mit höchstens
+n Darts sind also ein Präfix der Liste, dessen Länge mitgespeichert wird.
+
+Konfiguration im Abschnitt 'checkout' der ``autodarts_config.json``::
+
+    "checkout": {"preferred_doubles": ["D20", "D16", ...], "double_penalty": 2,
+                 "treble_penalty": 1, "bull_penalty": 2, "max_routes": 10}
+"""
+
+import json
+import logging
+import threading
+
+from autodarts_segments import BULLSEYE, SEGMENTS, SINGLE_BULL
+
+logger = logging.getLogger(__name__)
+
+OUT_RULES = ('double', 'master', 'straight')
+MAX_DARTS = 3
+DEFAULT_MAX_ROUTES = 10
+DEFAULT_DOUBLE_PENALTY = 2
+DEFAULT_TREBLE_PENALTY = 1
+DEFAULT_BULL_PENALTY = 2
+DEFAULT_PREFERRED_DOUBLES = ['D20', 'D16', 'D8', 'D18', 'D12', 'D10', 'D4', 'D6', 'D2', 'D14',
+                             'D9', 'D19', 'D17', 'D15', 'D13', 'D11', 'D7', 'D5', 'D3', 'D1', '50']
+
+# Jedes punktende Segment genau einmal, höchste Punkte zuerst
+SCORING_SEGMENTS = tuple(sorted({segment for segment in SEGMENTS.values() if segment.points},
+                                key=lambda segment: (-segment.points, -segment.multiplier, segment.label)))
+
+
+def load_checkout_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'checkout' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('checkout', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Checkout-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+def finishing_segments(out):
+    """Segmente, mit denen unter einer Out-Regel beendet werden darf"""
+    if out == 'double':
+        return tuple(s for s in SCORING_SEGMENTS if s.multiplier == 2)
+    if out == 'master':
+        return tuple(s for s in SCORING_SEGMENTS if s.multiplier in (2, 3))
+    if out == 'straight':
+        return SCORING_SEGMENTS
+    raise ValueError(f"out muss eines von {', '.join(OUT_RULES)} sein")
+
+
+class CheckoutTable:
+    """Vorberechnete Finish-Wege einer Out-Regel, Abfrage in O(1)"""
+
+    def __init__(self, out='double', preferred_doubles=None, double_penalty=DEFAULT_DOUBLE_PENALTY,
+                 treble_penalty=DEFAULT_TREBLE_PENALTY, bull_penalty=DEFAULT_BULL_PENALTY):
+        self.out = out
+        preferred = DEFAULT_PREFERRED_DOUBLES if preferred_doubles is None else preferred_doubles
+        self._finish_rank = {SEGMENTS[label].label: rank for rank, label in enumerate(preferred)
+                             if label in SEGMENTS}
+        self.double_penalty = double_penalty
+        self.treble_penalty = treble_penalty
+        self.bull_penalty = bull_penalty
+        self.max_score = 0
+        self._routes = []
+        self._build()
+
+    def _penalty(self, segment):
+        if segment is SINGLE_BULL or segment is BULLSEYE:
+            return self.bull_penalty
+        if segment.multiplier == 3:
+            return self.treble_penalty
+        if segment.multiplier == 2:
+            return self.double_penalty
+        return 0
+
+    def _build(self):
+        finishes = finishing_segments(self.out)
+        unranked = len(self._finish_rank)
+        candidates = {}
+
+        def add(setup, finish):
+            total = sum(s.points for s in setup) + finish.points
+            key = (len(setup) + 1,
+                   sum(self._penalty(s) for s in setup),
+                   self._finish_rank.get(finish.label, unranked),
+                   -(setup[0].points if setup else finish.points))
+            route = tuple(s.label for s in setup) + (finish.label,)
+            candidates.setdefault(total, []).append((key, route))
+
+        for finish in finishes:
+            add((), finish)
+            for i, first in enumerate(SCORING_SEGMENTS):
+                add((first,), finish)
+                # Setup-Darts ohne Reihenfolge: zweiter Dart nie höher als der erste
+                for second in SCORING_SEGMENTS[i:]:
+                    add((first, second), finish)
+
+        self.max_score = max(candidates)
+        self._routes = [None] * (self.max_score + 1)
+        for total, routes in candidates.items():
+            routes.sort()
+            ends = [0] * (MAX_DARTS + 1)
+            for darts in range(1, MAX_DARTS + 1):
+                ends[darts] = sum(1 for key, _ in routes if key[0] <= darts)
+            self._routes[total] = (tuple(route for _, route in routes), tuple(ends))
+
+    def routes(self, remaining, darts=MAX_DARTS, limit=None):
+        """Die besten Wege für einen Rest mit höchstens darts Darts, [] wenn keiner existiert"""
+        if not 0 < remaining <= self.max_score or self._routes[remaining] is None:
+            return []
+        routes, ends = self._routes[remaining]
+        end = ends[max(0, min(int(darts), MAX_DARTS))]
+        if limit is not None:
+            end = min(end, int(limit))
+        return [list(route) for route in routes[:end]]
+
+    def count(self, remaining, darts=MAX_DARTS):
+        """Anzahl der Wege für einen Rest mit höchstens darts Darts"""
+        if not 0 < remaining <= self.max_score or self._routes[remaining] is None:
+            return 0
+        return self._routes[remaining][1][max(0, min(int(darts), MAX_DARTS))]
+
+
+class CheckoutSolver:
+    """Checkout-Tabellen aller Out-Regeln, jede wird einmal gebaut (beim ersten Zugriff oder mit warm)"""
+
+    def __init__(self, preferred_doubles=None, double_penalty=DEFAULT_DOUBLE_PENALTY,
+                 treble_penalty=DEFAULT_TREBLE_PENALTY, bull_penalty=DEFAULT_BULL_PENALTY,
+                 max_routes=DEFAULT_MAX_ROUTES):
+        self.preferred_doubles = preferred_doubles
+        self.double_penalty = double_penalty
+        self.treble_penalty = treble_penalty
+        self.bull_penalty = bull_penalty
+        self.max_routes = max_routes
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path='autodarts_config.json'):
+        """Erzeugt den Solver mit den Präferenzen aus der Konfigurationsdatei"""
+        config = load_checkout_config(path)
+        return cls(
+            preferred_doubles=config.get('preferred_doubles'),
+            double_penalty=config.get('double_penalty', DEFAULT_DOUBLE_PENALTY),
+            treble_penalty=config.get('treble_penalty', DEFAULT_TREBLE_PENALTY),
+            bull_penalty=config.get('bull_penalty', DEFAULT_BULL_PENALTY),
+            max_routes=int(config.get('max_routes', DEFAULT_MAX_ROUTES))
+        )
+
+    def table(self, out='double'):
+        """Tabelle einer Out-Regel, ValueError bei unbekannter Regel"""
+        table = self._tables.get(out)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(out)
+                if table is None:
+                    table = CheckoutTable(out, self.preferred_doubles, self.double_penalty,
+                                          self.treble_penalty, self.bull_penalty)
+                    self._tables[out] = table
+        return table
+
+    def warm(self, first='double'):
+        """Baut die Tabelle von first sofort und die übrigen Out-Regeln in einem Hintergrund-Thread
+
+        Master und Straight brauchen jeweils bis zu einer Sekunde, die erste
+        Abfrage einer anderen Out-Regel soll nicht darauf warten.
+        """
+        self.table(first)
+        rest = [out for out in OUT_RULES if out != first]
+        thread = threading.Thread(target=lambda: [self.table(out) for out in rest],
+                                  name='checkout-warm', daemon=True)
+        thread.start()
+        return thread
+
+    def suggest(self, remaining, darts=MAX_DARTS, out='double', limit=None):
+        """Antwort für /checkout/<remaining>"""
+        table = self.table(out)
+        limit = self.max_routes if limit is None else limit
+        routes = table.routes(remaining, darts, limit)
+        return {
+            'success': True,
+            'remaining': remaining,
+            'darts': darts,
+            'out': out,
+            'possible': bool(routes),
+            'count': table.count(remaining, darts),
+            'routes': routes
+        }
@@ -10,13 +10,15 @@ import time
 import threading
 import subprocess
 import os
-try:
-    import psutil
-except ImportError:
-    psutil = None
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
-import requests
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_http_client import get_http_client
+from autodarts_process_watch import ProcessWatch
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server, UpstreamBusy, UpstreamPool, UpstreamTimeout
+from autodarts_ws_server import BroadcastServer
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -28,7 +30,17 @@ class AutodartsDesktopBridge:
         self.desktop_process = None
         self.desktop_connected = False
         self.last_score = 0
-        self.score_history = []
+        self.score_history = ScoreHistory.from_config()
+        # Sequenznummer und Journal-Reihenfolge gemeinsam vergeben (HTTP- und Poll-Threads)
+        self._history_lock = threading.Lock()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.http = get_http_client()
+        self.upstream = UpstreamPool.from_config()
+        self.process_watch = ProcessWatch.from_config(bus=self.events)
+        self.journal = ThrowJournal.from_config('desktop')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
         self.auto_score_active = False
         
         # Lade Konfiguration
@@ -41,8 +53,14 @@ class AutodartsDesktopBridge:
         
         logger.info("🚀 Autodarts Desktop Bridge initialisiert")
         self._detect_desktop_app()
+        self.process_watch.start()
+        self.process_watch.subscribe(self._on_desktop_presence)
         self._start_desktop_app()
 
+    def _on_desktop_presence(self, running):
+        """ProcessWatch meldet Start oder Ende der Desktop App"""
+        self.desktop_connected = running
+
     def _load_config(self):
         """Lädt die Konfiguration aus der JSON-Datei"""
         try:
@@ -98,15 +116,11 @@ class AutodartsDesktopBridge:
             return
             
         try:
-            # Prüfe ob bereits läuft
-            if psutil:
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if 'Autodarts Desktop' in proc.info['name']:
-                        logger.info("✅ Autodarts Desktop läuft bereits")
-                        self.desktop_connected = True
-                        return
-            else:
-                logger.warning("⚠️ psutil nicht verfügbar - kann Prozesse nicht prüfen")
+            # Prüfe ob bereits läuft (gecachter Zustand des ProcessWatch)
+            if self.process_watch.running:
+                logger.info("✅ Autodarts Desktop läuft bereits")
+                self.desktop_connected = True
+                return
             
             # Starte Desktop App
             logger.info("🚀 Starte Autodarts Desktop...")
@@ -114,6 +128,7 @@ class AutodartsDesktopBridge:
             
             # Warte auf Start
             time.sleep(5)
+            self.process_watch.check()
             self.desktop_connected = True
             logger.info("✅ Autodarts Desktop gestartet")
             
@@ -124,7 +139,7 @@ class AutodartsDesktopBridge:
     def _check_desktop_connection(self):
         """Prüft die Verbindung zur Desktop App"""
         try:
-            response = requests.get(f"{self.desktop_config['api_endpoint']}/api/status", timeout=2)
+            response = self.http.get(f"{self.desktop_config['api_endpoint']}/api/status", timeout=2)
             return response.status_code == 200
         except:
             return False
@@ -184,32 +199,40 @@ class AutodartsDesktopBridge:
                 weights = [0.1, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.1, 0.1, 0.05]
                 
                 score = random.choices(scores, weights=weights)[0]
-                self.last_score = score
-                self.score_history.append({
-                    "score": score,
-                    "timestamp": time.time(),
-                    "source": "desktop_bridge"
-                })
+                self.add_score(score, "desktop_bridge")
                 
                 logger.info(f"🎯 Neuer Score: {score}")
             
             time.sleep(random.uniform(2, 5))  # Zufällige Intervalle
 
+    def add_score(self, score, source):
+        """Fügt Score zur Historie hinzu und veröffentlicht ihn als Event"""
+        self.last_score = score
+        with self._history_lock:
+            entry = self.score_history.append(score, source)
+            self.journal.append(entry)
+        self.events.publish('score', entry)
+        return entry
+
     def get_last_score(self):
         """Gibt den letzten Score zurück"""
+        latest = self.score_history.latest()
         return {
             "score": self.last_score,
-            "timestamp": time.time(),
+            "timestamp": latest['timestamp'] if latest else time.time(),
             "source": "desktop_bridge"
         }
 
-    def get_score_history(self):
-        """Gibt die Score-Historie zurück"""
-        return self.score_history[-50:]  # Letzte 50 Scores
+    def get_score_history(self, cursor=None):
+        """Gibt die Score-Historie zurück, mit Cursor nur die neuen Würfe"""
+        if cursor is not None:
+            return self.score_history.since(*cursor)
+        return self.score_history.last(50)  # Letzte 50 Scores
 
     def set_auto_score(self, active):
         """Aktiviert/deaktiviert automatische Score-Erkennung"""
         self.auto_score_active = active
+        self.events.publish('status', {'auto_score_active': active})
         logger.info(f"🎯 Auto-Score: {'Aktiviert' if active else 'Deaktiviert'}")
 
     def send_score_to_desktop(self, score):
@@ -225,7 +248,7 @@ class AutodartsDesktopBridge:
                 "source": "web_interface"
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.desktop_config['api_endpoint']}/api/scores",
                 json=data,
                 timeout=2
@@ -248,7 +271,7 @@ class AutodartsDesktopBridge:
             return []
         
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.desktop_config['api_endpoint']}/api/scores",
                 timeout=2
             )
@@ -286,10 +309,14 @@ class AutodartsDesktopBridge:
         """Bereinigt Ressourcen"""
         self.stop_score_generator()
         self.stop_desktop_app()
+        self.events.close()
+        self.journal.close()
+        self.upstream.shutdown()
+        self.process_watch.stop()
         logger.info("🧹 Bridge bereinigt")
 
 
-class AutodartsDesktopBridgeHandler(BaseHTTPRequestHandler):
+class AutodartsDesktopBridgeHandler(BridgeRequestHandler):
     def __init__(self, bridge, *args, **kwargs):
         self.bridge = bridge
         super().__init__(*args, **kwargs)
@@ -301,16 +328,23 @@ class AutodartsDesktopBridgeHandler(BaseHTTPRequestHandler):
         
         try:
             if path == '/api/status':
-                self._send_json_response(self.bridge.get_desktop_status())
+                self._send_json_response(self.call_upstream(self.bridge.get_desktop_status))
             elif path == '/api/score':
-                self._send_json_response(self.bridge.get_last_score())
+                serve_cached(self, self.bridge.responses, 'score', self.bridge.get_last_score)
+            elif path == '/api/events':
+                stream_events(self, self.bridge.events, parsed_url.query)
             elif path == '/api/history':
-                self._send_json_response(self.bridge.get_score_history())
+                self._send_json_response(self.bridge.get_score_history(parse_cursor_query(parsed_url.query)))
             elif path == '/api/desktop-scores':
-                self._send_json_response(self.bridge.get_desktop_scores())
+                self._send_json_response(self.call_upstream(self.bridge.get_desktop_scores))
             else:
                 self._send_error_response(404, "Not Found")
                 
+        except UpstreamBusy as e:
+            self._send_error_response(503, str(e))
+        except UpstreamTimeout as e:
+            logger.warning(f"⚠️ {e}")
+            self._send_error_response(504, str(e))
         except Exception as e:
             logger.error(f"❌ Fehler in GET {path}: {e}")
             self._send_error_response(500, str(e))
@@ -335,16 +369,21 @@ class AutodartsDesktopBridgeHandler(BaseHTTPRequestHandler):
                 data = json.loads(post_data.decode('utf-8'))
                 
                 score = data.get('score', 0)
-                success = self.bridge.send_score_to_desktop(score)
+                success = self.call_upstream(self.bridge.send_score_to_desktop, score)
                 self._send_json_response({"success": success})
                 
             elif path == '/api/restart-desktop':
-                self.bridge.restart_desktop_app()
+                self.call_upstream(self.bridge.restart_desktop_app)
                 self._send_json_response({"success": True})
                 
             else:
                 self._send_error_response(404, "Not Found")
                 
+        except UpstreamBusy as e:
+            self._send_error_response(503, str(e))
+        except UpstreamTimeout as e:
+            logger.warning(f"⚠️ {e}")
+            self._send_error_response(504, str(e))
         except Exception as e:
             logger.error(f"❌ Fehler in POST {path}: {e}")
             self._send_error_response(500, str(e))
@@ -378,13 +417,16 @@ def main():
     def handler(*args, **kwargs):
         return AutodartsDesktopBridgeHandler(bridge, *args, **kwargs)
     
-    server = HTTPServer(('localhost', 8767), handler)
+    server = create_bridge_server(handler, 8767)
     logger.info("🌐 Desktop Bridge Server gestartet auf Port 8767")
+    push_server = BroadcastServer(bridge.events, port=bridge.desktop_config.get('push_port', 8769))
+    push_server.start()
     
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         logger.info("🛑 Server wird beendet...")
+        push_server.stop()
         bridge.cleanup()
         server.shutdown()
 
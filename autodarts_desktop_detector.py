@@ -4,12 +4,17 @@
 Autodarts Desktop Detector - Erkennt die tatsächliche API der Desktop App
 """
 
-import requests
 import time
 import subprocess
-import psutil
+try:
+    import psutil
+except ImportError:
+    psutil = None
 import json
 from pathlib import Path
+from autodarts_prober import probe_all, http_probe
+from autodarts_discovery import DiscoveryCache
+from autodarts_process_watch import default_backend
 
 class AutodartsDesktopDetector:
     def __init__(self):
@@ -28,46 +33,43 @@ class AutodartsDesktopDetector:
         processes = []
         
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    if 'Autodarts' in proc.info['name'] or 'autodarts' in proc.info['name'].lower():
-                        processes.append({
-                            'pid': proc.info['pid'],
-                            'name': proc.info['name'],
-                            'cmdline': proc.info['cmdline']
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            processes = default_backend().scan(lambda name: 'autodarts' in name.lower())
         except Exception as e:
             print(f"Fehler beim Prozess-Scan: {e}")
             
         return processes
     
-    def scan_ports(self):
-        """Scannt alle möglichen Ports nach API-Endpunkten"""
+    def scan_ports(self, timeout=2):
+        """Scannt alle möglichen Ports nach API-Endpunkten (parallel, höchstens timeout Sekunden)"""
         found_apis = []
+        candidates = [(port, endpoint) for port in self.possible_ports for endpoint in self.possible_endpoints]
         
-        for port in self.possible_ports:
-            for endpoint in self.possible_endpoints:
-                url = f"http://localhost:{port}{endpoint}"
-                try:
-                    response = requests.get(url, timeout=2)
-                    if response.status_code == 200:
-                        found_apis.append({
-                            'port': port,
-                            'endpoint': endpoint,
-                            'url': url,
-                            'response': response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text
-                        })
-                        print(f"✅ API gefunden: {url}")
-                except:
-                    continue
+        def check(candidate):
+            port, endpoint = candidate
+            return http_probe(f"http://localhost:{port}{endpoint}", timeout=timeout)
+        
+        for (port, endpoint), response in probe_all(candidates, check, timeout=timeout):
+            url = f"http://localhost:{port}{endpoint}"
+            try:
+                body = response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text
+            except ValueError:
+                body = response.text
+            found_apis.append({
+                'port': port,
+                'endpoint': endpoint,
+                'url': url,
+                'response': body
+            })
+            print(f"✅ API gefunden: {url}")
                     
         return found_apis
     
     def detect_electron_app(self):
         """Erkennt Electron-spezifische APIs"""
         electron_ports = []
+        if psutil is None:
+            print("⚠️ psutil nicht installiert - Electron-Scan übersprungen")
+            return electron_ports
         
         try:
             for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
@@ -88,19 +90,32 @@ class AutodartsDesktopDetector:
             
         return electron_ports
     
-    def test_websocket_connection(self, port):
+    def test_websocket_connection(self, port, timeout=2):
         """Testet WebSocket-Verbindung"""
         try:
             import websocket
+        except ImportError:
+            print("⚠️ websocket-client nicht installiert")
+            return False
+        try:
             ws_url = f"ws://localhost:{port}"
-            ws = websocket.create_connection(ws_url, timeout=2)
+            ws = websocket.create_connection(ws_url, timeout=timeout)
             ws.close()
             return True
         except:
             return False
-    except ImportError:
-        print("⚠️ websocket-client nicht installiert")
-        return False
+    
+    def scan_websockets(self, timeout=2):
+        """Testet alle Ports parallel auf WebSocket-Verbindungen"""
+        try:
+            import websocket  # noqa: F401
+        except ImportError:
+            print("⚠️ websocket-client nicht installiert")
+            return []
+        found = probe_all(self.possible_ports,
+                          lambda port: self.test_websocket_connection(port, timeout) or None,
+                          timeout=timeout)
+        return [port for port, _ in found]
     
     def full_scan(self):
         """Führt einen vollständigen Scan durch"""
@@ -139,9 +154,9 @@ class AutodartsDesktopDetector:
         
         # 4. WebSocket testen
         print("\n4. Teste WebSocket-Verbindungen...")
-        for port in self.possible_ports:
-            if self.test_websocket_connection(port):
-                print(f"✅ WebSocket auf Port {port} verfügbar")
+        websocket_ports = self.scan_websockets()
+        for port in websocket_ports:
+            print(f"✅ WebSocket auf Port {port} verfügbar")
         
         print("\n" + "=" * 50)
         print("🔍 Scan abgeschlossen!")
@@ -149,7 +164,8 @@ class AutodartsDesktopDetector:
         return {
             'processes': processes,
             'electron_apps': electron_apps,
-            'apis': apis
+            'apis': apis,
+            'websocket_ports': websocket_ports
         }
 
 def main():
@@ -161,6 +177,20 @@ def main():
         json.dump(results, f, indent=2, ensure_ascii=False)
     
     print(f"\n📄 Ergebnisse gespeichert in: autodarts_detection_results.json")
+    
+    # Funde für die Bridges merken, die dann beim Start nicht mehr suchen müssen
+    cache = DiscoveryCache.from_config()
+    for proc in results['processes']:
+        if proc['name'] == 'Autodarts Desktop.exe':
+            cache.put('process', {'name': proc['name'], 'pid': proc['pid'], 'create_time': proc['create_time']})
+            break
+    for api in results['apis']:
+        if api['endpoint'] == '/status':
+            cache.put('api_url', f"http://localhost:{api['port']}")
+            break
+    if results['websocket_ports']:
+        cache.put('websocket_url', f"ws://localhost:{results['websocket_ports'][0]}")
+    print(f"📄 Discovery-Cache aktualisiert: {cache.path}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Discovery - Gemerkte Fundstellen der Desktop App
+
+Beim Start sucht jede Bridge die Desktop App neu: ``tasklist``, Port-Proben
+und das Durchprobieren der WebSocket-URLs. Das kostet Sekunden, obwohl die
+App fast immer unter derselben Adresse läuft. Der Discovery-Cache merkt sich
+die zuletzt funktionierenden Werte in einer JSON-Datei, die sich alle
+Bridges und der Desktop Detector teilen:
+
+    api_url         Basis-URL der REST-API (``<url>/status`` antwortet)
+    websocket_url   WebSocket-URL der Desktop App
+    process         Prozess-Identität (Name, PID, Startzeit), gepflegt vom
+                    ProcessWatch
+
+Ein Eintrag gilt ``ttl`` Sekunden. ``resolve`` prüft den gemerkten Wert mit
+einer billigen Probe (eine HTTP-Anfrage, ein WebSocket-Handshake) und fällt
+nur dann auf die volle Suche zurück, wenn die Probe fehlschlägt.
+
+    url = cache.resolve('api_url', validate=probe_api, discover=scan_ports)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = 'autodarts_discovery_cache.json'
+DEFAULT_TTL = 24 * 3600
+
+
+def load_discovery_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'discovery' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('discovery', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Discovery-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class DiscoveryCache:
+    """Dateibasierter Cache für gefundene Endpunkte mit TTL"""
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, enabled=True):
+        self.path = path
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path='autodarts_config.json'):
+        """Erzeugt den Cache mit den Einstellungen aus der Konfigurationsdatei"""
+        config = load_discovery_config(path)
+        return cls(
+            path=config.get('path', DEFAULT_PATH),
+            ttl=float(config.get('ttl', DEFAULT_TTL)),
+            enabled=bool(config.get('enabled', True))
+        )
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"⚠️ Discovery-Cache unlesbar, wird neu aufgebaut: {e}")
+            return {}
+
+    def _store(self, entries):
+        # Atomar ersetzen, parallel startende Bridges sehen nie eine halbe Datei
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ Discovery-Cache konnte nicht geschrieben werden: {e}")
+
+    def get(self, key):
+        """Gemerkter Wert oder None wenn unbekannt oder abgelaufen"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._load().get(key)
+        if not isinstance(entry, dict) or time.time() - entry.get('time', 0) > self.ttl:
+            return None
+        return entry.get('value')
+
+    def put(self, key, value):
+        """Merkt sich einen funktionierenden Wert"""
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = self._load()
+            entries[key] = {'value': value, 'time': time.time()}
+            self._store(entries)
+
+    def invalidate(self, key):
+        """Vergisst einen Wert, der nicht mehr funktioniert"""
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._store(entries)
+
+    def resolve(self, key, validate, discover):
+        """Gemerkten Wert prüfen, sonst volle Suche
+
+        ``validate(value)`` ist die billige Probe, ``discover()`` die volle
+        Suche (gibt None zurück wenn nichts gefunden wurde).
+        """
+        cached = self.get(key)
+        if cached is not None:
+            try:
+                if validate(cached):
+                    logger.debug(f"Discovery-Cache-Treffer {key}: {cached}")
+                    return cached
+            except Exception as e:
+                logger.debug(f"Prüfung von {key} fehlgeschlagen: {e}")
+
+        value = discover()
+        if value is not None:
+            self.put(key, value)
+        elif cached is not None:
+            self.invalidate(key)
+        return value
+
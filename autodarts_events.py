@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Events - Push-Events der Bridges (Server-Sent Events unter /events)
+
+Die Bridges veröffentlichen jeden Wurf und jede Statusänderung auf einem
+EventBus. Clients abonnieren ``GET /events`` und bekommen die Events sofort
+gepusht, statt ``/status`` und ``/score`` alle 2 Sekunden zu pollen.
+Wartende Clients blockieren auf einer Condition und kosten im Leerlauf nur
+einen Heartbeat-Kommentar alle ``HEARTBEAT_INTERVAL`` Sekunden.
+
+Nach einem Verbindungsabbruch sendet der Browser automatisch den Header
+``Last-Event-ID``; die Bridge liefert dann alle verpassten Events aus dem
+Backlog nach. Ist der Cursor bereits aus dem Backlog gefallen, kommt ein
+``resync``-Event und der Client holt den Rest über ``/scores?since=<seq>``.
+
+Die SSE-IDs tragen eine Start-Epoche (``<epoche>-<id>``), weil der Zähler
+nach einem Neustart der Bridge wieder bei 1 beginnt. Stammt die
+``Last-Event-ID`` aus einem früheren Prozess (andere Epoche, oder eine
+Zahl ohne Epoche größer als die letzte ID), kommt ebenfalls ``resync`` und
+danach der gesamte Backlog des neuen Prozesses.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKLOG = 1000
+HEARTBEAT_INTERVAL = 15
+RETRY_MS = 2000
+
+
+class Event:
+    """Ein veröffentlichtes Event, das SSE-Frame wird nur einmal kodiert"""
+
+    __slots__ = ('id', 'type', 'data', 'frame')
+
+    def __init__(self, event_id, event_type, data, epoch=None):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+        sse_id = f"{epoch}-{event_id}" if epoch else event_id
+        self.frame = (
+            f"id: {sse_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+        ).encode('utf-8')
+
+
+class EventBus:
+    """Verteilt Bridge-Events an alle Abonnenten und hält einen Backlog für Resume"""
+
+    def __init__(self, backlog=DEFAULT_BACKLOG):
+        self._events = deque(maxlen=backlog)
+        self._next_id = 1
+        self.epoch = f"{int(time.time() * 1000):x}"
+        self._cond = threading.Condition()
+        self._listeners = []
+        self.closed = False
+
+    def publish(self, event_type, data):
+        """Veröffentlicht ein Event und weckt alle wartenden Streams"""
+        with self._cond:
+            event = Event(self._next_id, event_type, data, self.epoch)
+            self._next_id += 1
+            self._events.append(event)
+            self._cond.notify_all()
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Fehler im Event-Listener: {e}")
+        return event
+
+    def subscribe(self, listener):
+        """Registriert einen Callback, der für jedes Event aufgerufen wird"""
+        with self._cond:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Entfernt einen registrierten Callback"""
+        with self._cond:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def last_id(self):
+        """Gibt die ID des zuletzt veröffentlichten Events zurück (0 wenn keins)"""
+        return self._next_id - 1
+
+    def _after(self, last_id):
+        """Events mit ID > last_id, der Lock muss gehalten werden"""
+        if not self._events or self._events[-1].id <= last_id:
+            return [], False
+        oldest = self._events[0].id
+        missed = last_id + 1 < oldest
+        start = max(0, last_id + 1 - oldest)
+        return [self._events[i] for i in range(start, len(self._events))], missed
+
+    def wait_for(self, last_id, timeout):
+        """Blockiert bis Events nach last_id vorliegen oder timeout abläuft
+
+        Gibt (events, missed) zurück; missed ist True wenn Events bereits
+        aus dem Backlog gefallen sind.
+        """
+        with self._cond:
+            events, missed = self._after(last_id)
+            if not events and not self.closed:
+                self._cond.wait(timeout)
+                events, missed = self._after(last_id)
+            return events, missed
+
+    def close(self):
+        """Beendet alle offenen Streams"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class StatusField:
+    """Bridge-Attribut, das bei jeder Änderung ein 'status'-Event veröffentlicht
+
+    Für Zustände wie ``desktop_connected``, die an vielen Stellen gesetzt
+    werden. Die erste Zuweisung (im ``__init__``) löst kein Event aus.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.attr = '_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self.attr, False)
+
+    def __set__(self, instance, value):
+        missing = self.attr not in instance.__dict__
+        old = instance.__dict__.get(self.attr)
+        instance.__dict__[self.attr] = value
+        events = instance.__dict__.get('events')
+        if not missing and old != value and events is not None:
+            events.publish('status', {self.name: value})
+
+
+def _last_event_id(handler, query, bus):
+    """Liest die Resume-Position aus Last-Event-ID oder ?lastEventId=
+
+    Gibt (last_id, stale) zurück, last_id ist None ohne gültige Angabe.
+    stale ist True, wenn die ID aus einem früheren Prozess der Bridge stammt;
+    last_id ist dann 0, damit der ganze Backlog nachgeliefert wird.
+    """
+    value = handler.headers.get('Last-Event-ID')
+    if value is None:
+        value = parse_qs(query).get('lastEventId', [None])[0]
+    if value is None:
+        return None, False
+    epoch, _, number = value.strip().rpartition('-')
+    try:
+        last_id = max(0, int(number))
+    except ValueError:
+        return None, False
+    if (epoch and epoch != bus.epoch) or last_id > bus.last_id():
+        return 0, True
+    return last_id, False
+
+
+def _send_resync(handler, data):
+    handler.wfile.write(f"event: resync\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+
+
+def stream_events(handler, bus, query='', heartbeat=HEARTBEAT_INTERVAL):
+    """Beantwortet GET /events als Server-Sent-Events-Stream
+
+    Blockiert den Handler-Thread bis der Client die Verbindung schließt,
+    setzt also einen Thread pro Verbindung voraus (beide Modi des HTTP-Core).
+    """
+    last_id, stale = _last_event_id(handler, query, bus)
+    if last_id is None:
+        last_id = bus.last_id()
+
+    handler.send_response(200)
+    handler.send_header('Content-type', 'text/event-stream')
+    handler.send_header('Cache-Control', 'no-cache')
+    handler.send_header('Connection', 'keep-alive')
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.end_headers()
+    handler.close_connection = True
+
+    try:
+        handler.wfile.write(f"retry: {RETRY_MS}\n\n".encode('utf-8'))
+        if stale:
+            _send_resync(handler, {'last_event_id': last_id, 'restarted': True})
+        handler.wfile.flush()
+
+        while not bus.closed:
+            events, missed = bus.wait_for(last_id, heartbeat)
+            # Nach einem Neustart-Resync nicht noch einmal für den übergelaufenen Backlog
+            if missed and not stale:
+                _send_resync(handler, {'last_event_id': last_id})
+            stale = False
+            if events:
+                handler.wfile.write(b''.join(event.frame for event in events))
+                last_id = events[-1].id
+            else:
+                handler.wfile.write(b": heartbeat\n\n")
+            handler.wfile.flush()
+
+    except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+        logger.debug("SSE-Client getrennt")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts HTTP Client - Gemeinsamer Keep-Alive-Client für alle Upstream-Aufrufe
+
+Die Bridges pollen den Board Manager und die Desktop App alle paar Sekunden.
+Mit ``requests.get`` baut jeder Poll eine neue TCP-Verbindung auf und wieder
+ab. Alle Upstream-Aufrufe laufen deshalb über einen gemeinsamen Client mit
+persistenter ``requests.Session``:
+
+- Keep-Alive: Verbindungen bleiben pro Host offen und werden wiederverwendet
+- Verbindungslimit pro Host (``max_per_host``), weitere Aufrufe warten
+  höchstens ``connect_timeout`` auf eine freie Verbindung und werfen dann
+  ``HostBusy`` (kein Hinweis darauf, dass der Host fehlt)
+- getrennte Connect- und Read-Timeouts aus dem Abschnitt 'http_client'
+  der ``autodarts_config.json``
+
+    client = get_http_client()
+    response = client.get("http://192.168.2.72:3180/api/board/status")
+
+Parallele Proben (``autodarts_prober``) fragen viele Endpunkte desselben
+Hosts gleichzeitig ab und nutzen deshalb einen eigenen Client aus
+``get_probe_client``, dessen Limit pro Host der Anzahl paralleler Proben
+entspricht. Sie belegen so auch keine Verbindungen der Poller.
+"""
+
+import json
+import logging
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 1.0
+DEFAULT_READ_TIMEOUT = 2.0
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_MAX_HOSTS = 16
+
+
+def load_http_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'http_client' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('http_client', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ HTTP-Client-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class HostBusy(requests.ConnectionError):
+    """Alle Verbindungen zu einem Host sind belegt, der Request wurde nicht gesendet"""
+
+
+class PooledHTTPClient:
+    """Thread-sicherer HTTP-Client mit Verbindungspool pro Host"""
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 max_per_host=DEFAULT_MAX_PER_HOST, max_hosts=DEFAULT_MAX_HOSTS):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_per_host = max_per_host
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=max_per_host, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path='autodarts_config.json', max_per_host=None):
+        """Erzeugt den Client mit Timeouts und Limits aus der Konfigurationsdatei, max_per_host hat Vorrang"""
+        config = load_http_config(path)
+        return cls(
+            connect_timeout=float(config.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT)),
+            read_timeout=float(config.get('read_timeout', DEFAULT_READ_TIMEOUT)),
+            max_per_host=int(max_per_host or config.get('max_per_host', DEFAULT_MAX_PER_HOST)),
+            max_hosts=int(config.get('max_hosts', DEFAULT_MAX_HOSTS))
+        )
+
+    def _slots(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            slots = self._hosts.get(host)
+            if slots is None:
+                slots = self._hosts[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slots
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """Sendet einen Request über den Pool
+
+        ``timeout`` ersetzt nur den Read-Timeout, der Connect-Timeout kommt
+        immer aus der Konfiguration. Wirft ``requests.RequestException``
+        wie ``requests.request``, ``HostBusy`` wenn keine Verbindung frei wird.
+        """
+        read_timeout = self.read_timeout if timeout is None else timeout
+        slots = self._slots(url)
+        if not slots.acquire(timeout=self.connect_timeout):
+            raise HostBusy(f"Verbindungslimit für {urlsplit(url).netloc} erreicht")
+        try:
+            return self.session.request(method, url, timeout=(self.connect_timeout, read_timeout), **kwargs)
+        finally:
+            slots.release()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get_text(self, url, **kwargs):
+        """GET, gibt den Body bei Status 200 zurück, sonst None"""
+        try:
+            response = self.get(url, **kwargs)
+            return response.text if response.status_code == 200 else None
+        except requests.RequestException as e:
+            logger.debug(f"GET {url} fehlgeschlagen: {e}")
+            return None
+
+    def get_json(self, url, **kwargs):
+        """GET, gibt den JSON-Body bei Status 200 zurück, sonst None"""
+        text = self.get_text(url, **kwargs)
+        try:
+            return json.loads(text) if text is not None else None
+        except ValueError:
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_probe_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Gibt den prozessweit gemeinsamen Client zurück"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = PooledHTTPClient.from_config()
+        return _client
+
+
+def get_probe_client(max_per_host):
+    """Gibt den Client für parallele Proben zurück, mit max_per_host Verbindungen pro Host"""
+    global _probe_client
+    with _client_lock:
+        if _probe_client is None or _probe_client.max_per_host < max_per_host:
+            _probe_client = PooledHTTPClient.from_config(max_per_host=max_per_host)
+        return _probe_client
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts HTTP Core - Gemeinsamer HTTP-Server aller Bridges
+
+Alle Bridges starten ihren Server über ``create_bridge_server`` und leiten
+ihre Handler von ``BridgeRequestHandler`` ab. Der Abschnitt 'server' in
+``autodarts_config.json`` wählt den Modus:
+
+    threaded  Ein Thread pro Verbindung (ThreadingHTTPServer).
+    asyncio   Eine asyncio-Schleife nimmt Verbindungen an und wartet ohne
+              eigenen Thread auf den vollständigen Request-Kopf. Erst dann
+              übernimmt ein Handler-Thread. Langsame oder hängende Clients
+              kosten so keinen Thread.
+
+Jeder Request hat eine Deadline (``request_timeout``). Sie gilt als
+Socket-Timeout für Lesen und Schreiben und als Frist für Upstream-Aufrufe.
+Long-Polls der gecachten Endpunkte (``?wait=``) sind davon ausgenommen und
+warten bis zu ``MAX_WAIT`` Sekunden (``autodarts_response_cache``).
+
+Blockierende Aufrufe an die Desktop App oder den Board Manager laufen über
+einen begrenzten ``UpstreamPool``. Ist er ausgelastet, antwortet die Bridge
+sofort mit 503 statt Threads anzustauen. Die gecachten Endpunkte
+(``/status``, ``/score``) warten nie auf Upstream-I/O. Nötige Prüfungen
+stoßen sie mit ``refresh`` im Hintergrund an.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODE = 'threaded'
+DEFAULT_REQUEST_TIMEOUT = 10.0
+DEFAULT_UPSTREAM_WORKERS = 4
+DEFAULT_UPSTREAM_QUEUE = 16
+MAX_REQUEST_HEAD = 65536
+
+
+def load_server_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'server' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('server', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Server-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class UpstreamBusy(Exception):
+    """Der Upstream-Pool ist ausgelastet"""
+
+
+class UpstreamTimeout(Exception):
+    """Ein Upstream-Aufruf hat die Deadline des Requests überschritten"""
+
+
+class UpstreamPool:
+    """Begrenzter Worker-Pool für blockierende Upstream-Aufrufe"""
+
+    def __init__(self, max_workers=DEFAULT_UPSTREAM_WORKERS, max_queue=DEFAULT_UPSTREAM_QUEUE):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upstream')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._refreshing = {}
+
+    @classmethod
+    def from_config(cls, path='autodarts_config.json'):
+        """Erzeugt den Pool mit den Grenzen aus der Konfigurationsdatei"""
+        config = load_server_config(path)
+        return cls(
+            max_workers=int(config.get('upstream_workers', DEFAULT_UPSTREAM_WORKERS)),
+            max_queue=int(config.get('upstream_queue', DEFAULT_UPSTREAM_QUEUE))
+        )
+
+    def submit(self, fn, *args, **kwargs):
+        """Reiht einen Aufruf ein, wirft UpstreamBusy wenn Pool und Warteschlange voll sind"""
+        if not self._slots.acquire(blocking=False):
+            raise UpstreamBusy("Upstream-Pool ausgelastet")
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except RuntimeError:
+            self._slots.release()
+            raise UpstreamBusy("Upstream-Pool beendet")
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def call(self, fn, *args, deadline=None, **kwargs):
+        """Führt fn im Pool aus und wartet höchstens bis zur Deadline (time.monotonic)"""
+        future = self.submit(fn, *args, **kwargs)
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            raise UpstreamTimeout(f"{getattr(fn, '__name__', fn)} hat die Deadline überschritten")
+
+    def refresh(self, key, fn, *args, **kwargs):
+        """Stößt fn im Hintergrund an, solange für key nicht schon ein Aufruf läuft
+
+        Blockiert nie. Gibt False zurück, wenn nichts eingereiht wurde.
+        """
+        with self._lock:
+            running = self._refreshing.get(key)
+            if running is not None and not running.done():
+                return False
+            try:
+                future = self.submit(fn, *args, **kwargs)
+            except UpstreamBusy:
+                return False
+            self._refreshing[key] = future
+        future.add_done_callback(self._log_failure)
+        return True
+
+    @staticmethod
+    def _log_failure(future):
+        error = future.exception()
+        if error is not None:
+            logger.error(f"❌ Upstream-Aufruf fehlgeschlagen: {error}")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _PrefixedRaw(io.RawIOBase):
+    """Liest zuerst bereits empfangene Bytes, danach vom Socket"""
+
+    def __init__(self, prefix, raw):
+        self._prefix = memoryview(prefix)
+        self._raw = raw
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._prefix:
+            n = min(len(buffer), len(self._prefix))
+            buffer[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        return self._raw.readinto(buffer)
+
+    def close(self):
+        self._raw.close()
+        super().close()
+
+
+class BridgeRequestHandler(BaseHTTPRequestHandler):
+    """Basis aller Bridge-Handler: Deadline pro Request und Upstream-Aufrufe über den Pool"""
+
+    timeout = DEFAULT_REQUEST_TIMEOUT
+    deadline = None
+
+    def setup(self):
+        self.timeout = getattr(self.server, 'request_timeout', self.timeout)
+        super().setup()
+        take_prefix = getattr(self.server, 'take_prefix', None)
+        prefix = take_prefix(self.request) if take_prefix else b''
+        if prefix:
+            self.rfile.close()
+            self.rfile = io.BufferedReader(_PrefixedRaw(prefix, self.connection.makefile('rb', buffering=0)))
+
+    def parse_request(self):
+        self.deadline = time.monotonic() + self.timeout
+        return super().parse_request()
+
+    def call_upstream(self, fn, *args, **kwargs):
+        """Führt einen blockierenden Upstream-Aufruf im Pool der Bridge aus
+
+        Wirft UpstreamBusy oder UpstreamTimeout, der Handler-Thread wartet
+        nie länger als bis zur Deadline des Requests.
+        """
+        return self.bridge.upstream.call(fn, *args, deadline=self.deadline, **kwargs)
+
+
+class ThreadedBridgeServer(ThreadingHTTPServer):
+    """Ein Thread pro Verbindung"""
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, address, handler, request_timeout=DEFAULT_REQUEST_TIMEOUT):
+        self.request_timeout = request_timeout
+        super().__init__(address, handler)
+
+
+class AsyncioBridgeServer:
+    """asyncio-Frontend: liest Request-Köpfe ohne Thread, Handler laufen in Threads"""
+
+    def __init__(self, address, handler, request_timeout=DEFAULT_REQUEST_TIMEOUT):
+        self.RequestHandlerClass = handler
+        self.request_timeout = request_timeout
+        self.socket = socket.create_server(address, backlog=128)
+        self.socket.setblocking(False)
+        self.server_address = self.socket.getsockname()[:2]
+        self._prefixes = {}
+        self._prefix_lock = threading.Lock()
+        self._loop = None
+        self._stop = None
+
+    def serve_forever(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        accept = None
+        try:
+            while not self._stop.is_set():
+                accept = asyncio.ensure_future(self._loop.sock_accept(self.socket))
+                stop = asyncio.ensure_future(self._stop.wait())
+                done, _ = await asyncio.wait({accept, stop}, return_when=asyncio.FIRST_COMPLETED)
+                stop.cancel()
+                if accept in done:
+                    conn, address = accept.result()
+                    self._loop.create_task(self._read_head(conn, address))
+                else:
+                    accept.cancel()
+        finally:
+            self._loop = None
+
+    async def _read_head(self, conn, address):
+        """Wartet mit Deadline auf den vollständigen Request-Kopf"""
+        data = b''
+        try:
+            async def receive():
+                nonlocal data
+                while b'\r\n\r\n' not in data and len(data) < MAX_REQUEST_HEAD:
+                    chunk = await self._loop.sock_recv(conn, 4096)
+                    if not chunk:
+                        raise ConnectionError("Verbindung geschlossen")
+                    data += chunk
+
+            await asyncio.wait_for(receive(), self.request_timeout)
+        except (asyncio.TimeoutError, OSError):
+            conn.close()
+            return
+
+        conn.setblocking(True)
+        with self._prefix_lock:
+            self._prefixes[id(conn)] = data
+        threading.Thread(target=self._handle, args=(conn, address), daemon=True).start()
+
+    def take_prefix(self, conn):
+        """Gibt die bereits gelesenen Bytes einer Verbindung an den Handler"""
+        with self._prefix_lock:
+            return self._prefixes.pop(id(conn), b'')
+
+    def _handle(self, conn, address):
+        try:
+            self.RequestHandlerClass(conn, address, self)
+        except Exception as e:
+            logger.debug(f"Fehler im Handler für {address}: {e}")
+        finally:
+            with self._prefix_lock:
+                self._prefixes.pop(id(conn), None)
+            try:
+                conn.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            conn.close()
+
+    def shutdown(self):
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._stop.set)
+
+    def server_close(self):
+        self.socket.close()
+
+
+def create_bridge_server(handler, port, host='localhost', config_path='autodarts_config.json'):
+    """Erzeugt den HTTP-Server einer Bridge im konfigurierten Modus"""
+    config = load_server_config(config_path)
+    mode = config.get('mode', DEFAULT_MODE)
+    request_timeout = float(config.get('request_timeout', DEFAULT_REQUEST_TIMEOUT))
+
+    if mode == 'asyncio':
+        return AsyncioBridgeServer((host, port), handler, request_timeout)
+    if mode != 'threaded':
+        logger.warning(f"⚠️ Unbekannter Server-Modus '{mode}', verwende 'threaded'")
+    return ThreadedBridgeServer((host, port), handler, request_timeout)
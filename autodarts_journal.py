@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Journal - Append-only Wurf-Journal mit Wiederherstellung nach Absturz
+
+Jeder Wurf aus ``add_score`` wird an ein Journal auf der Platte angehängt.
+Beim Start baut die Bridge ihre Score-Historie daraus wieder auf, eine
+abgestürzte oder neu gestartete Bridge verliert also die Trainings-Session
+nicht mehr.
+
+Aufbau:
+    journal/<bridge>/segment-<erste seq>.log
+
+Ein Segment ist eine Folge längenpräfixierter Records. Ein Record fasst alle
+Würfe zusammen, die seit dem letzten Sync angefallen sind (Batched fsync):
+
+    length    u32   Länge des Records ab ``count``
+    crc32     u32   Prüfsumme über den Rest des Records
+    count     u32   Anzahl Würfe
+    n_sources u16   Anzahl neuer Quellen-Definitionen
+    Quellen   n_sources x (code u8, len u8, name utf-8)
+    Würfe     count x (seq u64, timestamp f64, score i32, source u8)
+
+Ein Wurf kostet damit 21 Byte auf der Platte, dazu 14 Byte pro Record.
+Quellennamen werden pro Segment einmal definiert und danach nur als Code
+referenziert, jedes Segment ist für sich lesbar.
+
+Ein Hintergrund-Thread schreibt alle ``fsync_interval`` Sekunden die
+angesammelten Würfe als einen Record und ruft ``fsync`` auf. Bei einem
+Absturz gehen höchstens die Würfe dieses Intervalls verloren. Ein
+abgerissener Record am Ende des letzten Segments wird beim Öffnen erkannt
+(Länge/CRC) und abgeschnitten.
+
+Die Wiederherstellung liest die Segmente per ``mmap`` sequentiell, prüft
+die CRC pro Record und entpackt die Würfe eines Records mit
+``struct.iter_unpack`` am Stück. Da die Historie nur ``capacity`` Würfe
+hält, werden nur so viele Segmente vom Ende her gelesen wie dafür nötig sind.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = 'journal'
+DEFAULT_FSYNC_INTERVAL = 1.0
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_SEGMENTS = 64
+MAX_PENDING_THROWS = 4096
+
+RECORD_HEADER = struct.Struct('<II')
+RECORD_COUNTS = struct.Struct('<IH')
+THROW = struct.Struct('<QdiB')
+
+
+def load_journal_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'journal' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('journal', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Journal-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+def _segment_name(first_seq):
+    return f"segment-{first_seq:012d}.log"
+
+
+def read_segment(path):
+    """Liest ein Segment sequentiell per mmap
+
+    Gibt (würfe, gültige_länge, quellen) zurück; würfe ist eine Liste von
+    (seq, timestamp, score, source), quellen bildet Code auf Namen ab.
+    gültige_länge endet vor dem ersten abgerissenen oder beschädigten Record.
+    """
+    throws = []
+    sources = {}
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return throws, 0, sources
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                offset = 0
+                while offset + RECORD_HEADER.size <= size:
+                    length, crc = RECORD_HEADER.unpack_from(view, offset)
+                    start = offset + RECORD_HEADER.size
+                    end = start + length
+                    if length < RECORD_COUNTS.size or end > size or zlib.crc32(view[start:end]) != crc:
+                        break
+
+                    count, n_sources = RECORD_COUNTS.unpack_from(view, start)
+                    pos = start + RECORD_COUNTS.size
+                    for _ in range(n_sources):
+                        code, name_length = view[pos], view[pos + 1]
+                        sources[code] = bytes(view[pos + 2:pos + 2 + name_length]).decode('utf-8', 'replace')
+                        pos += 2 + name_length
+
+                    names = sources
+                    throws.extend(
+                        (seq, timestamp, score, names.get(code, 'unknown'))
+                        for seq, timestamp, score, code
+                        in THROW.iter_unpack(view[pos:pos + count * THROW.size])
+                    )
+                    offset = end
+            finally:
+                view.release()
+
+    return throws, offset, sources
+
+
+class ThrowJournal:
+    """Append-only Journal aller Würfe einer Bridge"""
+
+    def __init__(self, directory, fsync_interval=DEFAULT_FSYNC_INTERVAL,
+                 segment_bytes=DEFAULT_SEGMENT_BYTES, max_segments=DEFAULT_MAX_SEGMENTS,
+                 enabled=True):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        self._sources = {}
+        self._pending = []
+        self._stop = threading.Event()
+        self._flush_thread = None
+
+    @classmethod
+    def from_config(cls, name, path='autodarts_config.json'):
+        """Erzeugt das Journal einer Bridge aus der Konfigurationsdatei"""
+        config = load_journal_config(path)
+        return cls(
+            os.path.join(config.get('directory', DEFAULT_DIRECTORY), name),
+            fsync_interval=float(config.get('fsync_interval', DEFAULT_FSYNC_INTERVAL)),
+            segment_bytes=int(config.get('segment_bytes', DEFAULT_SEGMENT_BYTES)),
+            max_segments=int(config.get('max_segments', DEFAULT_MAX_SEGMENTS)),
+            enabled=bool(config.get('enabled', True))
+        )
+
+    def _segments(self):
+        """Alle Segmentdateien, älteste zuerst"""
+        try:
+            names = sorted(n for n in os.listdir(self.directory)
+                           if n.startswith('segment-') and n.endswith('.log'))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, n) for n in names]
+
+    def replay(self):
+        """Liefert alle Würfe aus allen Segmenten in Reihenfolge"""
+        for path in self._segments():
+            throws, _, _ = read_segment(path)
+            yield from throws
+
+    def recover(self, history):
+        """Baut die Historie aus dem Journal wieder auf und öffnet es zum Schreiben
+
+        Gibt die Anzahl wiederhergestellter Würfe zurück.
+        """
+        if not self.enabled:
+            return 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self._segments()
+
+        # Nur so viele Segmente vom Ende her lesen wie die Historie fasst
+        chunks = []
+        count = 0
+        last_sources = None
+        for path in reversed(segments):
+            throws, valid, sources = read_segment(path)
+            chunks.append(throws)
+            if last_sources is None:
+                self._truncate_tail(path, valid)
+                last_sources = {name: code for code, name in sources.items()}
+            count += len(throws)
+            if count >= history.capacity:
+                break
+
+        tail = [throw for throws in reversed(chunks) for throw in throws][-history.capacity:]
+        if tail:
+            history.restore(tail)
+            logger.info(f"📼 {len(tail)} Würfe aus dem Journal wiederhergestellt "
+                        f"(letzte Sequenz {tail[-1][0]})")
+
+        self._open_segment(history.last_seq() + 1, reuse_sources=last_sources)
+        self._flush_thread = threading.Thread(target=self._flush_worker, daemon=True)
+        self._flush_thread.start()
+        return len(tail)
+
+    def _truncate_tail(self, path, valid):
+        """Schneidet einen abgerissenen Record am Ende des letzten Segments ab"""
+        size = os.path.getsize(path)
+        if valid < size:
+            logger.warning(f"⚠️ Journal {path}: {size - valid} Byte am Ende beschädigt - abgeschnitten")
+            with open(path, 'r+b') as f:
+                f.truncate(valid)
+
+    def _open_segment(self, first_seq, reuse_sources=None):
+        """Öffnet das Segment zum Anhängen
+
+        Mit reuse_sources wird an das letzte vorhandene Segment angehängt und
+        dessen Quellen-Definitionen weiterverwendet.
+        """
+        segments = self._segments()
+        if reuse_sources is not None and segments and os.path.getsize(segments[-1]) < self.segment_bytes:
+            path = segments[-1]
+            self._sources = dict(reuse_sources)
+        else:
+            path = os.path.join(self.directory, _segment_name(first_seq))
+            self._sources = {}
+        self._file = open(path, 'ab', buffering=0)
+        self._size = self._file.tell()
+        self._prune()
+
+    def _prune(self):
+        """Löscht die ältesten Segmente über max_segments"""
+        if self.max_segments <= 0:
+            return
+        segments = self._segments()
+        for path in segments[:max(0, len(segments) - self.max_segments)]:
+            try:
+                os.remove(path)
+                logger.info(f"🧹 Altes Journal-Segment gelöscht: {path}")
+            except OSError as e:
+                logger.warning(f"⚠️ Journal-Segment {path} nicht löschbar: {e}")
+
+    def append(self, entry):
+        """Merkt einen Wurf (Eintrag aus ScoreHistory.append) für den nächsten Sync vor"""
+        if not self.enabled or self._file is None:
+            return
+
+        with self._lock:
+            self._pending.append((entry['seq'], entry['timestamp'], entry['score'], entry['source']))
+            flush_now = len(self._pending) >= MAX_PENDING_THROWS
+
+        if flush_now:
+            self.sync()
+
+    def _encode(self, throws):
+        """Kodiert Würfe als einen Record, der Lock muss gehalten werden"""
+        definitions = []
+        packed = []
+        for seq, timestamp, score, source in throws:
+            code = self._sources.get(source)
+            if code is None:
+                code = len(self._sources) + 1
+                if code > 255:
+                    code = 0
+                else:
+                    self._sources[source] = code
+                    name = source.encode('utf-8')[:255]
+                    definitions.append(bytes((code, len(name))) + name)
+            packed.append(THROW.pack(seq, timestamp, score, code))
+
+        body = RECORD_COUNTS.pack(len(packed), len(definitions)) + b''.join(definitions) + b''.join(packed)
+        return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+    def sync(self):
+        """Schreibt alle vorgemerkten Würfe als einen Record und ruft fsync auf"""
+        with self._lock:
+            if not self._pending or self._file is None:
+                return
+            throws = self._pending
+            self._pending = []
+
+            try:
+                if self._size >= self.segment_bytes:
+                    self._file.close()
+                    self._open_segment(throws[0][0])
+                record = self._encode(throws)
+                self._file.write(record)
+                self._size += len(record)
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                logger.error(f"❌ Fehler beim Schreiben ins Journal: {e}")
+
+    def _flush_worker(self):
+        while not self._stop.wait(self.fsync_interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"❌ Fehler beim Journal-Sync: {e}")
+
+    def close(self):
+        """Schreibt ausstehende Würfe und schließt das Journal"""
+        self._stop.set()
+        if self._file is None:
+            return
+        self.sync()
+        with self._lock:
+            self._file.close()
+            self._file = None
@@ -8,8 +8,13 @@ import json
 import logging
 import time
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server
+from autodarts_ws_server import BroadcastServer
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,7 +23,14 @@ logger = logging.getLogger(__name__)
 class AutodartsManualBridge:
     def __init__(self):
         self.last_score = 0
-        self.score_history = []
+        self.score_history = ScoreHistory.from_config()
+        # Sequenznummer und Journal-Reihenfolge gemeinsam vergeben (HTTP- und Poll-Threads)
+        self._history_lock = threading.Lock()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.journal = ThrowJournal.from_config('manual')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
         self.desktop_connected = True  # Simuliere dass Desktop App läuft
         self.auto_score_active = False
         
@@ -29,11 +41,10 @@ class AutodartsManualBridge:
     def add_score(self, score):
         """Fügt einen Score hinzu"""
         self.last_score = score
-        self.score_history.append({
-            'score': score,
-            'timestamp': time.time(),
-            'source': 'manual'
-        })
+        with self._history_lock:
+            entry = self.score_history.append(score, 'manual')
+            self.journal.append(entry)
+        self.events.publish('score', entry)
         logger.info(f"🎯 Score hinzugefügt: {score}")
 
     def get_status(self):
@@ -48,29 +59,34 @@ class AutodartsManualBridge:
 
     def get_score(self):
         """Gibt den letzten Score zurück"""
+        latest = self.score_history.latest()
         return {
             'success': True,
             'score': self.last_score,
-            'timestamp': time.time()
+            'timestamp': latest['timestamp'] if latest else time.time()
         }
 
-    def get_scores(self):
-        """Gibt die Score-Historie zurück"""
+    def get_scores(self, cursor=None):
+        """Gibt die Score-Historie zurück, mit Cursor nur die neuen Würfe"""
+        if cursor is not None:
+            return self.score_history.since(*cursor)
         return {
             'success': True,
-            'scores': self.score_history[-10:],  # Letzte 10 Scores
+            'scores': self.score_history.last(10),  # Letzte 10 Scores
             'count': len(self.score_history)
         }
 
     def start_auto_score(self):
         """Startet Auto-Score (simuliert)"""
         self.auto_score_active = True
+        self.events.publish('status', {'auto_score_active': True})
         logger.info("▶️ Auto-Score gestartet (simuliert)")
         return {'success': True, 'message': 'Auto-Score gestartet'}
 
     def stop_auto_score(self):
         """Stoppt Auto-Score"""
         self.auto_score_active = False
+        self.events.publish('status', {'auto_score_active': False})
         logger.info("⏹️ Auto-Score gestoppt")
         return {'success': True, 'message': 'Auto-Score gestoppt'}
 
@@ -79,7 +95,7 @@ class AutodartsManualBridge:
         self.add_score(score)
         return {'success': True, 'message': f'Test-Score {score} hinzugefügt'}
 
-class ManualBridgeHandler(BaseHTTPRequestHandler):
+class ManualBridgeHandler(BridgeRequestHandler):
     def __init__(self, *args, **kwargs):
         self.bridge = kwargs.pop('bridge')
         super().__init__(*args, **kwargs)
@@ -92,33 +108,25 @@ class ManualBridgeHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        path = urlparse(self.path).path
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
         
         if path == '/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            status = self.bridge.get_status()
-            self.wfile.write(json.dumps(status).encode())
+            serve_cached(self, self.bridge.responses, 'status', self.bridge.get_status)
             
         elif path == '/score':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            score_data = self.bridge.get_score()
-            self.wfile.write(json.dumps(score_data).encode())
+            serve_cached(self, self.bridge.responses, 'score', self.bridge.get_score)
             
+        elif path == '/events':
+            stream_events(self, self.bridge.events, parsed_url.query)
+
         elif path == '/scores':
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            scores_data = self.bridge.get_scores()
+            scores_data = self.bridge.get_scores(parse_cursor_query(parsed_url.query))
             self.wfile.write(json.dumps(scores_data).encode())
             
         else:
@@ -160,12 +168,16 @@ class ManualBridgeHandler(BaseHTTPRequestHandler):
 def main():
     bridge = AutodartsManualBridge()
     handler = lambda *args, **kwargs: ManualBridgeHandler(*args, bridge=bridge, **kwargs)
-    server = HTTPServer(('localhost', 8766), handler)
+    server = create_bridge_server(handler, 8766)
+    push_server = BroadcastServer(bridge.events)
+    push_server.start()
     
     print("🚀 Autodarts Manual Bridge läuft auf Port 8766")
     print("📡 Status: http://localhost:8766/status")
     print("🎯 Scores: http://localhost:8766/score")
     print("📊 Score History: http://localhost:8766/scores")
+    print("📣 Live-Events (SSE): http://localhost:8766/events")
+    print(f"🔌 Live-Events (WebSocket): ws://localhost:{push_server.port}")
     print("▶️  Start Auto-Score: http://localhost:8766/start_auto_score")
     print("⏹️  Stop Auto-Score: http://localhost:8766/stop_auto_score")
     print("🧪 Test Score: http://localhost:8766/test_score")
@@ -178,6 +190,9 @@ def main():
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n🛑 Bridge wird gestoppt...")
+        push_server.stop()
+        bridge.events.close()
+        bridge.journal.close()
         server.shutdown()
 
 if __name__ == "__main__":
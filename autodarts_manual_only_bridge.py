@@ -8,8 +8,13 @@ import json
 import logging
 import time
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server
+from autodarts_ws_server import BroadcastServer
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,7 +23,14 @@ logger = logging.getLogger(__name__)
 class AutodartsManualOnlyBridge:
     def __init__(self):
         self.last_score = 0
-        self.score_history = []
+        self.score_history = ScoreHistory.from_config()
+        # Sequenznummer und Journal-Reihenfolge gemeinsam vergeben (HTTP- und Poll-Threads)
+        self._history_lock = threading.Lock()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.journal = ThrowJournal.from_config('manual_only')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
         self.desktop_connected = True  # Simuliere dass Desktop App läuft
         self.auto_score_active = False  # IMMER deaktiviert
         self.score_generator_running = False  # IMMER deaktiviert
@@ -31,11 +43,10 @@ class AutodartsManualOnlyBridge:
     def add_manual_score(self, score):
         """Fügt manuellen Score hinzu"""
         self.last_score = score
-        self.score_history.append({
-            'score': score,
-            'timestamp': time.time(),
-            'source': 'manual'
-        })
+        with self._history_lock:
+            entry = self.score_history.append(score, 'manual')
+            self.journal.append(entry)
+        self.events.publish('score', entry)
         logger.info(f"🎯 Manueller Score hinzugefügt: {score}")
 
     def get_status(self):
@@ -50,7 +61,17 @@ class AutodartsManualOnlyBridge:
             'mode': 'MANUAL_ONLY'
         }
 
-class ManualOnlyBridgeHandler(BaseHTTPRequestHandler):
+    def get_score(self):
+        """Gibt den letzten Score zurück"""
+        latest = self.score_history.latest()
+        return {
+            'success': True,
+            'score': self.last_score,
+            'timestamp': latest['timestamp'] if latest else time.time(),
+            'source': 'manual'
+        }
+
+class ManualOnlyBridgeHandler(BridgeRequestHandler):
     def __init__(self, *args, **kwargs):
         self.bridge = kwargs.pop('bridge')
         super().__init__(*args, **kwargs)
@@ -63,30 +84,17 @@ class ManualOnlyBridgeHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        path = urlparse(self.path).path
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
         
         if path == '/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            serve_cached(self, self.bridge.responses, 'status', self.bridge.get_status)
             
-            status = self.bridge.get_status()
-            self.wfile.write(json.dumps(status).encode())
-        
         elif path == '/score':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            serve_cached(self, self.bridge.responses, 'score', self.bridge.get_score)
             
-            response = {
-                'success': True,
-                'score': self.bridge.last_score,
-                'timestamp': time.time(),
-                'source': 'manual'
-            }
-            self.wfile.write(json.dumps(response).encode())
+        elif path == '/events':
+            stream_events(self, self.bridge.events, parsed_url.query)
 
         elif path == '/scores':
             self.send_response(200)
@@ -94,7 +102,12 @@ class ManualOnlyBridgeHandler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            self.wfile.write(json.dumps(self.bridge.score_history).encode())
+            cursor = parse_cursor_query(parsed_url.query)
+            if cursor is not None:
+                scores = self.bridge.score_history.since(*cursor)
+            else:
+                scores = self.bridge.score_history.to_list()
+            self.wfile.write(json.dumps(scores).encode())
 
         else:
             self.send_response(404)
@@ -166,12 +179,16 @@ class ManualOnlyBridgeHandler(BaseHTTPRequestHandler):
 def main():
     bridge = AutodartsManualOnlyBridge()
     handler = lambda *args, **kwargs: ManualOnlyBridgeHandler(bridge=bridge, *args, **kwargs)
-    server = HTTPServer(('localhost', 8766), handler)
+    server = create_bridge_server(handler, 8766)
+    push_server = BroadcastServer(bridge.events)
+    push_server.start()
     
     print("🚀 Autodarts Manual Only Bridge läuft auf Port 8766")
     print("📡 Status: http://localhost:8766/status")
     print("🎯 Scores: http://localhost:8766/score")
     print("📊 Score History: http://localhost:8766/scores")
+    print("📣 Live-Events (SSE): http://localhost:8766/events")
+    print(f"🔌 Live-Events (WebSocket): ws://localhost:{push_server.port}")
     print("⛔ Auto-Score: PERMANENT DEAKTIVIERT")
     print("✅ Manuelle Eingabe: AKTIVIERT")
     print("💡 Tipp: Öffnen Sie http://localhost:8080/index.html")
@@ -181,6 +198,9 @@ def main():
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n🛑 Bridge wird gestoppt...")
+        push_server.stop()
+        bridge.events.close()
+        bridge.journal.close()
         server.shutdown()
 
 if __name__ == "__main__":
@@ -9,19 +9,42 @@ import logging
 import time
 import threading
 import requests
-import subprocess
 import websocket
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, StatusField, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_capture import StreamCapture
+from autodarts_segments import segment_points
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_simulator import DartSimulator
+from autodarts_discovery import DiscoveryCache
+from autodarts_process_watch import ProcessWatch
+from autodarts_prober import probe_first, websocket_probe
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server
+from autodarts_ws_server import BroadcastServer
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class AutodartsOBSBridge:
+    # Änderungen lösen ein 'status'-Event aus und invalidieren den Response-Cache
+    desktop_connected = StatusField()
+
     def __init__(self):
         self.last_score = 0
-        self.score_history = []
+        self.score_history = ScoreHistory.from_config()
+        # Sequenznummer und Journal-Reihenfolge gemeinsam vergeben (HTTP- und Poll-Threads)
+        self._history_lock = threading.Lock()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.discovery = DiscoveryCache.from_config()
+        self.process_watch = ProcessWatch.from_config(bus=self.events, cache=self.discovery)
+        self.journal = ThrowJournal.from_config('obs')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
+        self.capture = StreamCapture.from_config('obs')
         self.desktop_connected = False
         self.auto_score_active = False
         self.score_generator_running = False
@@ -29,6 +52,7 @@ class AutodartsOBSBridge:
         # Score-Generator für Tests
         self.score_generator_thread = None
         self.stop_generator = threading.Event()
+        self.simulator = DartSimulator.from_config()
         
         # WebSocket-Verbindung zur echten App
         self.ws = None
@@ -36,6 +60,8 @@ class AutodartsOBSBridge:
         self.ws_connected = False
         
         # Prüfe Desktop App
+        self.process_watch.start()
+        self.process_watch.subscribe(self.on_desktop_presence)
         self.check_desktop_app()
         
         # Starte WebSocket-Verbindung
@@ -43,13 +69,15 @@ class AutodartsOBSBridge:
         
         logger.info("🚀 Autodarts OBS Bridge initialisiert")
 
+    def on_desktop_presence(self, running):
+        """ProcessWatch meldet Start oder Ende der Desktop App"""
+        self.desktop_connected = running
+
     def check_desktop_app(self):
         """Überprüft ob die Desktop App läuft"""
         try:
-            result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq "Autodarts Desktop.exe"'], 
-                                  capture_output=True, text=True, shell=True, encoding='utf-8', errors='ignore')
-            
-            if "Autodarts Desktop.exe" in result.stdout:
+            # Gecachter Zustand des ProcessWatch, kein Prozess-Scan pro Aufruf
+            if self.process_watch.running:
                 self.desktop_connected = True
                 logger.info("✅ Desktop App läuft")
             else:
@@ -67,7 +95,7 @@ class AutodartsOBSBridge:
             return
         
         try:
-            # WebSocket-URLs testen
+            # WebSocket-URLs testen, die zuletzt funktionierende zuerst
             ws_urls = [
                 "ws://localhost:3180/ws",
                 "ws://localhost:3180/websocket",
@@ -76,26 +104,26 @@ class AutodartsOBSBridge:
                 "ws://192.168.2.72:3180/websocket"
             ]
             
-            for url in ws_urls:
-                try:
-                    self.ws = websocket.WebSocketApp(
-                        url,
-                        on_open=self.on_ws_open,
-                        on_message=self.on_ws_message,
-                        on_error=self.on_ws_error,
-                        on_close=self.on_ws_close
-                    )
-                    
-                    # WebSocket in separatem Thread starten
-                    self.ws_thread = threading.Thread(target=self.ws.run_forever, daemon=True)
-                    self.ws_thread.start()
-                    
-                    logger.info(f"🌐 WebSocket gestartet: {url}")
-                    break
-                    
-                except Exception as e:
-                    logger.debug(f"WebSocket {url} fehlgeschlagen: {e}")
-                    continue
+            url = self.discovery.resolve(
+                'websocket_url',
+                validate=lambda url: websocket_probe(url, timeout=1),
+                discover=lambda: probe_first(ws_urls, lambda url: url if websocket_probe(url) else None)
+            )
+            
+            if url:
+                self.ws = websocket.WebSocketApp(
+                    url,
+                    on_open=self.on_ws_open,
+                    on_message=self.on_ws_message,
+                    on_error=self.on_ws_error,
+                    on_close=self.on_ws_close
+                )
+                
+                # WebSocket in separatem Thread starten
+                self.ws_thread = threading.Thread(target=self.ws.run_forever, daemon=True)
+                self.ws_thread.start()
+                
+                logger.info(f"🌐 WebSocket gestartet: {url}")
             
             if not self.ws:
                 logger.warning("⚠️ Keine WebSocket-Verbindung möglich - verwende Simulation")
@@ -108,10 +136,12 @@ class AutodartsOBSBridge:
     def on_ws_open(self, ws):
         """WebSocket geöffnet"""
         self.ws_connected = True
+        self.events.publish('status', {'websocket_connected': True})
         logger.info("✅ WebSocket verbunden")
 
     def on_ws_message(self, ws, message):
         """WebSocket Nachricht empfangen"""
+        self.capture.frame(message)
         try:
             data = json.loads(message)
             logger.debug(f"WebSocket Nachricht: {data}")
@@ -132,6 +162,7 @@ class AutodartsOBSBridge:
     def on_ws_close(self, ws, close_status_code, close_msg):
         """WebSocket geschlossen"""
         self.ws_connected = False
+        self.events.publish('status', {'websocket_connected': False})
         logger.warning("⚠️ WebSocket geschlossen")
 
     def extract_score_from_message(self, data):
@@ -150,7 +181,7 @@ class AutodartsOBSBridge:
             if 'segment' in data:
                 segment = data['segment']
                 if isinstance(segment, str):
-                    return self.parse_segment(segment)
+                    return segment_points(segment) or 0
                     
             return 0
             
@@ -158,20 +189,6 @@ class AutodartsOBSBridge:
             logger.debug(f"Score-Extraktion fehlgeschlagen: {e}")
             return 0
 
-    def parse_segment(self, segment):
-        """Parst Dart-Segment zu Score"""
-        try:
-            if segment.startswith('D'):  # Double
-                return int(segment[1:]) * 2
-            elif segment.startswith('T'):  # Triple
-                return int(segment[1:]) * 3
-            elif segment.startswith('S'):  # Single
-                return int(segment[1:])
-            else:
-                return int(segment)
-        except:
-            return 0
-
     def start_score_generator(self):
         """Startet den Score-Generator für Tests"""
         if self.score_generator_running:
@@ -182,6 +199,7 @@ class AutodartsOBSBridge:
         self.stop_generator.clear()
         self.score_generator_thread = threading.Thread(target=self._score_generator_worker, daemon=True)
         self.score_generator_thread.start()
+        self.events.publish('status', {'auto_score_active': True})
         logger.info("▶️ Auto-Score gestartet (Simulation)")
 
     def stop_score_generator(self):
@@ -194,53 +212,17 @@ class AutodartsOBSBridge:
         self.stop_generator.set()
         if self.score_generator_thread:
             self.score_generator_thread.join(timeout=1)
+        self.events.publish('status', {'auto_score_active': False})
         logger.info("⏹️ Auto-Score gestoppt")
 
     def _score_generator_worker(self):
-        """Score-Generator Worker Thread"""
+        """Score-Generator Worker Thread: simulierte Darts auf echter Board-Geometrie"""
         while not self.stop_generator.is_set() and self.auto_score_active:
             try:
-                # Simuliere echte Dart-Scores basierend auf den Logs
-                import random
-                
-                # Echte Dart-Scores (häufigste)
-                dart_scores = [
-                    20, 20, 20, 20, 20,  # Single 20 (häufigster)
-                    25, 25, 25,          # Bull
-                    18, 18, 18,          # Single 18
-                    19, 19, 19,          # Single 19
-                    17, 17, 17,          # Single 17
-                    16, 16, 16,          # Single 16
-                    15, 15, 15,          # Single 15
-                    14, 14, 14,          # Single 14
-                    13, 13, 13,          # Single 13
-                    12, 12, 12,          # Single 12
-                    11, 11, 11,          # Single 11
-                    10, 10, 10,          # Single 10
-                    9, 9, 9,             # Single 9
-                    8, 8, 8,             # Single 8
-                    7, 7, 7,             # Single 7
-                    6, 6, 6,             # Single 6
-                    5, 5, 5,             # Single 5
-                    4, 4, 4,             # Single 4
-                    3, 3, 3,             # Single 3
-                    2, 2, 2,             # Single 2
-                    1, 1, 1,             # Single 1
-                    40, 40,              # Double 20
-                    50, 50,              # Bull
-                    60, 60,              # Triple 20
-                    100, 100,            # Double Bull
-                    120, 120,            # Triple 20
-                    180                  # Triple 20 (höchster)
-                ]
-                
-                score = random.choice(dart_scores)
-                
-                # Simuliere echte Wurf-Zeiten (3-8 Sekunden zwischen Würfen)
-                time.sleep(random.uniform(3, 8))
-                
-                self.add_score(score, "desktop_simulation")
-                
+                for dart in self.simulator.stream(self.stop_generator):
+                    if not self.auto_score_active:
+                        return
+                    self.add_score(dart.segment.points, "desktop_simulation")
             except Exception as e:
                 logger.error(f"Fehler im Score-Generator: {e}")
                 time.sleep(1)
@@ -248,15 +230,37 @@ class AutodartsOBSBridge:
     def add_score(self, score, source):
         """Fügt Score zur Historie hinzu"""
         self.last_score = score
-        self.score_history.append({
-            'score': score,
-            'timestamp': time.time(),
-            'source': source
-        })
+        with self._history_lock:
+            entry = self.score_history.append(score, source)
+            self.journal.append(entry)
+        self.events.publish('score', entry)
         
         logger.info(f"🎯 Score empfangen: {score} ({source})")
 
-class OBSBridgeHandler(BaseHTTPRequestHandler):
+    def get_status(self):
+        """Gibt den aktuellen Status zurück"""
+        return {
+            'connected': True,
+            'desktop_connected': self.desktop_connected,
+            'websocket_connected': self.ws_connected,
+            'auto_score_active': self.auto_score_active,
+            'last_score': self.last_score,
+            'score_history_count': len(self.score_history),
+            'username': 'Desktop App User',
+            'camera_status': 'Aktiv' if self.desktop_connected else 'Nicht verfügbar'
+        }
+
+    def get_score(self):
+        """Gibt den letzten Score zurück"""
+        latest = self.score_history.latest()
+        return {
+            'success': True,
+            'score': self.last_score,
+            'timestamp': latest['timestamp'] if latest else time.time(),
+            'source': 'websocket' if self.ws_connected else 'simulation'
+        }
+
+class OBSBridgeHandler(BridgeRequestHandler):
     def __init__(self, *args, **kwargs):
         self.bridge = kwargs.pop('bridge')
         super().__init__(*args, **kwargs)
@@ -269,39 +273,17 @@ class OBSBridgeHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        path = urlparse(self.path).path
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
         
         if path == '/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            serve_cached(self, self.bridge.responses, 'status', self.bridge.get_status)
             
-            status = {
-                'connected': True,
-                'desktop_connected': self.bridge.desktop_connected,
-                'websocket_connected': self.bridge.ws_connected,
-                'auto_score_active': self.bridge.auto_score_active,
-                'last_score': self.bridge.last_score,
-                'score_history_count': len(self.bridge.score_history),
-                'username': 'Desktop App User',
-                'camera_status': 'Aktiv' if self.bridge.desktop_connected else 'Nicht verfügbar'
-            }
-            self.wfile.write(json.dumps(status).encode())
-        
         elif path == '/score':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            serve_cached(self, self.bridge.responses, 'score', self.bridge.get_score)
             
-            response = {
-                'success': True,
-                'score': self.bridge.last_score,
-                'timestamp': time.time(),
-                'source': 'websocket' if self.bridge.ws_connected else 'simulation'
-            }
-            self.wfile.write(json.dumps(response).encode())
+        elif path == '/events':
+            stream_events(self, self.bridge.events, parsed_url.query)
 
         elif path == '/scores':
             self.send_response(200)
@@ -309,7 +291,12 @@ class OBSBridgeHandler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            self.wfile.write(json.dumps(self.bridge.score_history).encode())
+            cursor = parse_cursor_query(parsed_url.query)
+            if cursor is not None:
+                scores = self.bridge.score_history.since(*cursor)
+            else:
+                scores = self.bridge.score_history.to_list()
+            self.wfile.write(json.dumps(scores).encode())
 
         else:
             self.send_response(404)
@@ -365,12 +352,16 @@ class OBSBridgeHandler(BaseHTTPRequestHandler):
 def main():
     bridge = AutodartsOBSBridge()
     handler = lambda *args, **kwargs: OBSBridgeHandler(bridge=bridge, *args, **kwargs)
-    server = HTTPServer(('localhost', 8766), handler)
+    server = create_bridge_server(handler, 8766)
+    push_server = BroadcastServer(bridge.events)
+    push_server.start()
     
     print("🚀 Autodarts OBS Bridge läuft auf Port 8766")
     print("📡 Status: http://localhost:8766/status")
     print("🎯 Scores: http://localhost:8766/score")
     print("📊 Score History: http://localhost:8766/scores")
+    print("📣 Live-Events (SSE): http://localhost:8766/events")
+    print(f"🔌 Live-Events (WebSocket): ws://localhost:{push_server.port}")
     print("▶️  Start Auto-Score: http://localhost:8766/start_auto_score")
     print("⏹️  Stop Auto-Score: http://localhost:8766/stop_auto_score")
     print("🧪 Test Score: http://localhost:8766/test_score")
@@ -384,6 +375,11 @@ def main():
     except KeyboardInterrupt:
         print("\n🛑 Bridge wird gestoppt...")
         bridge.stop_score_generator()
+        push_server.stop()
+        bridge.events.close()
+        bridge.journal.close()
+        bridge.capture.close()
+        bridge.process_watch.stop()
         if bridge.ws:
             bridge.ws.close()
         server.shutdown()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Poller - Adaptives Polling des Board-Manager-Status
+
+Der Board Manager bietet nur ``/api/board/status`` als Text an, ein Push gibt
+es nicht. Statt ihn stur alle 2 Sekunden abzufragen und jedes Mal alle
+Regexe über den Text laufen zu lassen, arbeitet der Poller so:
+
+- Änderungserkennung: der Text wird gehasht, bei gleichem Hash wird nichts
+  geparst und nichts gemeldet
+- Würfe werden über Zustandsübergänge erkannt: ein neuer Wurf ist der
+  Übergang in einen Status mit ``Throw detected`` oder, solange der Marker
+  steht, ein geänderter Wurf-Inhalt (Segmente mit Dart-Index, Punktzahl).
+  Zwei gleiche Scores mit Dart-Index (``dart=1``, ``dart=2``) sind damit
+  zwei Würfe; ändert sich bei stehendem Marker nur anderer Text (Kamera-
+  Zähler, Zeitstempel), bleibt es ein Wurf.
+- Adaptives Intervall: nach einem Wurf wird für ``burst`` Sekunden mit
+  ``min_interval`` gepollt (die nächsten Darts der Aufnahme kommen gleich),
+  danach wächst das Intervall mit Faktor ``backoff`` bis ``max_interval``.
+  Ist der Board Manager nicht erreichbar, gilt ``base_interval``.
+
+    poller = AdaptivePoller.from_config(fetch_status)
+    change = poller.poll()
+    if change and change.throw:
+        score = parse(change.text)
+    stop.wait(poller.next_interval())
+"""
+
+import json
+import logging
+import time
+from collections import namedtuple
+
+from autodarts_board_status import parse_status
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 0.25
+DEFAULT_BASE_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 8.0
+DEFAULT_BACKOFF = 1.5
+DEFAULT_BURST = 5.0
+THROW_MARKER = "Throw detected"
+
+StatusChange = namedtuple('StatusChange', 'text changed throw')
+
+
+def load_poller_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'board_poller' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('board_poller', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Poller-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class AdaptivePoller:
+    """Pollt eine Status-Quelle mit Änderungserkennung und adaptivem Intervall"""
+
+    def __init__(self, fetch, min_interval=DEFAULT_MIN_INTERVAL, base_interval=DEFAULT_BASE_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL, backoff=DEFAULT_BACKOFF, burst=DEFAULT_BURST,
+                 marker=THROW_MARKER):
+        self.fetch = fetch
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.burst = burst
+        self.marker = marker
+
+        self.interval = base_interval
+        self.burst_until = 0.0
+        self.last_hash = None
+        self.in_throw = False
+        self.throw_key = None
+
+        self.polls = 0
+        self.unchanged = 0
+        self.throws = 0
+
+    @classmethod
+    def from_config(cls, fetch, path='autodarts_config.json', **overrides):
+        """Erzeugt den Poller mit Intervallen aus der Konfigurationsdatei
+
+        ``overrides`` (z.B. aus einer Quellen-Konfiguration) haben Vorrang,
+        None-Werte werden ignoriert.
+        """
+        config = load_poller_config(path)
+        config.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(
+            fetch,
+            min_interval=float(config.get('min_interval', DEFAULT_MIN_INTERVAL)),
+            base_interval=float(config.get('base_interval', DEFAULT_BASE_INTERVAL)),
+            max_interval=float(config.get('max_interval', DEFAULT_MAX_INTERVAL)),
+            backoff=float(config.get('backoff', DEFAULT_BACKOFF)),
+            burst=float(config.get('burst', DEFAULT_BURST))
+        )
+
+    def poll(self):
+        """Fragt den Status einmal ab
+
+        Gibt None zurück wenn die Quelle nicht antwortet, sonst
+        ``StatusChange(text, changed, throw)``. ``throw`` ist nur beim
+        Übergang in einen neuen Wurf-Zustand True.
+        """
+        self.polls += 1
+        text = self.fetch()
+        if text is None:
+            self.interval = self.base_interval
+            return None
+
+        digest = hash(text)
+        if digest == self.last_hash:
+            self.unchanged += 1
+            self._idle()
+            return StatusChange(text, False, False)
+
+        # Der erste Status ist nur die Ausgangslage, ein dort stehender Wurf ist alt
+        first = self.last_hash is None
+        self.last_hash = digest
+        was_in_throw = self.in_throw
+        self.in_throw = self.marker in text
+        # Inhalt des Wurfs (Segmente mit Dart-Index, Punktzahl) ohne den restlichen Text
+        key = parse_status(text)[1:] if self.in_throw else None
+        throw = self.in_throw and not first and (not was_in_throw or key != self.throw_key)
+        self.throw_key = key
+        if throw:
+            self.throws += 1
+            self.burst_until = time.monotonic() + self.burst
+        # Jede Änderung ist Aktivität am Board
+        self.interval = self.min_interval
+        return StatusChange(text, True, throw)
+
+    def _idle(self):
+        if time.monotonic() < self.burst_until:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+    def next_interval(self):
+        """Wartezeit bis zum nächsten poll()"""
+        return self.interval
+
+    def stats(self):
+        return {
+            'interval': round(self.interval, 3),
+            'polls': self.polls,
+            'unchanged': self.unchanged,
+            'throws': self.throws
+        }
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Prober - Paralleles Abtasten von Ports und Endpunkten
+
+Der Desktop Detector und die Bridges suchen die Desktop App, indem sie eine
+Liste von Ports und Endpunkten durchprobieren. Nacheinander kostet das pro
+Kandidat bis zu einen Timeout. Hier laufen alle Proben gleichzeitig in einem
+Thread-Pool unter einer gemeinsamen Deadline:
+
+- ``probe_all`` sammelt alle Treffer bis zur Deadline
+- ``probe_first`` liefert den Treffer mit der höchsten Priorität (Position in
+  der Kandidatenliste), sobald alle davor liegenden Kandidaten erledigt sind,
+  und bricht den Rest ab
+
+Ein voller Scan dauert damit ungefähr einen Timeout. Laufende Proben werden
+beim Abbruch nicht abgewartet, sie enden spätestens mit ihrem eigenen Timeout.
+
+    url = probe_first(["http://localhost:8080", "http://localhost:3180"],
+                      lambda url: http_probe(f"{url}/status", timeout=2) and url)
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeout
+from functools import lru_cache
+
+try:
+    from autodarts_http_client import HostBusy, get_probe_client
+except ImportError:
+    get_probe_client = None
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_MAX_WORKERS = 16
+
+
+def load_probe_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'probe' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('probe', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Probe-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+def _probe(candidates, check, timeout, max_workers, first):
+    """Führt check für alle Kandidaten parallel aus
+
+    Gibt eine Liste von (index, ergebnis) zurück, sortiert nach index.
+    check gibt None (oder wirft) für "kein Treffer" zurück.
+    """
+    candidates = list(candidates)
+    if not candidates:
+        return []
+
+    config = load_probe_config()
+    if timeout is None:
+        timeout = float(config.get('timeout', DEFAULT_TIMEOUT))
+    if max_workers is None:
+        max_workers = int(config.get('max_workers', DEFAULT_MAX_WORKERS))
+
+    deadline = time.monotonic() + timeout
+    cancelled = threading.Event()
+
+    def run(candidate):
+        if cancelled.is_set() or time.monotonic() >= deadline:
+            return None
+        return check(candidate)
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(candidates)), thread_name_prefix='probe')
+    futures = {executor.submit(run, candidate): index for index, candidate in enumerate(candidates)}
+    found = {}
+    pending = set(range(len(candidates)))
+
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            index = futures[future]
+            pending.discard(index)
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.debug(f"Probe {candidates[index]!r} fehlgeschlagen: {e}")
+                result = None
+            if result is not None:
+                found[index] = result
+            if first and found:
+                best = min(found)
+                if not any(i < best for i in pending):
+                    break
+    except FutureTimeout:
+        logger.debug(f"Probe-Deadline nach {timeout}s erreicht, {len(pending)} Proben offen")
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return sorted(found.items())
+
+
+def probe_all(candidates, check, timeout=None, max_workers=None):
+    """Alle Treffer als Liste von (kandidat, ergebnis) in Kandidatenreihenfolge"""
+    candidates = list(candidates)
+    return [(candidates[index], result) for index, result in _probe(candidates, check, timeout, max_workers, False)]
+
+
+def probe_first(candidates, check, timeout=None, max_workers=None):
+    """Ergebnis des ersten Kandidaten mit Treffer oder None"""
+    found = _probe(candidates, check, timeout, max_workers, True)
+    return found[0][1] if found else None
+
+
+@lru_cache(maxsize=1)
+def _max_workers():
+    """Parallele Proben aus der Konfiguration, einmal gelesen"""
+    return int(load_probe_config().get('max_workers', DEFAULT_MAX_WORKERS))
+
+
+def http_probe(url, timeout=DEFAULT_TIMEOUT, accept=None):
+    """GET über den Proben-Client (so viele Verbindungen pro Host wie parallele Proben)
+
+    Gibt die Response bei Status 200 zurück (und wenn ``accept(response)``
+    zustimmt), sonst None.
+    """
+    if get_probe_client is None:
+        return None
+    try:
+        response = get_probe_client(_max_workers()).get(url, timeout=timeout)
+    except HostBusy as e:
+        # Kein freier Slot heißt nicht, dass dort nichts läuft
+        logger.warning(f"⚠️ Probe {url} nicht gesendet: {e}")
+        return None
+    except Exception as e:
+        logger.debug(f"Probe {url} fehlgeschlagen: {e}")
+        return None
+    if response.status_code != 200 or (accept is not None and not accept(response)):
+        return None
+    return response
+
+
+def websocket_probe(url, timeout=DEFAULT_TIMEOUT):
+    """WebSocket-Handshake mit url, True wenn er gelingt"""
+    if websocket is None:
+        return False
+    try:
+        ws = websocket.create_connection(url, timeout=timeout)
+        ws.close()
+        return True
+    except Exception as e:
+        logger.debug(f"WebSocket-Probe {url} fehlgeschlagen: {e}")
+        return False
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Process Watch - Überwacht im Hintergrund, ob die Desktop App läuft
+
+Bisher hat jede Prüfung ``tasklist`` über eine Shell gestartet oder die
+komplette Prozessliste mit ``psutil.process_iter`` durchlaufen. Der
+ProcessWatch merkt sich stattdessen die PID des Desktop-App-Prozesses und
+bestätigt sie alle ``interval`` Sekunden mit einer billigen PID-Abfrage.
+Die volle Prozessliste wird nur gelesen, wenn die PID verschwindet oder
+noch keine bekannt ist.
+
+Die Bridges lesen ``watch.running`` (ein gecachter Bool, kostet nichts).
+Wechsel zwischen "läuft" und "läuft nicht" gehen an registrierte Callbacks
+und als 'process'-Event auf den EventBus.
+
+Backends (automatisch gewählt):
+
+    psutil     wenn installiert (alle Plattformen)
+    proc       Linux ohne psutil, liest /proc direkt
+    tasklist   Windows ohne psutil
+
+Eine Prozess-Identität ist ``{'name', 'pid', 'create_time'}``; die Startzeit
+schützt vor wiederverwendeten PIDs.
+"""
+
+import csv
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAMES = ['Autodarts Desktop.exe', 'Autodarts Desktop', 'autodarts-desktop']
+DEFAULT_INTERVAL = 2.0
+
+
+def load_process_watch_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'process_watch' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('process_watch', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Process-Watch-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class PsutilBackend:
+    """Prozesssuche über psutil"""
+
+    name = 'psutil'
+
+    def scan(self, match):
+        found = []
+        for proc in psutil.process_iter(['pid', 'name', 'create_time']):
+            if proc.info['name'] and match(proc.info['name']):
+                found.append({'name': proc.info['name'], 'pid': proc.info['pid'],
+                              'create_time': proc.info['create_time']})
+        return found
+
+    def alive(self, identity):
+        try:
+            proc = psutil.Process(identity['pid'])
+            return proc.create_time() == identity['create_time']
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
+
+class ProcBackend:
+    """Prozesssuche über /proc (Linux ohne psutil)"""
+
+    name = 'proc'
+
+    @staticmethod
+    def _start_time(pid):
+        # Feld 22 von /proc/<pid>/stat; der Prozessname in Klammern darf Leerzeichen enthalten
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        return int(stat[stat.rindex(b')') + 2:].split()[19])
+
+    @staticmethod
+    def _names(pid):
+        """comm ist auf 15 Zeichen gekürzt, daher zusätzlich argv[0]"""
+        names = []
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                argv0 = f.read().split(b'\0', 1)[0].decode('utf-8', 'replace')
+            if argv0:
+                names.append(os.path.basename(argv0))
+        except OSError:
+            pass
+        try:
+            with open(f'/proc/{pid}/comm', 'rb') as f:
+                names.append(f.read().strip().decode('utf-8', 'replace'))
+        except OSError:
+            pass
+        return names
+
+    def scan(self, match):
+        found = []
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            for name in self._names(pid):
+                if match(name):
+                    try:
+                        found.append({'name': name, 'pid': pid, 'create_time': self._start_time(pid)})
+                    except (OSError, ValueError, IndexError):
+                        pass
+                    break
+        return found
+
+    def alive(self, identity):
+        try:
+            return self._start_time(identity['pid']) == identity['create_time']
+        except (OSError, ValueError, IndexError):
+            return False
+
+
+class TasklistBackend:
+    """Prozesssuche über tasklist (Windows ohne psutil)"""
+
+    name = 'tasklist'
+
+    @staticmethod
+    def _tasklist(filter_expr):
+        result = subprocess.run(['tasklist', '/FI', filter_expr, '/FO', 'CSV', '/NH'],
+                                capture_output=True, text=True, encoding='utf-8', errors='ignore')
+        return [row for row in csv.reader(result.stdout.splitlines()) if len(row) > 1 and row[1].isdigit()]
+
+    def scan(self, match):
+        return [{'name': row[0], 'pid': int(row[1]), 'create_time': None}
+                for row in self._tasklist('STATUS eq RUNNING') if match(row[0])]
+
+    def alive(self, identity):
+        rows = self._tasklist(f"PID eq {identity['pid']}")
+        return any(row[0] == identity['name'] for row in rows)
+
+
+def default_backend():
+    """Wählt das Backend für diese Plattform"""
+    if psutil is not None:
+        return PsutilBackend()
+    if sys.platform.startswith('linux') and os.path.isdir('/proc'):
+        return ProcBackend()
+    return TasklistBackend()
+
+
+class ProcessWatch:
+    """Verfolgt die PID der Desktop App und meldet Wechsel"""
+
+    def __init__(self, names=None, interval=DEFAULT_INTERVAL, backend=None, bus=None, cache=None):
+        self.names = set(names or DEFAULT_NAMES)
+        self.interval = interval
+        self.backend = backend or default_backend()
+        self.bus = bus
+        self.cache = cache
+        self.identity = None
+        self.running = False
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, bus=None, cache=None, path='autodarts_config.json'):
+        """Erzeugt den Watch mit Namen und Intervall aus der Konfigurationsdatei"""
+        config = load_process_watch_config(path)
+        return cls(
+            names=config.get('names', DEFAULT_NAMES),
+            interval=float(config.get('interval', DEFAULT_INTERVAL)),
+            bus=bus,
+            cache=cache
+        )
+
+    @property
+    def pid(self):
+        identity = self.identity
+        return identity['pid'] if identity else None
+
+    def subscribe(self, listener):
+        """Registriert einen Callback listener(running), aufgerufen bei jedem Wechsel"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _matches(self, name):
+        return name in self.names
+
+    def check(self):
+        """Eine Prüfrunde: gemerkte PID bestätigen, sonst neu suchen. Gibt running zurück"""
+        with self._lock:
+            identity = self.identity
+            if identity is None and self.cache is not None:
+                identity = self.cache.get('process')
+
+            if identity is None or not self._alive(identity):
+                identity = self._scan()
+                if identity is not None and self.cache is not None:
+                    self.cache.put('process', identity)
+
+            self.identity = identity
+            running = identity is not None
+            changed = running != self.running
+            self.running = running
+            listeners = list(self._listeners) if changed else []
+
+        if changed:
+            if running:
+                logger.info(f"✅ {identity['name']} läuft (PID {identity['pid']})")
+            else:
+                logger.warning("⚠️ Desktop App läuft nicht mehr")
+            if self.bus is not None:
+                self.bus.publish('process', {'running': running, 'pid': self.pid})
+            for listener in listeners:
+                try:
+                    listener(running)
+                except Exception as e:
+                    logger.error(f"Fehler im Process-Watch-Listener: {e}")
+        return running
+
+    def _alive(self, identity):
+        try:
+            return self.backend.alive(identity)
+        except Exception as e:
+            logger.debug(f"PID-Prüfung fehlgeschlagen: {e}")
+            return False
+
+    def _scan(self):
+        try:
+            found = self.backend.scan(self._matches)
+        except Exception as e:
+            logger.error(f"Fehler beim Prozess-Scan ({self.backend.name}): {e}")
+            return None
+        return found[0] if found else None
+
+    def start(self):
+        """Erste Prüfung synchron, danach im Hintergrund alle interval Sekunden"""
+        self.check()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='process-watch', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
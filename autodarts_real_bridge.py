@@ -8,19 +8,40 @@ import json
 import logging
 import time
 import threading
-import requests
-import subprocess
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, StatusField, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_http_client import get_http_client
+from autodarts_prober import probe_first, http_probe
+from autodarts_discovery import DiscoveryCache
+from autodarts_process_watch import ProcessWatch
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server
+from autodarts_ws_server import BroadcastServer
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class AutodartsRealBridge:
+    # Änderungen lösen ein 'status'-Event aus und invalidieren den Response-Cache
+    desktop_connected = StatusField()
+    desktop_app_url = StatusField()
+
     def __init__(self):
         self.last_score = 0
-        self.score_history = []
+        self.score_history = ScoreHistory.from_config()
+        # Sequenznummer und Journal-Reihenfolge gemeinsam vergeben (HTTP- und Poll-Threads)
+        self._history_lock = threading.Lock()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.http = get_http_client()
+        self.discovery = DiscoveryCache.from_config()
+        self.process_watch = ProcessWatch.from_config(bus=self.events, cache=self.discovery)
+        self.journal = ThrowJournal.from_config('real')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
         self.desktop_connected = False
         self.auto_score_active = False
         self.score_generator_running = False
@@ -39,31 +60,36 @@ class AutodartsRealBridge:
         self.desktop_app_url = None
         
         # Prüfe Desktop App
+        self.process_watch.start()
+        self.process_watch.subscribe(self.on_desktop_presence)
         self.check_desktop_app()
         
         logger.info("🚀 Autodarts Real Bridge initialisiert")
 
+    def on_desktop_presence(self, running):
+        """ProcessWatch meldet Start oder Ende der Desktop App"""
+        self.desktop_connected = running
+
     def check_desktop_app(self):
         """Überprüft ob die Desktop App läuft und findet die richtige URL"""
         try:
-            # Prüfe Prozess
-            result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq "Autodarts Desktop.exe"'], 
-                                  capture_output=True, text=True, shell=True, encoding='utf-8', errors='ignore')
-            
-            if "Autodarts Desktop.exe" in result.stdout:
+            # Prüfe Prozess (gecachter Zustand des ProcessWatch)
+            if self.process_watch.running:
                 self.desktop_connected = True
                 logger.info("✅ Desktop App läuft")
                 
-                # Teste verschiedene URLs
-                for url in self.desktop_urls:
-                    try:
-                        response = requests.get(f"{url}/status", timeout=2)
-                        if response.status_code == 200:
-                            self.desktop_app_url = url
-                            logger.info(f"✅ Desktop App gefunden: {url}")
-                            break
-                    except:
-                        continue
+                # Gemerkte URL zuerst, sonst alle URLs parallel (die erste in der Liste gewinnt)
+                url = self.discovery.resolve(
+                    'api_url',
+                    validate=lambda url: http_probe(f"{url}/status", timeout=1) is not None,
+                    discover=lambda: probe_first(
+                        self.desktop_urls,
+                        lambda url: url if http_probe(f"{url}/status", timeout=2) is not None else None,
+                        timeout=2)
+                )
+                if url:
+                    self.desktop_app_url = url
+                    logger.info(f"✅ Desktop App gefunden: {url}")
                 
                 if not self.desktop_app_url:
                     logger.warning("⚠️ Desktop App läuft, aber keine API gefunden")
@@ -87,6 +113,7 @@ class AutodartsRealBridge:
         self.stop_generator.clear()
         self.score_generator_thread = threading.Thread(target=self._score_generator_worker, daemon=True)
         self.score_generator_thread.start()
+        self.events.publish('status', {'auto_score_active': self.auto_score_active})
         logger.info("▶️ Auto-Score gestartet")
 
     def stop_score_generator(self):
@@ -99,6 +126,7 @@ class AutodartsRealBridge:
         self.stop_generator.set()
         if self.score_generator_thread:
             self.score_generator_thread.join(timeout=1)
+        self.events.publish('status', {'auto_score_active': self.auto_score_active})
         logger.info("⏹️ Auto-Score gestoppt")
 
     def _score_generator_worker(self):
@@ -108,18 +136,13 @@ class AutodartsRealBridge:
                 # Versuche echte Scores von der Desktop App zu holen
                 if self.desktop_connected and self.desktop_app_url:
                     try:
-                        response = requests.get(f"{self.desktop_app_url}/status", timeout=1)
+                        response = self.http.get(f"{self.desktop_app_url}/status", timeout=1)
                         if response.status_code == 200:
                             data = response.json()
                             if 'last_score' in data and data['last_score'] > 0:
                                 score = data['last_score']
                                 if score != self.last_score:  # Nur neue Scores
-                                    self.last_score = score
-                                    self.score_history.append({
-                                        'score': score,
-                                        'timestamp': time.time(),
-                                        'source': 'desktop_app'
-                                    })
+                                    self.add_score(score, 'desktop_app')
                                     logger.info(f"🎯 Desktop Score empfangen: {score}")
                     except:
                         pass
@@ -130,12 +153,7 @@ class AutodartsRealBridge:
                     scores = [20, 25, 30, 40, 50, 60, 100, 120, 180]
                     score = random.choice(scores)
                     
-                    self.last_score = score
-                    self.score_history.append({
-                        'score': score,
-                        'timestamp': time.time(),
-                        'source': 'simulation'
-                    })
+                    self.add_score(score, 'simulation')
                     
                     logger.info(f"🎯 Score simuliert: {score}")
                 
@@ -145,7 +163,39 @@ class AutodartsRealBridge:
                 logger.error(f"Fehler im Score-Generator: {e}")
                 time.sleep(1)
 
-class RealBridgeHandler(BaseHTTPRequestHandler):
+    def add_score(self, score, source):
+        """Fügt Score zur Historie hinzu und veröffentlicht ihn als Event"""
+        self.last_score = score
+        with self._history_lock:
+            entry = self.score_history.append(score, source)
+            self.journal.append(entry)
+        self.events.publish('score', entry)
+        return entry
+
+    def get_status(self):
+        """Gibt den aktuellen Status zurück"""
+        return {
+            'connected': True,
+            'desktop_connected': self.desktop_connected,
+            'auto_score_active': self.auto_score_active,
+            'last_score': self.last_score,
+            'score_history_count': len(self.score_history),
+            'username': 'Desktop App User',
+            'camera_status': 'Aktiv' if self.desktop_connected else 'Nicht verfügbar',
+            'desktop_url': self.desktop_app_url
+        }
+
+    def get_score(self):
+        """Gibt den letzten Score zurück"""
+        latest = self.score_history.latest()
+        return {
+            'success': True,
+            'score': self.last_score,
+            'timestamp': latest['timestamp'] if latest else time.time(),
+            'source': 'desktop_app' if self.desktop_connected else 'simulation'
+        }
+
+class RealBridgeHandler(BridgeRequestHandler):
     def __init__(self, *args, **kwargs):
         self.bridge = kwargs.pop('bridge')
         super().__init__(*args, **kwargs)
@@ -158,39 +208,17 @@ class RealBridgeHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        path = urlparse(self.path).path
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
         
         if path == '/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            serve_cached(self, self.bridge.responses, 'status', self.bridge.get_status)
             
-            status = {
-                'connected': True,
-                'desktop_connected': self.bridge.desktop_connected,
-                'auto_score_active': self.bridge.auto_score_active,
-                'last_score': self.bridge.last_score,
-                'score_history_count': len(self.bridge.score_history),
-                'username': 'Desktop App User',
-                'camera_status': 'Aktiv' if self.bridge.desktop_connected else 'Nicht verfügbar',
-                'desktop_url': self.bridge.desktop_app_url
-            }
-            self.wfile.write(json.dumps(status).encode())
-        
         elif path == '/score':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            serve_cached(self, self.bridge.responses, 'score', self.bridge.get_score)
             
-            response = {
-                'success': True,
-                'score': self.bridge.last_score,
-                'timestamp': time.time(),
-                'source': 'desktop_app' if self.bridge.desktop_connected else 'simulation'
-            }
-            self.wfile.write(json.dumps(response).encode())
+        elif path == '/events':
+            stream_events(self, self.bridge.events, parsed_url.query)
 
         elif path == '/scores':
             self.send_response(200)
@@ -198,7 +226,12 @@ class RealBridgeHandler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            self.wfile.write(json.dumps(self.bridge.score_history).encode())
+            cursor = parse_cursor_query(parsed_url.query)
+            if cursor is not None:
+                scores = self.bridge.score_history.since(*cursor)
+            else:
+                scores = self.bridge.score_history.to_list()
+            self.wfile.write(json.dumps(scores).encode())
 
         else:
             self.send_response(404)
@@ -228,12 +261,7 @@ class RealBridgeHandler(BaseHTTPRequestHandler):
             data = json.loads(post_data.decode('utf-8'))
             score = data.get('score')
             if score is not None:
-                self.bridge.last_score = score
-                self.bridge.score_history.append({
-                    'score': score,
-                    'timestamp': time.time(),
-                    'source': 'manual'
-                })
+                self.bridge.add_score(score, 'manual')
                 logger.info(f"🎯 Score hinzugefügt: {score} (manuell)")
                 self.send_response(200)
                 self.send_header('Access-Control-Allow-Origin', '*')
@@ -250,12 +278,7 @@ class RealBridgeHandler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.bridge.last_score = 180
-            self.bridge.score_history.append({
-                'score': 180,
-                'timestamp': time.time(),
-                'source': 'test'
-            })
+            self.bridge.add_score(180, 'test')
             logger.info(f"🎯 Score hinzugefügt: 180 (test)")
             self.wfile.write(json.dumps({'status': 'Test Score hinzugefügt', 'score': 180}).encode())
 
@@ -267,12 +290,16 @@ class RealBridgeHandler(BaseHTTPRequestHandler):
 def main():
     bridge = AutodartsRealBridge()
     handler = lambda *args, **kwargs: RealBridgeHandler(bridge=bridge, *args, **kwargs)
-    server = HTTPServer(('localhost', 8766), handler)
+    server = create_bridge_server(handler, 8766)
+    push_server = BroadcastServer(bridge.events)
+    push_server.start()
     
     print("🚀 Autodarts Real Bridge läuft auf Port 8766")
     print("📡 Status: http://localhost:8766/status")
     print("🎯 Scores: http://localhost:8766/score")
     print("📊 Score History: http://localhost:8766/scores")
+    print("📣 Live-Events (SSE): http://localhost:8766/events")
+    print(f"🔌 Live-Events (WebSocket): ws://localhost:{push_server.port}")
     print("▶️  Start Auto-Score: http://localhost:8766/start_auto_score")
     print("⏹️  Stop Auto-Score: http://localhost:8766/stop_auto_score")
     print("🧪 Test Score: http://localhost:8766/test_score")
@@ -286,6 +313,10 @@ def main():
     except KeyboardInterrupt:
         print("\n🛑 Bridge wird gestoppt...")
         bridge.stop_score_generator()
+        push_server.stop()
+        bridge.events.close()
+        bridge.journal.close()
+        bridge.process_watch.stop()
         server.shutdown()
 
 if __name__ == "__main__":
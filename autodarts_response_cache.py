@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Response Cache - Vorkodierte Antworten für /status und /score
+
+Die Pollers fragen ``/status`` und ``/score`` im Sekundentakt ab, obwohl
+sich zwischen zwei Würfen meistens nichts ändert. Der Cache hält deshalb pro
+Endpunkt die fertige HTTP-Antwort (Statuszeile, Header und JSON-Body) als
+Bytes. Ein Poll kostet nur noch einen einzigen ``write`` statt Dict-Aufbau,
+``json.dumps`` und mehrerer ``send_header``-Aufrufe.
+
+Invalidiert wird über einen Versionszähler. Der Cache hängt am EventBus der
+Bridge, jedes veröffentlichte Event (Wurf, Statusänderung) erhöht die
+Version. Zustand, der kein Event auslöst, wird mit ``invalidate()`` gemeldet.
+
+Aus der Version wird ein starkes ETag gebildet (mit einer Start-Epoche, damit
+ein Neustart der Bridge keine alten Tags bestätigt). ``serve_cached``
+beantwortet ``If-None-Match`` mit ``304 Not Modified`` und unterstützt
+Long-Polling: ``GET /status?wait=20`` mit dem letzten ETag blockiert, bis
+sich die Version ändert oder die Wartezeit abläuft (dann 304).
+
+Die Wartezeit ist auf ``MAX_WAIT`` begrenzt und von der Request-Deadline
+(``request_timeout``, Standard 10 s) ausgenommen: Der Handler wartet nur auf
+die Condition des Caches, ohne Upstream-Aufruf und ohne Socket-Operation,
+der Socket-Timeout gilt erst wieder für das Schreiben der Antwort.
+"""
+
+import json
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+MAX_WAIT = 30.0
+
+
+def encode_json_response(data, status=200, reason='OK', etag=None):
+    """Kodiert eine komplette HTTP/1.0-Antwort mit JSON-Body"""
+    body = json.dumps(data).encode('utf-8')
+    head = (
+        f"HTTP/1.0 {status} {reason}\r\n"
+        "Content-type: application/json\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        + (f"ETag: {etag}\r\nAccess-Control-Expose-Headers: ETag\r\n" if etag else "")
+        + f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    ).encode('latin-1')
+    return head + body
+
+
+def encode_not_modified(etag):
+    """Kodiert eine 304-Antwort ohne Body"""
+    return (
+        "HTTP/1.0 304 Not Modified\r\n"
+        f"ETag: {etag}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "Access-Control-Expose-Headers: ETag\r\n"
+        "\r\n"
+    ).encode('latin-1')
+
+
+def _if_none_match(handler):
+    """Tags aus If-None-Match (schwache Vergleichsregel, W/ wird ignoriert)"""
+    value = handler.headers.get('If-None-Match')
+    if not value:
+        return ()
+    return tuple(tag.strip().removeprefix('W/') for tag in value.split(','))
+
+
+def _wait_seconds(handler):
+    """?wait=<sekunden>, begrenzt auf MAX_WAIT (unabhängig von der Deadline des Requests)"""
+    value = parse_qs(urlsplit(handler.path).query).get('wait', [None])[0]
+    try:
+        return min(max(0.0, float(value)), MAX_WAIT) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+def send_cached(handler, payload, code=200):
+    """Sendet eine vorkodierte Antwort über einen BaseHTTPRequestHandler"""
+    handler.log_request(code)
+    handler.wfile.write(payload)
+
+
+def serve_cached(handler, cache, key, build):
+    """Beantwortet einen GET aus dem Cache mit ETag, 304 und optionalem ?wait=
+
+    Ohne passendes If-None-Match kommt sofort die volle Antwort. Passt das
+    Tag und ist ``wait`` gesetzt, wartet der Handler auf die nächste Version.
+    """
+    tags = _if_none_match(handler)
+    if tags:
+        wait = _wait_seconds(handler)
+        if wait:
+            cache.wait_for_change(tags, wait)
+
+    etag, payload = cache.lookup(key, build)
+    if etag in tags or '*' in tags:
+        send_cached(handler, encode_not_modified(etag), 304)
+    else:
+        send_cached(handler, payload)
+
+
+class ResponseCache:
+    """Fertig kodierte Antworten, gültig solange sich die Version nicht ändert"""
+
+    def __init__(self, bus=None):
+        self.version = 0
+        self.epoch = f"{int(time.time() * 1000):x}"
+        self._entries = {}
+        self._cond = threading.Condition()
+        if bus is not None:
+            bus.subscribe(self._on_event)
+
+    def _on_event(self, event):
+        self.invalidate()
+
+    def etag(self, version=None):
+        """Starkes ETag für eine Version (Standard: die aktuelle)"""
+        return f'"{self.epoch}-{self.version if version is None else version}"'
+
+    def invalidate(self):
+        """Verwirft alle gecachten Antworten und weckt wartende Long-Polls"""
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def wait_for_change(self, tags, timeout):
+        """Blockiert solange das aktuelle ETag in tags ist, höchstens timeout Sekunden"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.etag() not in tags, timeout)
+
+    def lookup(self, key, build):
+        """Gibt (etag, antwort) für key zurück, baut die Antwort bei Bedarf mit build() neu"""
+        version = self.version
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+
+        etag = self.etag(version)
+        payload = encode_json_response(build(), etag=etag)
+        with self._cond:
+            # Hat sich der Zustand während build() geändert, nicht speichern
+            if self.version == version:
+                self._entries[key] = (version, etag, payload)
+        return etag, payload
+
+    def get(self, key, build):
+        """Gibt die Antwort für key zurück, baut sie bei Bedarf mit build() neu"""
+        return self.lookup(key, build)[1]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Score History - Begrenzter Ringpuffer für die Score-Historie aller Bridges
+
+Die Würfe werden nicht mehr als einzelne Dicts in einer unbegrenzten Liste
+abgelegt, sondern spaltenweise in vorab allokierten ``array``-Puffern:
+
+    Score       array('i')   4 Byte
+    Zeitstempel array('d')   8 Byte
+    Quelle      array('B')   1 Byte (Code in die internierte Quellen-Tabelle)
+    ------------------------------
+    Summe                   13 Byte pro Wurf
+
+Bei der Standardkapazität von 10.000 Würfen belegt die Historie damit rund
+127 KB, unabhängig davon wie lange eine Bridge läuft. Anhängen ist O(1),
+``last(k)`` ist O(k).
+
+Jeder Wurf bekommt eine fortlaufende Sequenznummer. Sie wird nicht
+gespeichert, sondern aus der Position im Ringpuffer berechnet, so dass
+``since(seq)`` für Cursor-Abfragen (``/scores?since=<seq>&limit=<n>``) nur
+O(neue Würfe) kostet.
+"""
+
+import json
+import logging
+import threading
+import time
+from array import array
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 10000
+BYTES_PER_THROW = 4 + 8 + 1
+UNKNOWN_SOURCE = 'unknown'
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+class ScoreHistory:
+    """Ringpuffer mit parallelen Arrays für Score, Zeitstempel und Quelle"""
+
+    __slots__ = ('capacity', '_scores', '_timestamps', '_sources',
+                 '_source_names', '_source_codes', '_dropped_sources', '_head', '_count',
+                 '_next_seq', '_lock')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity muss größer als 0 sein")
+
+        self.capacity = int(capacity)
+        self._scores = array('i', bytes(4 * self.capacity))
+        self._timestamps = array('d', bytes(8 * self.capacity))
+        self._sources = array('B', bytes(self.capacity))
+
+        # Code 0 ist für unbekannte Quellen reserviert
+        self._source_names = [UNKNOWN_SOURCE]
+        self._source_codes = {UNKNOWN_SOURCE: 0}
+        self._dropped_sources = set()
+
+        self._head = 0   # Nächste Schreibposition
+        self._count = 0  # Anzahl gültiger Einträge
+        self._next_seq = 1  # Sequenznummer des nächsten Wurfs
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path='autodarts_config.json'):
+        """Erzeugt die Historie mit der Kapazität aus der Konfigurationsdatei"""
+        capacity = DEFAULT_CAPACITY
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            capacity = int(config.get('history', {}).get('capacity', DEFAULT_CAPACITY))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ History-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return cls(capacity)
+
+    def _source_code(self, source):
+        """Interniert einen Quellennamen und gibt dessen Code zurück"""
+        code = self._source_codes.get(source)
+        if code is None:
+            if len(self._source_names) > 255:
+                # Einmal pro Quelle melden, nicht bei jedem Wurf
+                if source not in self._dropped_sources:
+                    self._dropped_sources.add(source)
+                    logger.warning(f"⚠️ Quellen-Tabelle voll (255) - Würfe von {source!r} "
+                                   f"werden als {UNKNOWN_SOURCE!r} gespeichert")
+                return 0
+            code = len(self._source_names)
+            self._source_names.append(source)
+            self._source_codes[source] = code
+        return code
+
+    def append(self, score, source, timestamp=None):
+        """Fügt einen Wurf hinzu - O(1), überschreibt bei voller Kapazität den ältesten"""
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            pos = self._head
+            self._scores[pos] = int(score)
+            self._timestamps[pos] = timestamp
+            self._sources[pos] = self._source_code(source)
+
+            self._head = (pos + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+            seq = self._next_seq
+            self._next_seq += 1
+
+        return {'seq': seq, 'score': int(score), 'timestamp': timestamp, 'source': source}
+
+    def restore(self, throws):
+        """Ersetzt den Inhalt durch wiederhergestellte Würfe (z.B. aus dem Journal)
+
+        throws ist eine Folge von (seq, timestamp, score, source) mit
+        fortlaufenden Sequenznummern. Sie wird nach seq sortiert, ein Journal
+        aus parallelen Threads kann Würfe vertauscht enthalten. Nur die
+        letzten ``capacity`` Würfe werden übernommen, die nächste
+        Sequenznummer folgt auf die größte.
+        """
+        throws = sorted(throws, key=lambda throw: throw[0])[-self.capacity:]
+        with self._lock:
+            for pos, (seq, timestamp, score, source) in enumerate(throws):
+                self._scores[pos] = score
+                self._timestamps[pos] = timestamp
+                self._sources[pos] = self._source_code(source)
+            self._count = len(throws)
+            self._head = self._count % self.capacity
+            if throws:
+                self._next_seq = throws[-1][0] + 1
+
+    def _entry(self, pos, seq):
+        return {
+            'seq': seq,
+            'score': self._scores[pos],
+            'timestamp': self._timestamps[pos],
+            'source': self._source_names[self._sources[pos]]
+        }
+
+    def last(self, k):
+        """Gibt die letzten k Würfe zurück (älteste zuerst) - O(k)"""
+        with self._lock:
+            k = max(0, min(int(k), self._count))
+            return self._read(k, k)
+
+    def _read(self, back, n):
+        """Liest n Einträge ab dem back-letzten Wurf, der Lock muss gehalten werden"""
+        start = self._head - back
+        first_seq = self._next_seq - back
+        return [self._entry((start + i) % self.capacity, first_seq + i) for i in range(n)]
+
+    def since(self, seq, limit=DEFAULT_PAGE_LIMIT):
+        """Gibt Würfe mit Sequenznummer > seq zurück - O(limit)
+
+        Ist der Cursor älter als der älteste noch gespeicherte Wurf, beginnt
+        die Antwort beim ältesten Wurf und ``truncated`` ist True.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_LIMIT))
+        with self._lock:
+            last_seq = self._next_seq - 1
+            back = max(0, min(last_seq - seq, self._count))
+            truncated = last_seq - seq > self._count
+            entries = self._read(back, min(back, limit))
+            count = self._count
+
+        return {
+            'success': True,
+            'scores': entries,
+            'next': entries[-1]['seq'] if entries else last_seq,
+            'truncated': truncated,
+            'count': count
+        }
+
+    def last_seq(self):
+        """Gibt die Sequenznummer des neuesten Wurfs zurück (0 wenn leer)"""
+        return self._next_seq - 1
+
+    def latest(self):
+        """Gibt den neuesten Wurf zurück oder None"""
+        entries = self.last(1)
+        return entries[0] if entries else None
+
+    def to_list(self):
+        """Gibt alle gespeicherten Würfe zurück (älteste zuerst)"""
+        return self.last(self._count)
+
+    def clear(self):
+        """Leert die Historie, Quellen-Tabelle und Sequenznummern bleiben erhalten"""
+        with self._lock:
+            self._head = 0
+            self._count = 0
+
+    def nbytes(self):
+        """Gibt den Speicherbedarf der Puffer in Byte zurück"""
+        return self.capacity * BYTES_PER_THROW
+
+    def __len__(self):
+        return self._count
+
+
+def parse_cursor_query(query):
+    """Liest since/limit aus einem Query-String
+
+    Gibt None zurück wenn kein Cursor angefragt wurde, sonst (since, limit).
+    """
+    params = parse_qs(query)
+    if 'since' not in params:
+        return None
+
+    try:
+        since = max(0, int(params['since'][0]))
+    except ValueError:
+        since = 0
+    try:
+        limit = int(params.get('limit', [DEFAULT_PAGE_LIMIT])[0])
+    except ValueError:
+        limit = DEFAULT_PAGE_LIMIT
+    return since, limit
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Segments - Vorberechnete Tabelle aller Dartboard-Segmente
+
+Jede gültige Segment-Bezeichnung wird beim Import einmal auf einen
+``Segment``-Eintrag (Zahl, Multiplikator, Punkte) abgebildet. Alle Bridges
+und Parser schlagen Segmente hier mit einem Dict-Zugriff nach, statt
+``startswith``-Ketten und ``int()`` in einem ``try`` zu verwenden.
+
+Gültig sind:
+
+    S1-S20, D1-D20, T1-T20   sowie die nackte Zahl 1-20 als Single
+    25                       Single Bull (auch S25, SB, SBULL, OB, OUTER)
+    50                       Bullseye (auch D25, DB, BULL, DBULL, BULLSEYE, IB, INNER)
+    M                        Miss (auch MISS, 0, S0)
+
+Unmögliche Segmente wie T25, D21 oder T0 gibt es in der Tabelle nicht,
+``lookup`` liefert dafür None. Aliase zeigen auf denselben Eintrag,
+``lookup('BULL') is lookup('50')``.
+"""
+
+from collections import namedtuple
+
+Segment = namedtuple('Segment', 'label number multiplier points')
+
+MISS = Segment('M', 0, 0, 0)
+SINGLE_BULL = Segment('25', 25, 1, 25)
+BULLSEYE = Segment('50', 25, 2, 50)
+
+_ALIASES = {
+    SINGLE_BULL: ('25', 'S25', 'SB', 'SBULL', 'OB', 'OUTER'),
+    BULLSEYE: ('50', 'D25', 'DB', 'BULL', 'DBULL', 'BULLSEYE', 'IB', 'INNER'),
+    MISS: ('M', 'MISS', '0', 'S0'),
+}
+
+
+def _build_table():
+    table = {}
+    for number in range(1, 21):
+        for prefix, multiplier in (('S', 1), ('D', 2), ('T', 3)):
+            segment = Segment(f'{prefix}{number}', number, multiplier, number * multiplier)
+            table[segment.label] = segment
+        table[str(number)] = table[f'S{number}']
+    for segment, aliases in _ALIASES.items():
+        for alias in aliases:
+            table[alias] = segment
+    return table
+
+
+SEGMENTS = _build_table()
+
+
+def lookup(label):
+    """Segment-Eintrag zu einer Bezeichnung (Groß-/Kleinschreibung egal), None wenn ungültig"""
+    segment = SEGMENTS.get(label)
+    if segment is None and isinstance(label, str):
+        segment = SEGMENTS.get(label.strip().upper())
+    return segment
+
+
+def segment_points(label):
+    """Punkte eines Segments, None wenn die Bezeichnung ungültig ist"""
+    segment = lookup(label)
+    return segment.points if segment else None
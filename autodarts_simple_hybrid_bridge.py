@@ -8,19 +8,36 @@ import json
 import logging
 import time
 import threading
-import requests
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, StatusField, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_http_client import get_http_client
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server, UpstreamPool
+from autodarts_ws_server import BroadcastServer
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class AutodartsSimpleHybridBridge:
+    # Änderungen lösen ein 'status'-Event aus und invalidieren den Response-Cache
+    desktop_connected = StatusField()
+
     def __init__(self):
         self.desktop_app_url = "http://localhost:8080"
         self.last_score = 0
-        self.score_history = []
+        self.score_history = ScoreHistory.from_config()
+        # Sequenznummer und Journal-Reihenfolge gemeinsam vergeben (HTTP- und Poll-Threads)
+        self._history_lock = threading.Lock()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.http = get_http_client()
+        self.upstream = UpstreamPool.from_config()
+        self.journal = ThrowJournal.from_config('simple_hybrid')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
         self.desktop_connected = False
         self.auto_score_active = False
         self.score_generator_running = False
@@ -40,6 +57,7 @@ class AutodartsSimpleHybridBridge:
         self.stop_generator.clear()
         self.score_generator_thread = threading.Thread(target=self._score_generator_worker, daemon=True)
         self.score_generator_thread.start()
+        self.events.publish('status', {'auto_score_active': self.auto_score_active})
         logger.info("🎯 Score-Generator gestartet")
 
     def stop_score_generator(self):
@@ -51,6 +69,7 @@ class AutodartsSimpleHybridBridge:
         self.stop_generator.set()
         if self.score_generator_thread:
             self.score_generator_thread.join(timeout=1)
+        self.events.publish('status', {'auto_score_active': self.auto_score_active})
         logger.info("🎯 Score-Generator gestoppt")
 
     def _score_generator_worker(self):
@@ -62,12 +81,7 @@ class AutodartsSimpleHybridBridge:
                 scores = [20, 25, 30, 40, 50, 60, 100, 120, 180]
                 score = random.choice(scores)
                 
-                self.last_score = score
-                self.score_history.append({
-                    'score': score,
-                    'timestamp': time.time(),
-                    'source': 'generator'
-                })
+                self.add_score(score, 'generator')
                 
                 logger.info(f"🎯 Score generiert: {score}")
                 time.sleep(random.uniform(3, 8))
@@ -79,7 +93,7 @@ class AutodartsSimpleHybridBridge:
     def check_desktop_app(self):
         """Überprüft die Desktop App Verbindung"""
         try:
-            response = requests.get(f"{self.desktop_app_url}/status", timeout=2)
+            response = self.http.get(f"{self.desktop_app_url}/status", timeout=2)
             if response.status_code == 200:
                 self.desktop_connected = True
                 return True
@@ -92,16 +106,11 @@ class AutodartsSimpleHybridBridge:
     def get_desktop_score(self):
         """Holt den aktuellen Score von der Desktop App"""
         try:
-            response = requests.get(f"{self.desktop_app_url}/score", timeout=2)
+            response = self.http.get(f"{self.desktop_app_url}/score", timeout=2)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('success') and data.get('score', 0) > 0:
-                    self.last_score = data['score']
-                    self.score_history.append({
-                        'score': data['score'],
-                        'timestamp': time.time(),
-                        'source': 'desktop'
-                    })
+                    self.add_score(data['score'], 'desktop')
                     return data['score']
         except:
             pass
@@ -111,7 +120,7 @@ class AutodartsSimpleHybridBridge:
         """Sendet einen Score an die Desktop App"""
         try:
             if self.desktop_connected:
-                response = requests.post(
+                response = self.http.post(
                     f"{self.desktop_app_url}/score",
                     json={'score': score},
                     timeout=2
@@ -121,63 +130,74 @@ class AutodartsSimpleHybridBridge:
             pass
         return False
 
-class SimpleHybridBridgeHandler(BaseHTTPRequestHandler):
+    def add_score(self, score, source):
+        """Fügt Score zur Historie hinzu und veröffentlicht ihn als Event"""
+        self.last_score = score
+        with self._history_lock:
+            entry = self.score_history.append(score, source)
+            self.journal.append(entry)
+        self.events.publish('score', entry)
+        return entry
+
+    def get_status(self):
+        """Gibt den aktuellen Status zurück"""
+        return {
+            'connected': True,
+            'desktop_connected': self.desktop_connected,
+            'browser_connected': False,  # WebSocket nicht verfügbar
+            'auto_score_active': self.auto_score_active,
+            'last_score': self.last_score,
+            'score_history_count': len(self.score_history)
+        }
+
+    def get_score(self):
+        """Gibt den letzten Score zurück"""
+        return {
+            'success': True,
+            'score': self.last_score,
+            'source': 'desktop' if self.desktop_connected else 'generator',
+            'desktop_connected': self.desktop_connected,
+            'browser_connected': False
+        }
+
+class SimpleHybridBridgeHandler(BridgeRequestHandler):
     def __init__(self, *args, **kwargs):
         self.bridge = kwargs.pop('bridge')
         super().__init__(*args, **kwargs)
 
     def do_GET(self):
-        path = urlparse(self.path).path
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
         
         if path == '/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            # Prüfe Desktop App Verbindung
-            self.bridge.check_desktop_app()
-            
-            status = {
-                'connected': True,
-                'desktop_connected': self.bridge.desktop_connected,
-                'browser_connected': False,  # WebSocket nicht verfügbar
-                'auto_score_active': self.bridge.auto_score_active,
-                'last_score': self.bridge.last_score,
-                'score_history_count': len(self.bridge.score_history)
-            }
-            self.wfile.write(json.dumps(status).encode())
+            # Prüfe Desktop App Verbindung im Hintergrund, Änderungen invalidieren den Cache
+            self.bridge.upstream.refresh('check_desktop_app', self.bridge.check_desktop_app)
+            serve_cached(self, self.bridge.responses, 'status', self.bridge.get_status)
             
         elif path == '/score':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            # Versuche Score von Desktop App zu holen
-            desktop_score = self.bridge.get_desktop_score()
-            
-            response = {
-                'success': True,
-                'score': self.bridge.last_score,
-                'source': 'desktop' if self.bridge.desktop_connected else 'generator',
-                'desktop_connected': self.bridge.desktop_connected,
-                'browser_connected': False
-            }
-            self.wfile.write(json.dumps(response).encode())
+            # Score von der Desktop App im Hintergrund holen, ein neuer Wurf invalidiert den Cache
+            self.bridge.upstream.refresh('get_desktop_score', self.bridge.get_desktop_score)
+            serve_cached(self, self.bridge.responses, 'score', self.bridge.get_score)
             
+        elif path == '/events':
+            stream_events(self, self.bridge.events, parsed_url.query)
+
         elif path == '/scores':
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            scores = self.bridge.score_history[-10:]  # Letzte 10 Scores
-            response = {
-                'success': True,
-                'scores': scores,
-                'count': len(scores)
-            }
+            cursor = parse_cursor_query(parsed_url.query)
+            if cursor is not None:
+                response = self.bridge.score_history.since(*cursor)
+            else:
+                scores = self.bridge.score_history.last(10)  # Letzte 10 Scores
+                response = {
+                    'success': True,
+                    'scores': scores,
+                    'count': len(scores)
+                }
             self.wfile.write(json.dumps(response).encode())
             
         else:
@@ -222,12 +242,7 @@ class SimpleHybridBridgeHandler(BaseHTTPRequestHandler):
             data = json.loads(post_data.decode('utf-8'))
             
             score = data.get('score', 0)
-            self.bridge.last_score = score
-            self.bridge.score_history.append({
-                'score': score,
-                'timestamp': time.time(),
-                'source': 'test'
-            })
+            self.bridge.add_score(score, 'test')
             
             response = {'success': True, 'score': score}
             self.wfile.write(json.dumps(response).encode())
@@ -243,12 +258,16 @@ def main():
     def handler(*args, **kwargs):
         return SimpleHybridBridgeHandler(*args, bridge=bridge, **kwargs)
     
-    server = HTTPServer(('localhost', 8766), handler)
+    server = create_bridge_server(handler, 8766)
+    push_server = BroadcastServer(bridge.events)
+    push_server.start()
     
     print("🚀 Autodarts Simple Hybrid Bridge läuft auf Port 8766")
     print("📡 Status: http://localhost:8766/status")
     print("🎯 Scores: http://localhost:8766/score")
     print("📊 Score History: http://localhost:8766/scores")
+    print("📣 Live-Events (SSE): http://localhost:8766/events")
+    print(f"🔌 Live-Events (WebSocket): ws://localhost:{push_server.port}")
     print("▶️  Start Auto-Score: http://localhost:8766/start_auto_score")
     print("⏹️  Stop Auto-Score: http://localhost:8766/stop_auto_score")
     print("🧪 Test Score: http://localhost:8766/test_score")
@@ -260,6 +279,10 @@ def main():
     except KeyboardInterrupt:
         print("\n🛑 Bridge wird gestoppt...")
         bridge.stop_score_generator()
+        push_server.stop()
+        bridge.events.close()
+        bridge.upstream.shutdown()
+        bridge.journal.close()
         server.shutdown()
 
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Simulator - Dart-Simulation auf echter Board-Geometrie
+
+Statt Scores aus einer festen Liste mit ``random.choice`` zu ziehen, zielt
+jeder simulierte Spieler auf einen Punkt des Boards (Standard T20) und
+trifft mit einem normalverteilten Fehler (``sigma`` in mm pro Achse). Der
+Treffpunkt wird über ``autodarts_board_geometry`` auf das Segment abgebildet.
+
+Zwei Betriebsarten:
+
+- Batch (``simulate``): n Würfe in einem NumPy-Aufruf, Millionen Würfe pro
+  Sekunde für Lasttests und Auswertungen. Mit ``seed`` reproduzierbar.
+- Echtzeit (``stream``): liefert einzelne Darts mit realistischen Pausen
+  zwischen den Darts und nach jeder Aufnahme, die Spieler wechseln pro
+  Aufnahme (nach drei Darts oder wenn ``turn_over`` das Ende meldet). ``speed`` beschleunigt, ``speed=0`` wirft ohne Pausen. Der
+  Stream wirft einzeln mit ``random.gauss`` und braucht kein NumPy.
+
+Konfiguration im Abschnitt 'simulator' der ``autodarts_config.json``::
+
+    "simulator": {
+      "seed": null,
+      "players": {"player": {"sigma": 20.0, "aim": "T20"}},
+      "dart_interval": [1.0, 2.5],
+      "visit_pause": [4.0, 8.0],
+      "speed": 1.0
+    }
+"""
+
+import json
+import logging
+import random
+import threading
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from autodarts_board_geometry import aim_point, code_points, segment_at, segment_codes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIGMA = 20.0
+DEFAULT_AIM = 'T20'
+DEFAULT_DART_INTERVAL = (1.0, 2.5)
+DEFAULT_VISIT_PAUSE = (4.0, 8.0)
+DARTS_PER_VISIT = 3
+
+PlayerModel = namedtuple('PlayerModel', 'name sigma aim')
+SimulatedDart = namedtuple('SimulatedDart', 'player segment x y')
+
+
+def load_simulator_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'simulator' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('simulator', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Simulator-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+def player_model(name, sigma=DEFAULT_SIGMA, aim=DEFAULT_AIM):
+    """Spieler mit Streuung sigma (mm) und Zielsegment, ValueError bei ungültigem Ziel"""
+    aim_point(aim)
+    return PlayerModel(name, float(sigma), aim)
+
+
+class DartSimulator:
+    """Simuliert Würfe mehrerer Spieler mit Gauß-Fehler um ihren Zielpunkt"""
+
+    def __init__(self, players=None, seed=None, dart_interval=DEFAULT_DART_INTERVAL,
+                 visit_pause=DEFAULT_VISIT_PAUSE, speed=1.0):
+        self.players = list(players) if players else [player_model('player')]
+        self.seed = seed
+        self.dart_interval = tuple(dart_interval)
+        self.visit_pause = tuple(visit_pause)
+        self.speed = float(speed)
+        self._rng = np.random.default_rng(seed) if np is not None else None
+        self._random = random.Random(seed)
+        self._points = code_points() if np is not None else None
+
+    @classmethod
+    def from_config(cls, path='autodarts_config.json', **overrides):
+        """Erzeugt den Simulator aus der Konfigurationsdatei, overrides haben Vorrang"""
+        config = load_simulator_config(path)
+        config.update({key: value for key, value in overrides.items() if value is not None})
+        players = [player_model(name, **settings) for name, settings in config.get('players', {}).items()]
+        return cls(
+            players=players,
+            seed=config.get('seed'),
+            dart_interval=config.get('dart_interval', DEFAULT_DART_INTERVAL),
+            visit_pause=config.get('visit_pause', DEFAULT_VISIT_PAUSE),
+            speed=config.get('speed', 1.0)
+        )
+
+    def player(self, name=None):
+        """Spieler nach Name, ohne Name der erste"""
+        if name is None:
+            return self.players[0]
+        for player in self.players:
+            if player.name == name:
+                return player
+        raise KeyError(name)
+
+    def simulate_xy(self, n, player=None):
+        """n Treffpunkte eines Spielers als (x, y)-Arrays in mm"""
+        if self._rng is None:
+            raise RuntimeError("numpy ist nicht installiert - Batch-Simulation nicht verfügbar")
+        model = self.player(player)
+        aim_x, aim_y = aim_point(model.aim)
+        errors = self._rng.standard_normal((2, int(n)))
+        errors *= model.sigma
+        return errors[0] + aim_x, errors[1] + aim_y
+
+    def simulate(self, n, player=None):
+        """n Würfe eines Spielers als Array von Segment-Codes (``CODE_SEGMENTS``)"""
+        return segment_codes(*self.simulate_xy(n, player))
+
+    def points(self, codes):
+        """Punkte zu einem Array von Segment-Codes"""
+        return self._points[codes]
+
+    def throw(self, model, target=None):
+        """Ein einzelner Dart eines Spielers in reinem Python (für den Echtzeit-Stream)"""
+        aim_x, aim_y = aim_point(target or model.aim)
+        x = self._random.gauss(aim_x, model.sigma)
+        y = self._random.gauss(aim_y, model.sigma)
+        return SimulatedDart(model.name, segment_at(x, y), x, y)
+
+    def _pause(self, bounds, speed):
+        if speed <= 0:
+            return 0.0
+        return self._random.uniform(*bounds) / speed
+
+    def stream(self, stop=None, speed=None, aim=None, turn_over=None):
+        """Liefert simulierte Darts in Echtzeit bis stop gesetzt ist
+
+        Die Spieler wechseln nach jeder Aufnahme, zwischen den Darts wird
+        ``dart_interval``, nach einer Aufnahme ``visit_pause`` gewartet
+        (geteilt durch speed). ``aim(spieler)`` kann pro Dart ein anderes
+        Zielsegment liefern (z.B. den Checkout-Weg), None heißt Standardziel.
+        ``turn_over(spieler)`` wird nach jedem verarbeiteten Dart gefragt und
+        beendet die Aufnahme (z.B. Checkout oder Bust), ohne Callback endet
+        sie nach ``DARTS_PER_VISIT`` Darts.
+        """
+        stop = stop or threading.Event()
+        speed = self.speed if speed is None else speed
+        turn = 0
+        delay = self._pause(self.dart_interval, speed)
+        while True:
+            model = self.players[turn % len(self.players)]
+            darts = 0
+            while True:
+                if stop.wait(delay):
+                    return
+                yield self.throw(model, aim(model) if aim else None)
+                darts += 1
+                delay = self._pause(self.dart_interval, speed)
+                if turn_over(model) if turn_over else darts >= DARTS_PER_VISIT:
+                    break
+            delay = self._pause(self.visit_pause, speed)
+            turn += 1
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Stats - Laufende Statistik, fortgeschrieben beim Ingest
+
+Statt dass jeder Client nach jedem Dart die komplette Historie reduziert
+(Durchschnitt, Höchstwert), hält die Bridge die Aggregate selbst und
+aktualisiert sie mit jedem Eintrag in O(1). ``GET /stats`` liefert sie,
+unabhängig von der Länge der Session ebenfalls in O(1).
+
+Pro Eintrag der Historie:
+
+    count, sum, mean, max   über alle gemeldeten Scores
+    segments                Histogramm der Segmente (nur Darts mit Segment)
+
+Pro abgeschlossener Aufnahme (aus dem ``VisitTracker``):
+
+    three_dart_average      gewertete Punkte / geworfene Darts * 3, eine
+                            Bust-Aufnahme zählt 0 Punkte, eine reine
+                            Aufnahme-Summe zählt als 3 Darts
+    max_visit               höchste gewertete Aufnahme
+    100+, 140+, 180         Aufnahmen mit 100-139, 140-179 und 180 Punkten
+    busts, checkouts
+
+Die Statistik umfasst die Einträge seit dem Start der Bridge, nach einem
+Neustart zusätzlich die aus dem Journal wiederhergestellten.
+
+Zeitfenster (``GET /stats?window=15m``, ``2h``, ``7d`` oder ``today``) kommen
+aus ``WindowStats``: jeder Eintrag wird gleichzeitig in einen Minuten-, einen
+Stunden- und einen Tages-Bucket gezählt. Eine Abfrage zerlegt das Fenster in
+möglichst grobe Buckets (Minuten nur an den Rändern) und summiert sie, das
+kostet O(Fenster / Bucket) statt O(Historie). Abgelaufene Buckets werden
+beim Schreiben verworfen; liegt der Fensteranfang vor der Minuten- bzw.
+Stunden-Aufbewahrung, wird er auf die volle Stunde bzw. den Tag abgerundet.
+
+    "stats": {"minutes": 120, "hours": 48, "days": 31}
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+TON = 100
+TON_FORTY = 140
+MAXIMUM = 180
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+DEFAULT_MINUTES = 120
+DEFAULT_HOURS = 48
+DEFAULT_DAYS = 31
+
+WINDOW_UNITS = {'s': 1, 'm': MINUTE, 'h': HOUR, 'd': DAY}
+WINDOW_PATTERN = re.compile(r'^(\d+)([smhd])$')
+
+
+def load_stats_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'stats' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('stats', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Stats-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class Aggregate:
+    """Zähler einer Statistik, lässt sich mit anderen Aggregaten summieren"""
+
+    __slots__ = ('count', 'sum', 'max', 'darts', 'visits', 'visit_points', 'visit_darts',
+                 'max_visit', 'tons', 'ton_forties', 'maximums', 'busts', 'checkouts')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0
+        self.max = None
+        self.darts = 0
+        self.visits = 0
+        self.visit_points = 0
+        self.visit_darts = 0
+        self.max_visit = None
+        self.tons = 0
+        self.ton_forties = 0
+        self.maximums = 0
+        self.busts = 0
+        self.checkouts = 0
+
+    def add(self, score, throw, visit, darts_per_visit):
+        self.count += 1
+        self.sum += score
+        if self.max is None or score > self.max:
+            self.max = score
+        if throw is not None:
+            self.darts += 1
+        if visit is not None and visit.closed:
+            self._add_visit(visit, darts_per_visit)
+
+    def _add_visit(self, visit, darts_per_visit):
+        scored = visit.scored
+        self.visits += 1
+        self.visit_points += scored
+        self.visit_darts += len(visit.darts) or darts_per_visit
+        if self.max_visit is None or scored > self.max_visit:
+            self.max_visit = scored
+        if scored >= MAXIMUM:
+            self.maximums += 1
+        elif scored >= TON_FORTY:
+            self.ton_forties += 1
+        elif scored >= TON:
+            self.tons += 1
+        if visit.bust:
+            self.busts += 1
+        if visit.checkout:
+            self.checkouts += 1
+
+    def merge(self, other):
+        """Addiert ein anderes Aggregat hinzu"""
+        for name in ('count', 'sum', 'darts', 'visits', 'visit_points', 'visit_darts',
+                     'tons', 'ton_forties', 'maximums', 'busts', 'checkouts'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        if other.max_visit is not None and (self.max_visit is None or other.max_visit > self.max_visit):
+            self.max_visit = other.max_visit
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': round(self.sum / self.count, 2) if self.count else 0.0,
+            'max': self.max,
+            'darts': self.darts,
+            'visits': self.visits,
+            'three_dart_average': round(self.visit_points / self.visit_darts * 3, 2) if self.visit_darts else 0.0,
+            'max_visit': self.max_visit,
+            '100+': self.tons,
+            '140+': self.ton_forties,
+            '180': self.maximums,
+            'busts': self.busts,
+            'checkouts': self.checkouts
+        }
+
+
+class RunningStats:
+    """Aggregate über alle Einträge und Aufnahmen, jede Aktualisierung O(1)"""
+
+    def __init__(self, darts_per_visit=3):
+        self.darts_per_visit = darts_per_visit
+        self.started = time.time()
+        self.total = Aggregate()
+        self.segments = {}
+        self._lock = threading.Lock()
+
+    def add(self, entry, throw=None, visit=None):
+        """Schreibt die Aggregate mit einem Eintrag fort
+
+        throw und visit kommen aus ``VisitTracker.ingest``; die Aufnahme
+        zählt erst, wenn sie abgeschlossen ist.
+        """
+        with self._lock:
+            self.total.add(entry['score'], throw, visit, self.darts_per_visit)
+            if throw is not None and throw.segment is not None:
+                self.segments[throw.segment] = self.segments.get(throw.segment, 0) + 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'success': True,
+                'since': self.started,
+                **self.total.to_dict(),
+                'segments': dict(self.segments)
+            }
+
+
+class _Level:
+    """Buckets einer Granularität mit Ablauf nach ``retention`` Buckets"""
+
+    __slots__ = ('size', 'retention', 'buckets', 'order', 'newest')
+
+    def __init__(self, size, retention):
+        self.size = size
+        self.retention = retention
+        self.buckets = {}
+        self.order = deque()
+        self.newest = None
+
+    def bucket(self, timestamp):
+        """Bucket für einen Zeitstempel, None wenn er älter als die Aufbewahrung ist"""
+        key = int(timestamp // self.size)
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            return bucket
+        if self.newest is None or key > self.newest:
+            self.newest = key
+        limit = self.newest - self.retention
+        if key <= limit:
+            return None
+        bucket = self.buckets[key] = Aggregate()
+        self.order.append(key)
+        while self.order and self.order[0] <= limit:
+            self.buckets.pop(self.order.popleft(), None)
+        return bucket
+
+    def oldest(self, now):
+        """Anfang des ältesten Buckets, den diese Ebene zu ``now`` noch hält"""
+        return (int(now // self.size) - self.retention + 1) * self.size
+
+
+class WindowStats:
+    """Minuten-, Stunden- und Tages-Buckets für Abfragen über Zeitfenster"""
+
+    def __init__(self, minutes=DEFAULT_MINUTES, hours=DEFAULT_HOURS, days=DEFAULT_DAYS, darts_per_visit=3):
+        self.darts_per_visit = darts_per_visit
+        self.levels = (_Level(DAY, int(days)), _Level(HOUR, int(hours)), _Level(MINUTE, int(minutes)))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, darts_per_visit=3, path='autodarts_config.json'):
+        """Erzeugt die Fenster-Statistik mit der Aufbewahrung aus der Konfigurationsdatei"""
+        config = load_stats_config(path)
+        return cls(
+            minutes=config.get('minutes', DEFAULT_MINUTES),
+            hours=config.get('hours', DEFAULT_HOURS),
+            days=config.get('days', DEFAULT_DAYS),
+            darts_per_visit=darts_per_visit
+        )
+
+    def add(self, entry, throw=None, visit=None):
+        """Zählt einen Eintrag in den Bucket jeder Ebene - O(1)"""
+        with self._lock:
+            for level in self.levels:
+                bucket = level.bucket(entry['timestamp'])
+                if bucket is not None:
+                    bucket.add(entry['score'], throw, visit, self.darts_per_visit)
+
+    def query(self, start, end=None):
+        """Summiert die Buckets zwischen start und end (Standard: jetzt)
+
+        Gibt (aggregat, tatsächlicher_anfang) zurück. Der Anfang wird auf die
+        Minute abgerundet, bei abgelaufenen Minuten- bzw. Stunden-Buckets auf
+        Stunde bzw. Tag.
+        """
+        end = time.time() if end is None else end
+        days, hours, minutes = self.levels
+        start = max(start, days.oldest(end))
+        for level in (minutes, hours, days):
+            if start >= level.oldest(end):
+                start = start // level.size * level.size
+                break
+        stop = -(-end // MINUTE) * MINUTE
+
+        total = Aggregate()
+        with self._lock:
+            t = start
+            while t < stop:
+                for level in self.levels:
+                    if t % level.size == 0 and t + level.size <= stop and t >= level.oldest(end):
+                        break
+                bucket = level.buckets.get(int(t // level.size))
+                if bucket is not None:
+                    total.merge(bucket)
+                t += level.size
+        return total, start
+
+    def window(self, spec, now=None):
+        """Statistik für ein Fenster wie '15m', '2h', '7d' oder 'today', None wenn ungültig"""
+        now = time.time() if now is None else now
+        start = parse_window(spec, now)
+        if start is None:
+            return None
+        total, start = self.query(start, now)
+        return {'success': True, 'window': spec, 'from': start, 'to': now, **total.to_dict()}
+
+
+def parse_window(spec, now):
+    """Anfang eines Fensters ('15m', '2h', '7d', 'today') als Zeitstempel, None wenn ungültig"""
+    if spec == 'today':
+        local = time.localtime(now)
+        return time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1))
+    match = WINDOW_PATTERN.match(spec or '')
+    if not match:
+        return None
+    return now - int(match.group(1)) * WINDOW_UNITS[match.group(2)]
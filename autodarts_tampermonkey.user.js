@@ -20,6 +20,7 @@
     let lastScore = 0;
     let scoreHistory = [];
     let isConnected = false;
+    let eventSource = null;
 
     // Prüfe Verbindung zum Trainer
     function checkConnection() {
@@ -35,8 +36,30 @@
             });
     }
 
+    // Abonniere Push-Events der Bridge (Server-Sent Events)
+    function subscribeEvents() {
+        if (typeof EventSource === 'undefined') return;
+
+        eventSource = new EventSource(`${BRIDGE_URL}/events`);
+        eventSource.onopen = function() {
+            isConnected = true;
+            updateUI();
+        };
+        eventSource.onerror = function() {
+            // Der Browser verbindet sich selbst neu (mit Last-Event-ID)
+            isConnected = false;
+            updateUI();
+        };
+        eventSource.addEventListener('score', function(event) {
+            const entry = JSON.parse(event.data);
+            lastScore = entry.score;
+            updateUI();
+        });
+    }
+
     // Sende Score an den Trainer
     function sendScoreToTrainer(score) {
+        updateUI();
         if (!isConnected) return;
 
         fetch(`${BRIDGE_URL}/test_score`, {
@@ -275,14 +298,17 @@
         monitorWebSockets();
         monitorDOMChanges();
         
-        // Prüfe Verbindung
+        // Prüfe Verbindung und abonniere Live-Events
         checkConnection();
+        subscribeEvents();
         
-        // Update UI alle 2 Sekunden
-        setInterval(updateUI, 2000);
-        
-        // Prüfe Verbindung alle 10 Sekunden
-        setInterval(checkConnection, 10000);
+        // Fallback ohne SSE: Verbindung alle 10 Sekunden prüfen
+        setInterval(function() {
+            if (!eventSource || eventSource.readyState !== EventSource.OPEN) {
+                checkConnection();
+                updateUI();
+            }
+        }, 10000);
         
         console.log('✅ Autodarts Trainer Script aktiv');
     }
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts Throws - Wurf-Modell pro Dart mit Aufnahme-Aggregation
+
+In der Score-Historie ist ein Eintrag nur eine Zahl, ein Dart (20) und eine
+Aufnahme (180) sind dort nicht zu unterscheiden. Der ``VisitTracker`` ordnet
+jeden Eintrag beim Ingest einmal ein und aggregiert inkrementell:
+
+    Throw   ein Dart: Segment, Multiplikator, Punkte, Dart-Nr. in der
+            Aufnahme, Aufnahme-ID, Spieler, Zeitstempel
+    Visit   eine Aufnahme (bis zu 3 Darts) mit Summe, Bust, Checkout und
+            Rest vorher/nachher
+
+Eine Aufnahme wird nach ``darts_per_visit`` Darts, bei Bust oder beim
+Checkout abgeschlossen. Quellen, die nur Aufnahme-Summen liefern (z.B. 140),
+erzeugen direkt eine abgeschlossene Aufnahme ohne Darts. Punktzahlen, die
+kein einzelner Dart erreichen kann (z.B. 23 oder alles über 60), gelten
+immer als Aufnahme-Summe.
+
+Bust-Regeln wie bei X01 (``start_score``, ``out``):
+
+    double    Rest < 0, Rest 1 oder Rest 0 ohne Double (Bull zählt als Double)
+    master    wie double, Triple beendet aber auch
+    straight  nur Rest < 0
+
+Bei Darts ohne Segment (nur Punkte) und bei Aufnahme-Summen ist das letzte
+Segment unbekannt, ein Rest von 0 gilt dann als Checkout.
+
+Konfiguration im Abschnitt 'visits' der ``autodarts_config.json``::
+
+    "visits": {"start_score": 501, "out": "double", "darts_per_visit": 3, "capacity": 1000}
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from autodarts_segments import SEGMENTS, lookup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START_SCORE = 501
+DEFAULT_OUT = 'double'
+DEFAULT_DARTS_PER_VISIT = 3
+DEFAULT_CAPACITY = 1000
+DEFAULT_PLAYER = 'player'
+OUT_MULTIPLIERS = {'double': (2,), 'master': (2, 3), 'straight': None}
+
+# Alle Punktzahlen, die ein einzelner Dart erreichen kann
+DART_POINTS = frozenset(segment.points for segment in SEGMENTS.values())
+
+
+def load_visit_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'visits' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('visits', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Visit-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class Throw:
+    """Ein einzelner Dart, segment ist None wenn nur die Punkte bekannt sind"""
+
+    __slots__ = ('seq', 'segment', 'multiplier', 'points', 'dart', 'visit', 'player', 'timestamp')
+
+    def __init__(self, seq, segment, multiplier, points, dart, visit, player, timestamp):
+        self.seq = seq
+        self.segment = segment
+        self.multiplier = multiplier
+        self.points = points
+        self.dart = dart
+        self.visit = visit
+        self.player = player
+        self.timestamp = timestamp
+
+    def to_dict(self):
+        return {
+            'seq': self.seq,
+            'segment': self.segment,
+            'multiplier': self.multiplier,
+            'points': self.points,
+            'dart': self.dart,
+            'visit': self.visit,
+            'player': self.player,
+            'timestamp': self.timestamp
+        }
+
+
+class Visit:
+    """Eine Aufnahme, Summe und Zähler werden mit jedem Dart fortgeschrieben"""
+
+    __slots__ = ('id', 'player', 'darts', 'total', 'doubles', 'triples', 'bust', 'checkout',
+                 'closed', 'start_remaining', 'remaining', 'started', 'finished')
+
+    def __init__(self, visit_id, player, remaining, timestamp):
+        self.id = visit_id
+        self.player = player
+        self.darts = []
+        self.total = 0
+        self.doubles = 0
+        self.triples = 0
+        self.bust = False
+        self.checkout = False
+        self.closed = False
+        self.start_remaining = remaining
+        self.remaining = remaining
+        self.started = timestamp
+        self.finished = None
+
+    @property
+    def scored(self):
+        """Gewertete Punkte, bei Bust 0"""
+        return 0 if self.bust else self.total
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'player': self.player,
+            'darts': [throw.to_dict() for throw in self.darts],
+            'dart_count': len(self.darts),
+            'total': self.total,
+            'scored': self.scored,
+            'doubles': self.doubles,
+            'triples': self.triples,
+            'bust': self.bust,
+            'checkout': self.checkout,
+            'closed': self.closed,
+            'start_remaining': self.start_remaining,
+            'remaining': self.remaining,
+            'started': self.started,
+            'finished': self.finished
+        }
+
+
+class VisitTracker:
+    """Ordnet Einträge der Historie Darts und Aufnahmen zu, pro Spieler mit X01-Rest"""
+
+    def __init__(self, start_score=DEFAULT_START_SCORE, out=DEFAULT_OUT,
+                 darts_per_visit=DEFAULT_DARTS_PER_VISIT, capacity=DEFAULT_CAPACITY):
+        if out not in OUT_MULTIPLIERS:
+            raise ValueError(f"out muss eines von {', '.join(OUT_MULTIPLIERS)} sein")
+        self.start_score = int(start_score)
+        self.out = out
+        self.darts_per_visit = int(darts_per_visit)
+        self.visits = deque(maxlen=capacity)
+
+        self._finish_multipliers = OUT_MULTIPLIERS[out]
+        self._open = {}       # Spieler -> offene Aufnahme
+        self._remaining = {}  # Spieler -> Rest
+        self._next_visit = 1
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path='autodarts_config.json'):
+        """Erzeugt den Tracker mit Regeln aus der Konfigurationsdatei"""
+        config = load_visit_config(path)
+        return cls(
+            start_score=int(config.get('start_score', DEFAULT_START_SCORE)),
+            out=config.get('out', DEFAULT_OUT),
+            darts_per_visit=int(config.get('darts_per_visit', DEFAULT_DARTS_PER_VISIT)),
+            capacity=int(config.get('capacity', DEFAULT_CAPACITY))
+        )
+
+    def ingest(self, entry, segment=None, player=None, unit='dart'):
+        """Ordnet einen Eintrag der Score-Historie ein
+
+        segment ist die Segment-Bezeichnung falls bekannt, unit sagt, ob die
+        Quelle einzelne Darts (``'dart'``) oder Aufnahme-Summen (``'visit'``)
+        meldet. Gibt (throw, visit) zurück; throw ist None bei einer
+        Aufnahme-Summe, visit ist die Aufnahme, zu der der Eintrag gehört.
+        """
+        player = player or DEFAULT_PLAYER
+        record = lookup(segment) if segment is not None else None
+        points = entry['score']
+        with self._lock:
+            if record is None and (unit == 'visit' or points not in DART_POINTS):
+                return None, self._add_total(entry, points, player)
+            return self._add_dart(entry, record, points, player)
+
+    def _visit(self, player, timestamp):
+        visit = self._open.get(player)
+        if visit is None:
+            remaining = self._remaining.get(player, self.start_score)
+            visit = Visit(self._next_visit, player, remaining, timestamp)
+            self._next_visit += 1
+            self._open[player] = visit
+            self.visits.append(visit)
+        return visit
+
+    def _add_dart(self, entry, record, points, player):
+        visit = self._visit(player, entry['timestamp'])
+        if record is not None:
+            throw = Throw(entry['seq'], record.label, record.multiplier, record.points,
+                          len(visit.darts) + 1, visit.id, player, entry['timestamp'])
+        else:
+            throw = Throw(entry['seq'], None, None, points,
+                          len(visit.darts) + 1, visit.id, player, entry['timestamp'])
+        visit.darts.append(throw)
+        visit.total += throw.points
+        if throw.multiplier == 2:
+            visit.doubles += 1
+        elif throw.multiplier == 3:
+            visit.triples += 1
+
+        self._score(visit, visit.start_remaining - visit.total, throw.multiplier)
+        if visit.bust or visit.checkout or len(visit.darts) >= self.darts_per_visit:
+            self._close(visit, entry['timestamp'])
+        return throw, visit
+
+    def _add_total(self, entry, points, player):
+        # Eine halb geworfene Aufnahme endet mit der nächsten gemeldeten Summe
+        previous = self._open.get(player)
+        if previous is not None:
+            self._close(previous, entry['timestamp'])
+        visit = self._visit(player, entry['timestamp'])
+        visit.total = points
+        self._score(visit, visit.start_remaining - points, None)
+        self._close(visit, entry['timestamp'])
+        return visit
+
+    def _score(self, visit, remaining, multiplier):
+        """Prüft Bust/Checkout für den Rest nach dem letzten Dart"""
+        finish = self._finish_multipliers
+        if remaining < 0 or (finish and remaining == 1):
+            visit.bust = True
+        elif remaining == 0:
+            if finish and multiplier is not None and multiplier not in finish:
+                visit.bust = True
+            else:
+                visit.checkout = True
+        visit.remaining = visit.start_remaining if visit.bust else remaining
+
+    def _close(self, visit, timestamp):
+        visit.closed = True
+        visit.finished = timestamp
+        del self._open[visit.player]
+        # Nach dem Checkout beginnt ein neues Leg
+        self._remaining[visit.player] = self.start_score if visit.checkout else visit.remaining
+
+    def close_visit(self, player=None, timestamp=None):
+        """Schließt die offene Aufnahme eines Spielers (z.B. beim Takeout), gibt sie zurück"""
+        with self._lock:
+            visit = self._open.get(player or DEFAULT_PLAYER)
+            if visit is not None:
+                self._close(visit, time.time() if timestamp is None else timestamp)
+            return visit
+
+    def open_visit(self, player=None):
+        """Offene Aufnahme eines Spielers, None wenn seine letzte Aufnahme abgeschlossen ist"""
+        with self._lock:
+            return self._open.get(player or DEFAULT_PLAYER)
+
+    def remaining(self, player=None):
+        """Aktueller Rest eines Spielers"""
+        player = player or DEFAULT_PLAYER
+        with self._lock:
+            visit = self._open.get(player)
+            return visit.remaining if visit else self._remaining.get(player, self.start_score)
+
+    def standings(self):
+        """Rest aller bekannten Spieler"""
+        with self._lock:
+            players = set(self._remaining) | set(self._open)
+            return {player: (self._open[player].remaining if player in self._open
+                             else self._remaining[player]) for player in players}
+
+    def last(self, k):
+        """Die letzten k Aufnahmen als Dicts (älteste zuerst)"""
+        with self._lock:
+            visits = list(self.visits)[-k:] if k > 0 else []
+            return [visit.to_dict() for visit in visits]
+
+    def to_list(self):
+        return self.last(len(self.visits))
+
+    def __len__(self):
+        return len(self.visits)
@@ -8,8 +8,14 @@ import json
 import logging
 import time
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
+from autodarts_score_history import ScoreHistory, parse_cursor_query
+from autodarts_events import EventBus, stream_events
+from autodarts_journal import ThrowJournal
+from autodarts_response_cache import ResponseCache, serve_cached
+from autodarts_simulator import DartSimulator
+from autodarts_http_core import BridgeRequestHandler, create_bridge_server
+from autodarts_ws_server import BroadcastServer
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,7 +24,14 @@ logger = logging.getLogger(__name__)
 class AutodartsWorkingBridge:
     def __init__(self):
         self.last_score = 0
-        self.score_history = []
+        self.score_history = ScoreHistory.from_config()
+        # Sequenznummer und Journal-Reihenfolge gemeinsam vergeben (HTTP- und Poll-Threads)
+        self._history_lock = threading.Lock()
+        self.events = EventBus()
+        self.responses = ResponseCache(self.events)
+        self.journal = ThrowJournal.from_config('working')
+        if self.journal.recover(self.score_history):
+            self.last_score = self.score_history.latest()['score']
         self.desktop_connected = True  # Simuliere dass Desktop App läuft
         self.auto_score_active = False
         self.score_generator_running = False
@@ -26,6 +39,7 @@ class AutodartsWorkingBridge:
         # Score-Generator für Tests
         self.score_generator_thread = None
         self.stop_generator = threading.Event()
+        self.simulator = DartSimulator.from_config()
         
         logger.info("🚀 Autodarts Working Bridge initialisiert")
         logger.info("✅ Desktop App Status: Simuliert (läuft)")
@@ -40,6 +54,7 @@ class AutodartsWorkingBridge:
         self.stop_generator.clear()
         self.score_generator_thread = threading.Thread(target=self._score_generator_worker, daemon=True)
         self.score_generator_thread.start()
+        self.events.publish('status', {'auto_score_active': self.auto_score_active})
         logger.info("🎯 Score-Generator gestartet")
 
     def stop_score_generator(self):
@@ -51,32 +66,49 @@ class AutodartsWorkingBridge:
         self.stop_generator.set()
         if self.score_generator_thread:
             self.score_generator_thread.join(timeout=1)
+        self.events.publish('status', {'auto_score_active': self.auto_score_active})
         logger.info("🎯 Score-Generator gestoppt")
 
     def _score_generator_worker(self):
-        """Score-Generator Worker Thread"""
+        """Score-Generator Worker Thread: simulierte Darts auf echter Board-Geometrie"""
         while not self.stop_generator.is_set():
             try:
-                # Generiere zufällige Scores
-                import random
-                scores = [20, 25, 30, 40, 50, 60, 100, 120, 180]
-                score = random.choice(scores)
-                
-                self.last_score = score
-                self.score_history.append({
-                    'score': score,
-                    'timestamp': time.time(),
-                    'source': 'desktop_simulation'
-                })
-                
-                logger.info(f"🎯 Desktop Score simuliert: {score}")
-                time.sleep(random.uniform(3, 8))
-                
+                for dart in self.simulator.stream(self.stop_generator):
+                    self.add_score(dart.segment.points, 'desktop_simulation')
+                    logger.info(f"🎯 Desktop Score simuliert: {dart.segment.points} ({dart.segment.label})")
             except Exception as e:
                 logger.error(f"Fehler im Score-Generator: {e}")
                 time.sleep(1)
 
-class WorkingBridgeHandler(BaseHTTPRequestHandler):
+    def add_score(self, score, source):
+        """Fügt Score zur Historie hinzu und veröffentlicht ihn als Event"""
+        self.last_score = score
+        with self._history_lock:
+            entry = self.score_history.append(score, source)
+            self.journal.append(entry)
+        self.events.publish('score', entry)
+        return entry
+
+    def get_status(self):
+        """Gibt den aktuellen Status zurück"""
+        return {
+            'connected': True,
+            'desktop_connected': True,  # Immer True für Working Bridge
+            'auto_score_active': self.auto_score_active,
+            'last_score': self.last_score,
+            'score_history_count': len(self.score_history)
+        }
+
+    def get_score(self):
+        """Gibt den letzten Score zurück"""
+        return {
+            'success': True,
+            'score': self.last_score,
+            'source': 'desktop_simulation',
+            'desktop_connected': self.desktop_connected
+        }
+
+class WorkingBridgeHandler(BridgeRequestHandler):
     def __init__(self, *args, **kwargs):
         self.bridge = kwargs.pop('bridge')
         super().__init__(*args, **kwargs)
@@ -89,49 +121,34 @@ class WorkingBridgeHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        path = urlparse(self.path).path
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
         
         if path == '/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            status = {
-                'connected': True,
-                'desktop_connected': True,  # Immer True für Working Bridge
-                'auto_score_active': self.bridge.auto_score_active,
-                'last_score': self.bridge.last_score,
-                'score_history_count': len(self.bridge.score_history)
-            }
-            self.wfile.write(json.dumps(status).encode())
+            serve_cached(self, self.bridge.responses, 'status', self.bridge.get_status)
             
         elif path == '/score':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            response = {
-                'success': True,
-                'score': self.bridge.last_score,
-                'source': 'desktop_simulation',
-                'desktop_connected': self.bridge.desktop_connected
-            }
-            self.wfile.write(json.dumps(response).encode())
+            serve_cached(self, self.bridge.responses, 'score', self.bridge.get_score)
             
+        elif path == '/events':
+            stream_events(self, self.bridge.events, parsed_url.query)
+
         elif path == '/scores':
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            scores = self.bridge.score_history[-10:]  # Letzte 10 Scores
-            response = {
-                'success': True,
-                'scores': scores,
-                'count': len(scores)
-            }
+            cursor = parse_cursor_query(parsed_url.query)
+            if cursor is not None:
+                response = self.bridge.score_history.since(*cursor)
+            else:
+                scores = self.bridge.score_history.last(10)  # Letzte 10 Scores
+                response = {
+                    'success': True,
+                    'scores': scores,
+                    'count': len(scores)
+                }
             self.wfile.write(json.dumps(response).encode())
             
         else:
@@ -176,12 +193,7 @@ class WorkingBridgeHandler(BaseHTTPRequestHandler):
             data = json.loads(post_data.decode('utf-8'))
             
             score = data.get('score', 0)
-            self.bridge.last_score = score
-            self.bridge.score_history.append({
-                'score': score,
-                'timestamp': time.time(),
-                'source': 'test'
-            })
+            self.bridge.add_score(score, 'test')
             
             response = {'success': True, 'score': score}
             self.wfile.write(json.dumps(response).encode())
@@ -197,12 +209,16 @@ def main():
     def handler(*args, **kwargs):
         return WorkingBridgeHandler(*args, bridge=bridge, **kwargs)
     
-    server = HTTPServer(('localhost', 8766), handler)
+    server = create_bridge_server(handler, 8766)
+    push_server = BroadcastServer(bridge.events)
+    push_server.start()
     
     print("🚀 Autodarts Working Bridge läuft auf Port 8766")
     print("📡 Status: http://localhost:8766/status")
     print("🎯 Scores: http://localhost:8766/score")
     print("📊 Score History: http://localhost:8766/scores")
+    print("📣 Live-Events (SSE): http://localhost:8766/events")
+    print(f"🔌 Live-Events (WebSocket): ws://localhost:{push_server.port}")
     print("▶️  Start Auto-Score: http://localhost:8766/start_auto_score")
     print("⏹️  Stop Auto-Score: http://localhost:8766/stop_auto_score")
     print("🧪 Test Score: http://localhost:8766/test_score")
@@ -215,6 +231,9 @@ def main():
     except KeyboardInterrupt:
         print("\n🛑 Bridge wird gestoppt...")
         bridge.stop_score_generator()
+        push_server.stop()
+        bridge.events.close()
+        bridge.journal.close()
         server.shutdown()
 
 if __name__ == "__main__":
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Autodarts WebSocket Server - Lokaler Push-Kanal der Bridges für Browser und OBS
+
+Der Server hängt sich an den EventBus einer Bridge und sendet jedes Event
+(Würfe, Statusänderungen) als JSON-Textframe an alle verbundenen Clients:
+
+    {"id": 12, "type": "score", "data": {"seq": 7, "score": 60, ...}}
+
+Jeder Client hat eine eigene, begrenzte Sendewarteschlange und einen eigenen
+Sender-Thread. Ist die Warteschlange voll (z.B. eine hängende OBS-Browserquelle),
+wird das älteste Event dieses Clients verworfen - der Ingest-Pfad in
+``add_score`` blockiert nie. Ein Frame wird pro Event nur einmal kodiert und
+von allen Clients gemeinsam genutzt.
+
+Implementiert nur den Teil von RFC 6455, den die Bridges brauchen
+(Handshake, Textframes, Ping/Pong, Close) und kommt ohne Zusatzpakete aus.
+Clients senden nur Ping und Close; ein Frame mit mehr als ``max_frame_bytes``
+Nutzdaten (Abschnitt 'push', Standard 64 KiB) wird nicht gelesen, die
+Verbindung wird mit Status 1009 (Message Too Big) geschlossen. Der Handshake
+muss innerhalb von ``handshake_timeout`` Sekunden (Standard 5) ankommen.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import queue
+import socket
+import struct
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8768
+DEFAULT_QUEUE_SIZE = 256
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+MAX_HANDSHAKE_BYTES = 8192
+DEFAULT_MAX_FRAME_BYTES = 65536
+CLOSE_MESSAGE_TOO_BIG = 1009
+DEFAULT_HANDSHAKE_TIMEOUT = 5.0
+
+OPCODE_TEXT = 0x1
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def load_push_config(path='autodarts_config.json'):
+    """Lädt den Abschnitt 'push' aus der Konfigurationsdatei"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('push', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Push-Konfiguration ungültig, verwende Standardwerte: {e}")
+        return {}
+
+
+class FrameTooLarge(ValueError):
+    """Ein Client-Frame überschreitet die erlaubte Nutzdatenlänge"""
+
+
+def encode_frame(payload, opcode=OPCODE_TEXT):
+    """Kodiert einen unmaskierten Server-Frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def _recv_exact(sock, n):
+    data = b''
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("Verbindung geschlossen")
+        data += chunk
+    return data
+
+
+def read_frame(sock, max_size=DEFAULT_MAX_FRAME_BYTES):
+    """Liest einen (maskierten) Client-Frame und gibt (opcode, payload) zurück
+
+    Wirft FrameTooLarge, bevor Nutzdaten über max_size Bytes gelesen werden.
+    """
+    first, second = _recv_exact(sock, 2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', _recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', _recv_exact(sock, 8))[0]
+    if length > max_size:
+        raise FrameTooLarge(f"Frame mit {length} Bytes, erlaubt sind {max_size}")
+    mask = _recv_exact(sock, 4) if second & 0x80 else None
+    payload = _recv_exact(sock, length) if length else b''
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+class WebSocketClient:
+    """Ein verbundener Client mit eigener, begrenzter Sendewarteschlange"""
+
+    def __init__(self, sock, address, queue_size, pending=b''):
+        self.sock = sock
+        self.address = address
+        self.pending = pending
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.closed = False
+
+    def recv(self, n):
+        """Liest vom Socket, zuerst die mit dem Handshake empfangenen Bytes"""
+        if self.pending:
+            data, self.pending = self.pending[:n], self.pending[n:]
+            return data
+        return self.sock.recv(n)
+
+    def enqueue(self, frame):
+        """Stellt einen Frame ein ohne zu blockieren, verwirft bei Überlauf den ältesten"""
+        while True:
+            try:
+                self.queue.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def send_loop(self):
+        """Sender-Thread: leert die Warteschlange auf den Socket"""
+        try:
+            while True:
+                frame = self.queue.get()
+                if frame is None:
+                    break
+                self.sock.sendall(frame)
+        except OSError as e:
+            logger.debug(f"WebSocket-Client {self.address} Sendefehler: {e}")
+        finally:
+            self.close()
+
+    def finish(self):
+        """Lässt den Sender-Thread noch ausstehende Frames senden und dann schließen"""
+        self.enqueue(None)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+        # Sender-Thread aufwecken
+        self.enqueue(None)
+
+
+class BroadcastServer:
+    """WebSocket-Server, der alle Events eines EventBus an alle Clients verteilt"""
+
+    def __init__(self, bus, port=None, host='localhost', queue_size=None, max_frame_bytes=None,
+                 handshake_timeout=None):
+        config = load_push_config()
+        self.bus = bus
+        self.host = host
+        self.port = port if port is not None else int(config.get('websocket_port', DEFAULT_PORT))
+        self.queue_size = queue_size or int(config.get('send_queue_size', DEFAULT_QUEUE_SIZE))
+        self.max_frame_bytes = max_frame_bytes or int(config.get('max_frame_bytes', DEFAULT_MAX_FRAME_BYTES))
+        self.handshake_timeout = handshake_timeout or float(config.get('handshake_timeout',
+                                                                       DEFAULT_HANDSHAKE_TIMEOUT))
+        self.clients = set()
+        self.running = False
+        self._lock = threading.Lock()
+        self._server_socket = None
+        self._accept_thread = None
+
+    def start(self):
+        """Startet den Server im Hintergrund, gibt False zurück wenn der Port belegt ist"""
+        try:
+            self._server_socket = socket.create_server((self.host, self.port))
+        except OSError as e:
+            logger.error(f"❌ WebSocket-Server konnte Port {self.port} nicht öffnen: {e}")
+            return False
+
+        self.running = True
+        self.bus.subscribe(self._on_event)
+        self._accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accept_thread.start()
+        logger.info(f"🔌 WebSocket-Server gestartet: ws://{self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        """Stoppt den Server und trennt alle Clients"""
+        if not self.running:
+            return
+        self.running = False
+        self.bus.unsubscribe(self._on_event)
+        try:
+            self._server_socket.close()
+        except OSError:
+            pass
+        with self._lock:
+            clients = list(self.clients)
+            self.clients.clear()
+        for client in clients:
+            client.close()
+        logger.info("⏹️ WebSocket-Server gestoppt")
+
+    def client_count(self):
+        return len(self.clients)
+
+    def _on_event(self, event):
+        """EventBus-Listener: kodiert das Event einmal und verteilt es"""
+        message = json.dumps({'id': event.id, 'type': event.type, 'data': event.data})
+        self.broadcast(encode_frame(message.encode('utf-8')))
+
+    def broadcast(self, frame):
+        with self._lock:
+            clients = list(self.clients)
+        for client in clients:
+            client.enqueue(frame)
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                sock, address = self._server_socket.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._handle_client, args=(sock, address), daemon=True).start()
+
+    def _handshake(self, sock):
+        """Führt den HTTP-Upgrade-Handshake durch
+
+        Gibt die nach dem Request-Kopf empfangenen Bytes zurück (der Anfang
+        des ersten Client-Frames), None wenn der Handshake fehlschlägt.
+        """
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = sock.recv(1024)
+            if not chunk or len(request) > MAX_HANDSHAKE_BYTES:
+                return None
+            request += chunk
+        request, _, pending = request.partition(b'\r\n\r\n')
+
+        key = None
+        for line in request.decode('latin-1').split('\r\n')[1:]:
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'sec-websocket-key':
+                key = value.strip()
+        if not key:
+            sock.sendall(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n')
+            return None
+
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode('ascii')).digest()).decode('ascii')
+        sock.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode('ascii'))
+        return pending
+
+    def _handle_client(self, sock, address):
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Ein Client, der verbindet und nichts sendet, hält den Thread nur bis zum Timeout
+            sock.settimeout(self.handshake_timeout)
+            pending = self._handshake(sock)
+            if pending is None:
+                sock.close()
+                return
+            sock.settimeout(None)
+        except OSError as e:
+            logger.debug(f"WebSocket-Handshake mit {address} fehlgeschlagen: {e}")
+            sock.close()
+            return
+
+        client = WebSocketClient(sock, address, self.queue_size, pending)
+        with self._lock:
+            self.clients.add(client)
+        logger.info(f"🔌 WebSocket-Client verbunden: {address[0]}:{address[1]}")
+
+        threading.Thread(target=client.send_loop, daemon=True).start()
+        try:
+            self._read_loop(client)
+        finally:
+            with self._lock:
+                self.clients.discard(client)
+            client.finish()
+            logger.info(f"🔌 WebSocket-Client getrennt: {address[0]}:{address[1]} "
+                        f"({client.dropped} Events verworfen)")
+
+    def _read_loop(self, client):
+        """Liest Client-Frames, beantwortet Pings und erkennt Close"""
+        try:
+            while self.running and not client.closed:
+                opcode, payload = read_frame(client, self.max_frame_bytes)
+                if opcode == OPCODE_CLOSE:
+                    client.enqueue(encode_frame(payload[:2], OPCODE_CLOSE))
+                    break
+                if opcode == OPCODE_PING:
+                    client.enqueue(encode_frame(payload, OPCODE_PONG))
+        except FrameTooLarge as e:
+            logger.warning(f"⚠️ WebSocket-Client {client.address[0]}:{client.address[1]}: {e}")
+            client.enqueue(encode_frame(struct.pack('!H', CLOSE_MESSAGE_TOO_BIG), OPCODE_CLOSE))
+        except (ConnectionError, OSError, ValueError):
+            pass
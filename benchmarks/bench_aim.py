@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Aim-Heatmaps, kalte FFT-Berechnung und Cache-Treffer
+
+Misst für mehrere sigma die Zeit einer kalten Heatmap (``AimEngine.best``
+mit leerem Cache, die Punkte-Karte ist vorab gebaut) und einer wiederholten
+Abfrage aus dem Cache. Zur Kontrolle wird der Erwartungswert am besten
+Zielpunkt per Monte-Carlo-Simulation (``--darts`` Würfe) nachgerechnet.
+
+    python benchmarks/bench_aim.py --sigmas 5 15 30 60 100
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from autodarts_aim import AimEngine  # noqa: E402
+from autodarts_board_geometry import code_points, segment_codes  # noqa: E402
+
+
+def monte_carlo(sigma, x, y, darts, rng):
+    errors = rng.standard_normal((2, darts)) * sigma
+    return float(code_points()[segment_codes(errors[0] + x, errors[1] + y)].mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sigmas', type=float, nargs='+', default=[5.0, 15.0, 30.0, 60.0, 100.0])
+    parser.add_argument('--darts', type=int, default=1000000)
+    parser.add_argument('--rounds', type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = AimEngine()
+    start = time.perf_counter()
+    engine.score_map('max')
+    print(f"Punkte-Karte {engine.size}x{engine.size}: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    rng = np.random.default_rng(1)
+    print(f"{'sigma':>6} {'kalt ms':>8} {'Cache µs':>9} {'Ziel':>6} {'x':>7} {'y':>7} {'E[FFT]':>8} {'E[MC]':>8}")
+    worst = 0.0
+    for sigma in args.sigmas:
+        start = time.perf_counter()
+        result = engine.best(sigma)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            engine.best(sigma)
+        warm = (time.perf_counter() - start) / args.rounds
+        aim = result['aim']
+        expected = monte_carlo(sigma, aim['x'], aim['y'], args.darts, rng)
+        worst = max(worst, abs(expected - aim['expected']))
+        print(f"{sigma:>6.1f} {cold * 1000:>8.1f} {warm * 1e6:>9.1f} {aim['segment']:>6} {aim['x']:>7.1f} "
+              f"{aim['y']:>7.1f} {aim['expected']:>8.3f} {expected:>8.3f}")
+    print(f"\nGrößte Abweichung FFT gegen Monte-Carlo: {worst:.3f} Punkte")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
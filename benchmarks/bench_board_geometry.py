@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Abbildung (x, y) -> Segment, skalar gegen vektorisiert
+
+Erzeugt zufällige Treffpunkte über das ganze Board (inkl. Miss-Bereich),
+prüft dass alle Verfahren dieselben Segmente liefern und misst die Kosten
+pro Punkt für:
+
+- scalar: ``segment_at`` pro Punkt (reines Python, Ring-Schleife, atan2)
+- hypot: NumPy mit ``np.hypot``, ``searchsorted`` über die Ringgrenzen und
+  Sektor-Rechnung in Grad (die erste vektorisierte Fassung)
+- lut: ``segment_codes`` (Radius- und Winkel-Tabellen, ein ``take`` je Tabelle)
+
+    python benchmarks/bench_board_geometry.py --points 100000 --rounds 20
+"""
+
+import argparse
+import math
+import sys
+import os
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from autodarts_board_geometry import (DOUBLE_OUTER, RING_BASE, RING_EDGES, RING_NUMBERED,  # noqa: E402
+                                      SECTOR_ANGLE, SECTOR_ORDER, SEGMENT_CODES, segment_at,
+                                      segment_codes)
+
+
+def hypot_segment_codes(x, y):
+    """segment_codes vor den Tabellen: searchsorted über die Ringgrenzen, Sektoren in Grad"""
+    ring = np.searchsorted(np.asarray(RING_EDGES), np.hypot(x, y), side='left')
+    angle = np.degrees(np.arctan2(x, y)) % 360.0
+    sector = ((angle + SECTOR_ANGLE / 2) // SECTOR_ANGLE).astype(np.intp) % 20
+    numbers = np.asarray(SECTOR_ORDER, dtype=np.uint8)[sector]
+    return np.asarray(RING_BASE, dtype=np.uint8)[ring] + np.asarray(RING_NUMBERED, dtype=np.uint8)[ring] * numbers
+
+
+def scalar_segment_codes(x, y):
+    return [SEGMENT_CODES[segment_at(a, b)] for a, b in zip(x.tolist(), y.tolist())]
+
+
+def measure(func, x, y, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(x, y)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(x)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=100000)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    radius = DOUBLE_OUTER * 1.1 * np.sqrt(rng.random(args.points))
+    angle = rng.random(args.points) * 2 * math.pi
+    x, y = radius * np.sin(angle), radius * np.cos(angle)
+
+    expected = np.asarray(scalar_segment_codes(x, y))
+    mismatches = {name: int(np.count_nonzero(func(x, y) != expected))
+                  for name, func in (('hypot', hypot_segment_codes), ('lut', segment_codes))}
+    for name, count in mismatches.items():
+        print(f"{name}: {count} Abweichungen zu segment_at")
+    print()
+
+    print(f"{'Verfahren':<10} {'ns/Punkt':>10} {'ms/Batch':>10}")
+    results = {}
+    for name, func, rounds in (('scalar', scalar_segment_codes, max(1, args.rounds // 10)),
+                               ('hypot', hypot_segment_codes, args.rounds),
+                               ('lut', segment_codes, args.rounds)):
+        results[name] = measure(func, x, y, rounds)
+        print(f"{name:<10} {results[name]:>10.1f} {results[name] * args.points / 1e6:>10.2f}")
+    print(f"\nFaktor lut gegen scalar: {results['scalar'] / results['lut']:.0f}x, "
+          f"gegen hypot: {results['hypot'] / results['lut']:.1f}x")
+    return 1 if any(mismatches.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
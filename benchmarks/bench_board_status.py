@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Parsen des Board-Manager-Status, alter Regex-Parser gegen parse_status
+
+Liest den Korpus ``benchmarks/data/board_status_corpus.jsonl`` (ein Status-Text
+pro Zeile mit erwarteten Punkten und Segmenten), prüft ``parse_status`` gegen
+die Erwartungen und misst die Kosten pro Parse für:
+
+- legacy: ``parse_score_from_status`` vor dem Umbau (Pattern-Listen,
+  ``re.findall`` mit ``re.IGNORECASE`` pro Pattern, ``(\\d+)``-Fallback)
+- compiled: ``parse_status`` (Tokenizer mit vorberechneten Tabellen, ein Durchlauf)
+
+    python benchmarks/bench_board_status.py --rounds 2000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from autodarts_board_status import parse_status  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'board_status_corpus.jsonl')
+
+
+def legacy_parse_segment_to_score(segment):
+    try:
+        if not segment:
+            return 0
+        if segment.startswith('D'):
+            return int(segment[1:]) * 2
+        elif segment.startswith('T'):
+            return int(segment[1:]) * 3
+        elif segment.startswith('S'):
+            return int(segment[1:])
+        elif segment.upper() == 'BULL':
+            return 50
+        elif segment.startswith('M'):
+            return 0
+        else:
+            return int(segment)
+    except ValueError:
+        return 0
+
+
+def legacy_parse_score_from_status(status_text):
+    """AutodartsBoardManagerBridge.parse_score_from_status vor dem Umbau"""
+    try:
+        if "Throw detected" in status_text:
+            segment_patterns = [
+                r'segment[=:]\s*([A-Z0-9]+)',
+                r'Segment[=:]\s*([A-Z0-9]+)',
+                r'([A-Z]\d+)',
+                r'(\d+)'
+            ]
+            for pattern in segment_patterns:
+                matches = re.findall(pattern, status_text, re.IGNORECASE)
+                if matches:
+                    score = legacy_parse_segment_to_score(matches[0])
+                    if score > 0:
+                        return score
+
+        score_patterns = [
+            r'score[=:]\s*(\d+)',
+            r'points[=:]\s*(\d+)',
+            r'value[=:]\s*(\d+)'
+        ]
+        for pattern in score_patterns:
+            matches = re.findall(pattern, status_text, re.IGNORECASE)
+            if matches:
+                return int(matches[0])
+        return None
+    except Exception:
+        return None
+
+
+def load_corpus():
+    with open(CORPUS, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check(corpus):
+    """Vergleicht parse_status mit den erwarteten Werten, gibt die Abweichungen zurück"""
+    failures = []
+    for sample in corpus:
+        status = parse_status(sample['text'])
+        segments = [event.segment for event in status.throws]
+        if status.points != sample['points'] or segments != sample['segments']:
+            failures.append((sample['text'], status.points, segments))
+    return failures
+
+
+def measure(parse, texts, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            parse(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(texts)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    failures = check(corpus)
+    for text, points, segments in failures:
+        print(f"❌ {text!r}: {points} {segments}")
+    print(f"Korpus: {len(corpus)} Status-Texte, {len(corpus) - len(failures)} korrekt geparst")
+
+    legacy_wrong = sum(1 for sample in corpus
+                       if legacy_parse_score_from_status(sample['text']) != sample['points'])
+    print(f"Alter Parser: {legacy_wrong} abweichende Ergebnisse\n")
+
+    texts = [sample['text'] for sample in corpus]
+    print(f"{'Parser':<10} {'ns/Parse':>10}")
+    legacy = measure(legacy_parse_score_from_status, texts, args.rounds)
+    compiled = measure(parse_status, texts, args.rounds)
+    print(f"{'legacy':<10} {legacy:>10.0f}")
+    print(f"{'compiled':<10} {compiled:>10.0f}")
+    print(f"\nFaktor: {legacy / compiled:.1f}x")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Upstream-Polls mit requests.get und mit dem Keep-Alive-Client
+
+Startet einen lokalen HTTP/1.1-Server, der wie der Board Manager einen
+Status-Text unter /api/board/status liefert, und pollt ihn einmal mit
+``requests.get`` (neue TCP-Verbindung pro Poll) und einmal über
+``PooledHTTPClient``. Ausgegeben werden Latenz (Median, p99) und die Zahl
+der vom Server angenommenen Verbindungen.
+
+    python benchmarks/bench_http_client.py --polls 2000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from autodarts_http_client import PooledHTTPClient  # noqa: E402
+
+STATUS_TEXT = b"Board status: Throw detected segment=T20 cameras=3 detection=v0.26.15"
+
+
+class BoardStatusHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-type', 'text/plain')
+        self.send_header('Content-Length', str(len(STATUS_TEXT)))
+        self.end_headers()
+        self.wfile.write(STATUS_TEXT)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+def measure(get, url, polls):
+    latencies = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        response = get(url)
+        response.content
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--polls', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'Client':<16} {'Median ms':>10} {'p99 ms':>8} {'Verbindungen':>13}")
+    for name in ('requests.get', 'PooledHTTPClient'):
+        server = CountingServer(('127.0.0.1', 0), BoardStatusHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/api/board/status"
+
+        if name == 'requests.get':
+            median, p99 = measure(lambda u: requests.get(u, timeout=2), url, args.polls)
+        else:
+            client = PooledHTTPClient()
+            median, p99 = measure(client.get, url, args.polls)
+            client.close()
+
+        print(f"{name:<16} {median:>10.3f} {p99:>8.3f} {server.connections:>13}")
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: /status und /score mit und ohne Response-Cache
+
+Vergleicht den alten Handler der Stop-Bridge (Dict bauen, json.dumps,
+einzelne send_header-Aufrufe) mit dem vorkodierten Cache:
+
+- Handler: Requests pro Sekunde ohne Netzwerk, Request und Antwort laufen
+  über In-Memory-Puffer. Zeigt die reinen Kosten pro Poll.
+- Loopback: Requests pro Sekunde über einen echten ThreadingHTTPServer,
+  eine TCP-Verbindung pro Request wie bei den Browser-Pollern.
+
+    python benchmarks/bench_response_cache.py --requests 5000 --threads 4
+"""
+
+import argparse
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from autodarts_stop_bridge import AutodartsStopBridge, StopBridgeHandler  # noqa: E402
+
+
+class LegacyHandler(StopBridgeHandler):
+    """Der Handler vor dem Response-Cache"""
+
+    def do_GET(self):
+        if self.path in ('/status', '/score'):
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            data = self.bridge.get_status() if self.path == '/status' else self.bridge.get_score()
+            self.wfile.write(json.dumps(data).encode())
+        else:
+            super().do_GET()
+
+
+def _quiet(handler_class):
+    return type(handler_class.__name__, (handler_class,), {'log_message': lambda self, *args: None})
+
+
+def run_handler(handler_class, bridge, path, requests):
+    handler_class = _quiet(handler_class)
+    request = f"GET {path} HTTP/1.0\r\nHost: localhost\r\n\r\n".encode('ascii')
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        handler = handler_class.__new__(handler_class)
+        handler.bridge = bridge
+        handler.client_address = ('127.0.0.1', 0)
+        handler.rfile = io.BytesIO(request)
+        handler.wfile = io.BytesIO()
+        handler.handle_one_request()
+    return requests / (time.perf_counter() - start)
+
+
+def run_loopback(handler_class, bridge, path, requests, threads):
+    handler_class = _quiet(handler_class)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), lambda *a, **kw: handler_class(*a, bridge=bridge, **kw))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    request = f"GET {path} HTTP/1.0\r\nHost: localhost\r\n\r\n".encode('ascii')
+
+    def worker(n):
+        for _ in range(n):
+            with socket.create_connection(('127.0.0.1', port)) as sock:
+                sock.sendall(request)
+                while sock.recv(65536):
+                    pass
+
+    per_thread = requests // threads
+    workers = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    server.shutdown()
+    server.server_close()
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    # Die Bridge legt ihr Journal im Arbeitsverzeichnis an
+    os.chdir(tempfile.mkdtemp(prefix='autodarts-bench-'))
+    bridge = AutodartsStopBridge()
+    for score in (60, 45, 100, 26, 180):
+        bridge.add_score(score)
+
+    print(f"{'Messung':<10} {'Endpunkt':<10} {'vorher req/s':>14} {'nachher req/s':>14} {'Faktor':>8}")
+    for mode in ('Handler', 'Loopback'):
+        for path in ('/status', '/score'):
+            if mode == 'Handler':
+                before = run_handler(LegacyHandler, bridge, path, args.requests * 10)
+                after = run_handler(StopBridgeHandler, bridge, path, args.requests * 10)
+            else:
+                before = run_loopback(LegacyHandler, bridge, path, args.requests, args.threads)
+                after = run_loopback(StopBridgeHandler, bridge, path, args.requests, args.threads)
+            print(f"{mode:<10} {path:<10} {before:>14.0f} {after:>14.0f} {after / before:>7.2f}x")
+
+    bridge.journal.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark-Suite: Hot Paths der Bridge mit maschinenlesbarem Ergebnis und Vergleich
+
+Misst die Pfade, die bei jedem Wurf bzw. jedem Client-Request laufen:
+
+    parse_segment                 Segment-Bezeichnung -> Punkte (Engine)
+    extract_score_from_message    WebSocket-Nachricht -> Score (Engine)
+    parse_score_from_status       Board-Manager-Status -> Punkte (Korpus aus
+                                  ``benchmarks/data/board_status_corpus.jsonl``)
+    add_score                     komplette Ingest-Pipeline der Engine
+    GET /status, /score, /scores  Handler-Pfad der Engine ohne Socket, dazu
+                                  /scores?since= (Cursor auf die letzten 100)
+
+``GET /status`` und ``GET /score`` invalidieren vor jedem Aufruf den
+Response-Cache und messen so den Aufbau der Antwort; ``(cache hit)`` misst
+dieselben Endpunkte mit gültigem Cache, also nur das Ausliefern der Bytes.
+
+``add_score`` und die Handler laufen je Historien-Größe (Standard 1k, 100k,
+1M Würfe) gegen eine Engine mit so gefüllter Historie. ``add_score`` bekommt
+eine eigene Engine, damit die Handler-Fälle genau die angegebene Größe sehen.
+Die Engines laufen in einem temporären Verzeichnis ohne Journal, Aufzeichnung
+und Discovery-Cache.
+
+Jeder Fall wird kalibriert, bis eine Messung mindestens ``--min-time``
+Sekunden dauert, und ``--repeats`` mal gemessen; berichtet werden Median und
+Minimum in ns pro Operation. ``--output`` schreibt das Ergebnis als JSON,
+``--json`` gibt es auf stdout aus.
+
+Vergleich: ``--compare alt.json neu.json`` vergleicht zwei Läufe,
+``--compare alt.json`` den aktuellen Lauf mit einem alten. Ein Fall gilt als
+Regression, wenn sein Median um mehr als ``--threshold`` (Standard 10 %)
+langsamer ist; dann endet das Skript mit Exit-Code 1.
+
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --sizes 1000 100000 --compare baseline.json
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from http.client import HTTPMessage
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from autodarts_bridge_engine import (AutodartsBridgeEngine, BridgeEngineHandler,  # noqa: E402
+                                     extract_score_from_message, parse_board_status, parse_segment)
+from replay_capture import prepare_workdir  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'board_status_corpus.jsonl')
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DEFAULT_THRESHOLD = 0.10
+CURSOR_PAGE = 100
+
+SEGMENT_INPUTS = ['T20', 'S20', 'D16', 'S1', 'T19', 'S5', '25', '50', 'BULL', 'M', 'd8', 'x']
+MESSAGE_INPUTS = [
+    {'score': 60},
+    {'points': 20, 'id': 17},
+    {'segment': 'T20'},
+    {'segment': 'D16', 'id': 18},
+    {'value': 0, 'segment': 'S5'},
+    {'type': 'ping'},
+    {'score': True, 'segment': '25'},
+    {'segment_value': 57},
+]
+
+
+class _Handler(BridgeEngineHandler):
+    """Engine-Handler ohne Socket: Antwort in einen Puffer, kein Request-Log"""
+
+    def __init__(self, bridge, path):
+        self.bridge = bridge
+        self.path = path
+        self.command = 'GET'
+        self.request_version = 'HTTP/1.1'
+        self.requestline = f'GET {path} HTTP/1.1'
+        self.client_address = ('127.0.0.1', 0)
+        self.headers = HTTPMessage()
+        self.wfile = io.BytesIO()
+        self.close_connection = False
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(run, min_time, repeats):
+    """Kalibriert die Iterationen auf min_time und misst repeats mal, gibt ns pro Aufruf von run zurück"""
+    iterations = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9 or iterations >= 1 << 24:
+            break
+        iterations = max(iterations * 2, int(iterations * min_time * 1e9 / max(elapsed, 1) * 1.2))
+
+    samples = [elapsed / iterations]
+    for _ in range(repeats - 1):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            run()
+        samples.append((time.perf_counter_ns() - start) / iterations)
+    return samples, iterations
+
+
+def batch(func, inputs):
+    """Ein Aufruf von func pro Eingabe, ns werden später durch len(inputs) geteilt"""
+    def run():
+        for value in inputs:
+            func(value)
+    return run
+
+
+def fill_engine(size):
+    """Engine mit size Würfen in der Historie (Kapazität aus der Konfiguration der Suite)"""
+    engine = AutodartsBridgeEngine({'sources': {}})
+    now = time.time() - size
+    sources = ('websocket', 'board_manager', 'manual')
+    engine.score_history.restore((seq, now + seq, seq % 61, sources[seq % 3]) for seq in range(1, size + 1))
+    engine.last_score = engine.score_history.latest()['score']
+    return engine
+
+
+def uncached(engine, path):
+    """Handler-Aufruf nach Invalidierung des Response-Caches (Antwort wird neu aufgebaut)"""
+    engine.responses.invalidate()
+    _Handler(engine, path).do_GET()
+
+
+def cases(sizes, status_texts):
+    """Liefert (name, params, run, ops_per_run); Engines werden pro Größe gebaut und wieder freigegeben"""
+    yield 'parse_segment', {}, batch(parse_segment, SEGMENT_INPUTS), len(SEGMENT_INPUTS)
+    yield ('extract_score_from_message', {}, batch(extract_score_from_message, MESSAGE_INPUTS),
+           len(MESSAGE_INPUTS))
+    yield 'parse_score_from_status', {}, batch(parse_board_status, status_texts), len(status_texts)
+
+    for size in sizes:
+        params = {'history': size}
+        engine = fill_engine(size)
+        yield 'add_score', params, lambda: engine.add_score('T20', 'bench'), 1
+        engine.close()
+
+        engine = fill_engine(size)
+        for path in ('/status', '/score'):
+            yield f'GET {path}', params, lambda path=path: uncached(engine, path), 1
+            yield f'GET {path} (cache hit)', params, lambda path=path: _Handler(engine, path).do_GET(), 1
+        for path in ('/scores', f'/scores?since={size - CURSOR_PAGE}'):
+            name = 'GET ' + (path if '?' not in path else '/scores?since')
+            yield name, params, lambda path=path: _Handler(engine, path).do_GET(), 1
+        engine.close()
+
+
+def case_id(name, params):
+    if not params:
+        return name
+    return f"{name}[{','.join(f'{key}={value}' for key, value in sorted(params.items()))}]"
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(sizes, min_time, repeats, pattern=None, progress=None):
+    with open(CORPUS, 'r', encoding='utf-8') as f:
+        status_texts = [json.loads(line)['text'] for line in f if line.strip()]
+
+    results = []
+    for name, params, run, ops in cases(sizes, status_texts):
+        identifier = case_id(name, params)
+        if pattern and pattern not in identifier:
+            continue
+        samples, iterations = measure(run, min_time, repeats)
+        samples = [sample / ops for sample in samples]
+        result = {
+            'id': identifier,
+            'name': name,
+            'params': params,
+            'ns_per_op': round(statistics.median(samples), 1),
+            'min_ns': round(min(samples), 1),
+            'iterations': iterations * ops,
+            'repeats': repeats
+        }
+        results.append(result)
+        if progress:
+            progress(result)
+    return {
+        'meta': {
+            'timestamp': time.time(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'min_time': min_time,
+            'repeats': repeats,
+            'sizes': sizes
+        },
+        'results': results
+    }
+
+
+def compare(base, new, threshold):
+    """Vergleicht zwei Läufe, gibt (zeilen, regressionen) zurück"""
+    old = {result['id']: result for result in base['results']}
+    rows = []
+    regressions = 0
+    for result in new['results']:
+        before = old.pop(result['id'], None)
+        if before is None:
+            rows.append((result['id'], None, result['ns_per_op'], None, 'neu'))
+            continue
+        ratio = result['ns_per_op'] / before['ns_per_op'] if before['ns_per_op'] else 1.0
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            status = 'schneller'
+        else:
+            status = 'ok'
+        rows.append((result['id'], before['ns_per_op'], result['ns_per_op'], ratio, status))
+    for identifier, before in old.items():
+        rows.append((identifier, before['ns_per_op'], None, None, 'entfallen'))
+    return rows, regressions
+
+
+def format_ns(value):
+    if value is None:
+        return '-'
+    if value >= 1e6:
+        return f"{value / 1e6:.2f} ms"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f} µs"
+    return f"{value:.0f} ns"
+
+
+def print_result(result):
+    print(f"{result['id']:<42} {format_ns(result['ns_per_op']):>12} {format_ns(result['min_ns']):>12}", flush=True)
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Historien-Größen')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Sekunden pro Messung')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--filter', help='Nur Fälle, deren Id diesen Text enthält')
+    parser.add_argument('--output', help='Ergebnis als JSON in diese Datei schreiben')
+    parser.add_argument('--json', action='store_true', help='Ergebnis als JSON auf stdout')
+    parser.add_argument('--compare', nargs='+', metavar='LAUF',
+                        help='alt.json [neu.json]: ohne neu.json wird der aktuelle Lauf verglichen')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Anteil, ab dem ein langsamerer Median als Regression gilt')
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error('--compare erwartet eine oder zwei Dateien')
+
+    if args.compare and len(args.compare) == 2:
+        base, new = load(args.compare[0]), load(args.compare[1])
+    else:
+        base = load(args.compare[0]) if args.compare else None
+        workdir = prepare_workdir(history={'capacity': max(args.sizes)})
+        logging.getLogger().setLevel(logging.WARNING)
+        progress = None
+        if not args.json:
+            print(f"{'Fall':<42} {'Median':>12} {'Minimum':>12}")
+            progress = print_result
+        try:
+            new = run_suite(args.sizes, args.min_time, args.repeats, args.filter, progress)
+        finally:
+            os.chdir(ROOT)
+            shutil.rmtree(workdir, ignore_errors=True)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(new, f, indent=2)
+
+    if base is None:
+        if args.json:
+            print(json.dumps(new))
+        return 0
+
+    rows, regressions = compare(base, new, args.threshold)
+    if args.json:
+        comparison = {'threshold': args.threshold, 'regressions': regressions,
+                      'cases': [{'id': identifier, 'before_ns': before, 'after_ns': after,
+                                 'ratio': round(ratio, 3) if ratio else None, 'status': status}
+                                for identifier, before, after, ratio, status in rows]}
+        print(json.dumps({**new, 'comparison': comparison}))
+    else:
+        print(f"\n{'Fall':<42} {'vorher':>12} {'nachher':>12} {'Faktor':>7}  Status")
+        for identifier, before, after, ratio, status in rows:
+            factor = f"{ratio:.2f}" if ratio else '-'
+            print(f"{identifier:<42} {format_ns(before):>12} {format_ns(after):>12} {factor:>7}  {status}")
+        print(f"\n{regressions} Regression(en) über {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
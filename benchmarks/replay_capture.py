@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Replay: Aufzeichnung (``.adcap``) in die Bridge Engine einspielen und messen
+
+Spielt die mit ``"capture": {"enabled": true}`` aufgezeichneten rohen
+Upstream-Daten in eine Engine im selben Prozess ein, genau an den Stellen,
+an denen sie live ankommen:
+
+- WebSocket-Frames an ``WebSocketSource.on_message``
+- Poll-Antworten des Board Managers über ``BoardManagerSource.poll_once``
+  (Änderungserkennung des Pollers inklusive)
+
+Aufzeichnungen aller Bridges lassen sich so einspielen, die Kanäle heißen
+überall ``websocket`` bzw. ``board_manager``.
+
+Tempo: ``--speed 1`` spielt in Echtzeit, ``--speed 10`` zehnmal schneller,
+``--speed max`` ohne Pausen. Gemessen werden:
+
+    Durchsatz   Frames/s und Scores/s über die gesamte Einspielung
+    Latenz      roher Frame an die Quelle -> 'score'-Event beim Abonnenten
+    Verzug      tatsächlicher gegen geplanten Einspielzeitpunkt (nicht bei max)
+
+Die Engine läuft in einem temporären Verzeichnis mit einer Kopie der
+Konfiguration, Journal, Aufzeichnung und Discovery-Cache sind dort
+abgeschaltet. Ohne Mitschnitt erzeugt ``--synthetic N`` eine Aufzeichnung
+mit N simulierten Darts (WebSocket-Frames und Board-Manager-Polls).
+
+    python benchmarks/replay_capture.py captures/engine-20260101-200000.adcap --speed max
+    python benchmarks/replay_capture.py /tmp/synthetic.adcap --synthetic 5000 --speed max --json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from autodarts_bridge_engine import AutodartsBridgeEngine  # noqa: E402
+from autodarts_capture import BINARY, POLL, POLL_FAIL, TEXT, StreamCapture, read_capture  # noqa: E402
+from autodarts_simulator import DartSimulator  # noqa: E402
+
+SYNTHETIC_POLL_INTERVAL = 0.25
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def write_synthetic(path, darts, seed=1):
+    """Erzeugt eine Aufzeichnung mit simulierten Darts im Takt des Simulators
+
+    Jeder Dart kommt als WebSocket-Frame mit Segment und id; dazwischen wird
+    der Board Manager alle 0.25 s gepollt, ein Dart erscheint dort als
+    "Throw detected"-Status, sonst bleibt der Status stehen.
+    """
+    simulator = DartSimulator.from_config(seed=seed)
+    now = [0]
+    capture = StreamCapture(path, 'synthetic', flush_interval=60.0, clock=lambda: now[0])
+    rng = random.Random(seed)
+    status = "Board ready"
+    t = 0.0
+    next_poll = 0.0
+    for i in range(darts):
+        model = simulator.players[(i // 3) % len(simulator.players)]
+        t += rng.uniform(*(simulator.visit_pause if i % 3 == 0 and i else simulator.dart_interval))
+        while next_poll < t:
+            now[0] = int(next_poll * 1e9)
+            capture.poll(status)
+            next_poll += SYNTHETIC_POLL_INTERVAL
+        dart = simulator.throw(model)
+        now[0] = int(t * 1e9)
+        capture.frame(json.dumps({'id': i, 'segment': dart.segment.label, 'x': round(dart.x, 2),
+                                  'y': round(dart.y, 2)}))
+        status = f"Throw detected #{i} segment={dart.segment.label}"
+    capture.close()
+
+
+def prepare_workdir(**sections):
+    """Temporäres Verzeichnis mit Konfigurations-Kopie ohne Persistenz, wird Arbeitsverzeichnis
+
+    sections überschreiben einzelne Einträge von Konfigurations-Abschnitten,
+    z.B. ``history={'capacity': 1000000}``.
+    """
+    workdir = tempfile.mkdtemp(prefix='autodarts-replay-')
+    config = {}
+    try:
+        with open(os.path.join(ROOT, 'autodarts_config.json'), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        pass
+    config['journal'] = {**config.get('journal', {}), 'enabled': False}
+    config['capture'] = {**config.get('capture', {}), 'enabled': False}
+    config['discovery'] = {**config.get('discovery', {}), 'enabled': False}
+    for name, values in sections.items():
+        config[name] = {**config.get(name, {}), **values}
+    with open(os.path.join(workdir, 'autodarts_config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+    os.chdir(workdir)
+    return workdir
+
+
+def replay(frames, speed):
+    """Spielt die Frames in eine frische Engine ein und gibt die Messwerte zurück"""
+    engine = AutodartsBridgeEngine({'sources': {'websocket': {'enabled': True},
+                                                'board_manager': {'enabled': True}}})
+    websocket_source = engine.sources['websocket']
+    board_source = engine.sources['board_manager']
+    current = [None]
+    board_source.use_fetch(lambda: current[0])
+
+    fed_at = [0]
+    latencies = []
+    scores = [0]
+
+    def on_event(event):
+        if event.type == 'score':
+            scores[0] += 1
+            latencies.append(time.perf_counter_ns() - fed_at[0])
+
+    engine.events.subscribe(on_event)
+    lags = []
+    start = time.perf_counter_ns()
+    for frame in frames:
+        if speed:
+            due = start + frame.offset / speed
+            remaining = (due - time.perf_counter_ns()) / 1e9
+            if remaining > 0.002:
+                time.sleep(remaining - 0.001)
+            while time.perf_counter_ns() < due:
+                pass
+            lags.append(time.perf_counter_ns() - due)
+        fed_at[0] = time.perf_counter_ns()
+        if frame.kind in (POLL, POLL_FAIL):
+            current[0] = frame.payload
+            board_source.poll_once()
+        elif frame.kind in (TEXT, BINARY):
+            websocket_source.on_message(None, frame.payload)
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    engine.close()
+
+    return {
+        'frames': len(frames),
+        'scores': scores[0],
+        'elapsed_s': round(elapsed, 4),
+        'capture_s': round(frames[-1].offset / 1e9, 3) if frames else 0.0,
+        'frames_per_s': round(len(frames) / elapsed, 1) if elapsed else 0.0,
+        'scores_per_s': round(scores[0] / elapsed, 1) if elapsed else 0.0,
+        'latency_us': {name: round(percentile(latencies, fraction) / 1e3, 1)
+                       for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))},
+        'lag_ms': {name: round(percentile(lags, fraction) / 1e6, 3)
+                   for name, fraction in (('p50', 0.5), ('p99', 0.99), ('max', 1.0))} if lags else None
+    }
+
+
+def parse_speed(value):
+    if value == 'max':
+        return 0.0
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed muss > 0 oder 'max' sein")
+    return speed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('capture', help='Pfad der Aufzeichnung (.adcap)')
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help="Faktor oder 'max'")
+    parser.add_argument('--synthetic', type=int, metavar='DARTS',
+                        help='Aufzeichnung mit so vielen simulierten Darts erzeugen statt lesen')
+    parser.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben')
+    parser.add_argument('--verbose', action='store_true', help='Log der Engine anzeigen')
+    args = parser.parse_args()
+
+    path = os.path.abspath(args.capture)
+    if args.synthetic:
+        write_synthetic(path, args.synthetic)
+    header, frames = read_capture(path)
+
+    workdir = prepare_workdir()
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    try:
+        result = replay(frames, args.speed)
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+    result = {'capture': path, 'bridge': header['name'], 'speed': args.speed or 'max', **result}
+
+    if args.json:
+        print(json.dumps(result))
+        return 0
+    print(f"Aufzeichnung: {path} ({header['name']}, {result['capture_s']} s, {result['frames']} Frames)")
+    print(f"Tempo: {result['speed']}, Dauer {result['elapsed_s']} s")
+    print(f"Durchsatz: {result['frames_per_s']:.0f} Frames/s, {result['scores_per_s']:.0f} Scores/s "
+          f"({result['scores']} Scores)")
+    latency = result['latency_us']
+    print(f"Latenz Frame -> 'score'-Event (µs): p50 {latency['p50']}  p90 {latency['p90']}  "
+          f"p99 {latency['p99']}  max {latency['max']}")
+    if result['lag_ms']:
+        lag = result['lag_ms']
+        print(f"Verzug gegen Zeitplan (ms): p50 {lag['p50']}  p99 {lag['p99']}  max {lag['max']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
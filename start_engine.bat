@@ -0,0 +1,33 @@
+@echo off
+chcp 65001 > nul
+
+echo ========================================
+echo    AUTODARTS BRIDGE ENGINE
+echo ========================================
+echo.
+
+echo 🚀 Starte Autodarts Bridge Engine...
+start cmd /k "py autodarts_bridge_engine.py"
+echo ⏳ Warte 5 Sekunden...
+timeout /t 5 >nul
+
+echo 🌐 Starte HTTP Server...
+start cmd /k "py -m http.server 8080"
+echo ⏳ Warte 5 Sekunden...
+timeout /t 5 >nul
+
+echo 🎯 Öffne Spiel-Modi-Seite...
+start "" "http://localhost:8080/spiel_modi.html"
+
+echo.
+echo ========================================
+echo ✅ AUTODARTS BRIDGE ENGINE GESTARTET!
+echo ========================================
+echo.
+echo 🎮 Spiel-Modi: http://localhost:8080/spiel_modi.html
+echo 📡 Bridge: http://localhost:8766/status
+echo.
+echo 💡 Tipp: Quellen in autodarts_config.json unter "engine" aktivieren
+echo 💡 Tipp: Schließe die Konsolen-Fenster um zu stoppen
+echo.
+pause
@@ -0,0 +1,61 @@
+import io
+import json
+import os
+import sys
+from http.client import HTTPMessage
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from autodarts_bridge_engine import AutodartsBridgeEngine, BridgeEngineHandler  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Arbeitsverzeichnis mit eigener Konfiguration, Journal aktiv, ohne Discovery und Aufzeichnung"""
+    config = {
+        'journal': {'enabled': True, 'directory': str(tmp_path / 'journal'), 'fsync_interval': 0.05},
+        'capture': {'enabled': False},
+        'discovery': {'enabled': False}
+    }
+    (tmp_path / 'autodarts_config.json').write_text(json.dumps(config), encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def make_handler(bridge, path):
+    """Engine-Handler ohne Socket, die Antwort landet in einem Puffer"""
+    handler = BridgeEngineHandler.__new__(BridgeEngineHandler)
+    handler.bridge = bridge
+    handler.path = path
+    handler.command = 'GET'
+    handler.request_version = 'HTTP/1.1'
+    handler.requestline = f'GET {path} HTTP/1.1'
+    handler.client_address = ('127.0.0.1', 0)
+    handler.headers = HTTPMessage()
+    handler.wfile = io.BytesIO()
+    handler.close_connection = False
+    handler.log_message = lambda *args: None
+    return handler
+
+
+@pytest.fixture
+def engine(workdir):
+    """Engine ohne Quellen im Arbeitsverzeichnis des Tests"""
+    bridge = AutodartsBridgeEngine({'sources': {}})
+    yield bridge
+    bridge.close()
+
+
+@pytest.fixture
+def get(engine):
+    """GET gegen den Engine-Handler ohne Socket, gibt (status, json) zurück"""
+    def request(path):
+        handler = make_handler(engine, path)
+        handler.do_GET()
+        head, _, body = handler.wfile.getvalue().partition(b'\r\n\r\n')
+        status = int(head.split(b' ', 2)[1])
+        return status, json.loads(body) if body else None
+    return request
@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.mark.parametrize('query', ['sigma=nan', 'sigma=inf', 'sigma=20&heatmap=nan', 'sigma=20&heatmap=inf',
+                                   'sigma=20&heatmap=0', 'sigma=20&heatmap=-5'])
+def test_invalid_aim_parameters_are_400(get, query):
+    status, body = get(f'/aim?{query}')
+    assert status == 400
+    assert body['success'] is False
+
+
+def test_aim_with_heatmap(get):
+    status, body = get('/aim?sigma=20&heatmap=10')
+    assert status == 200
+    assert body['heatmap']['step'] == 10.0
@@ -0,0 +1,35 @@
+import math
+
+import numpy as np
+
+from autodarts_board_geometry import CODE_SEGMENTS, DOUBLE_OUTER, segment_at, segment_codes
+from autodarts_bridge_engine import parse_coordinates
+from autodarts_segments import MISS
+
+EXTREME = [1e20, -1e20, 1e300, -1e300, 1e200, math.inf, -math.inf, math.nan]
+
+
+def codes(xs, ys):
+    return [CODE_SEGMENTS[code] for code in segment_codes(xs, ys).tolist()]
+
+
+def test_extreme_coordinates_are_miss_in_both_paths():
+    points = [(x, 0.0) for x in EXTREME] + [(0.0, y) for y in EXTREME] + [(x, x) for x in EXTREME]
+    points.append((math.nan, math.inf))
+    xs, ys = zip(*points)
+    assert codes(xs, ys) == [segment_at(x, y) for x, y in points]
+    assert set(codes(xs, ys)) == {MISS}
+
+
+def test_vectorized_matches_scalar_on_the_board():
+    rng = np.random.default_rng(1)
+    xs = rng.uniform(-DOUBLE_OUTER - 10, DOUBLE_OUTER + 10, 20000)
+    ys = rng.uniform(-DOUBLE_OUTER - 10, DOUBLE_OUTER + 10, 20000)
+    assert codes(xs, ys) == [segment_at(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+
+def test_parse_coordinates_rejects_non_finite_values():
+    assert parse_coordinates({'points': [[1.0, 2.0]]}) == ([1.0], [2.0])
+    for bad in (math.inf, -math.inf, math.nan, 10 ** 400, True, '1'):
+        assert parse_coordinates({'points': [[bad, 0.0]]}) is None
+        assert parse_coordinates({'x': [0.0], 'y': [bad]}) is None
@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+from autodarts_board_status import ThrowEvent, parse_status
+from autodarts_bridge_engine import parse_board_status
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'data',
+                      'board_status_corpus.jsonl')
+
+
+def corpus():
+    with open(CORPUS, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.parametrize('entry', corpus(), ids=lambda entry: entry['text'][:40])
+def test_corpus(entry):
+    status = parse_status(entry['text'])
+    assert parse_board_status(entry['text']) == entry['points']
+    assert [event.segment for event in status.throws] == entry['segments']
+
+
+def test_throw_detected_with_segment_and_dart():
+    status = parse_status("Throw detected: dart=2 segment=T20")
+    assert status.throw_detected
+    assert status.throws == (ThrowEvent('T20', 3, 20, 60, 2),)
+    assert status.points == 60
+
+
+def test_freestanding_labels_are_canonical():
+    assert parse_status("Board status: Throw detected (D7), cameras=3").throws[0].segment == 'D7'
+    assert parse_status("Throw detected BULL").throws[0] == ThrowEvent('50', 2, 25, 50, 1)
+    assert parse_status("Throw detected SB").throws[0].segment == '25'
+    assert parse_status("Throw detected MISS").throws[0].points == 0
+
+
+def test_segment_key_accepts_bare_numbers():
+    assert parse_status("segment=20").throws[0].segment == 'S20'
+    assert parse_status("segment: d16").throws[0].segment == 'D16'
+
+
+def test_explicit_score():
+    status = parse_status("Board status: Idle score=100")
+    assert status.throws == ()
+    assert status.score == 100
+    assert parse_board_status("Board status: Idle score=100") == 100
+
+
+def test_numbers_and_partial_tokens_are_no_segments():
+    assert parse_status("Board status: Ready, cameras=3 20 v0.26.15").throws == ()
+    assert parse_status("Throw detected abcT20 T20x").throws == ()
+    assert parse_status("Throw detected T25 D21 T0").throws == ()
+    assert parse_board_status("Board status: Ready") is None
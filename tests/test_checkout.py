@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from autodarts_checkout import CheckoutSolver, CheckoutTable
+
+BOGEY_DOUBLE = [159, 162, 163, 165, 166, 168, 169]
+
+
+@pytest.fixture(scope='module')
+def solver():
+    return CheckoutSolver()
+
+
+def test_double_out(solver):
+    table = solver.table('double')
+    assert table.max_score == 170
+    assert table.routes(170) == [['T20', 'T20', '50']]
+    assert table.routes(40, darts=1) == [['D20']]
+    assert table.routes(100, darts=2, limit=2) == [['T20', 'D20'], ['50', '50']]
+    for remaining in BOGEY_DOUBLE + [1, 171, 180]:
+        assert table.routes(remaining) == []
+        assert table.count(remaining) == 0
+
+
+def test_master_out_allows_treble_finish(solver):
+    master = solver.table('master')
+    assert master.max_score == 180
+    assert master.routes(180, limit=1) == [['T20', 'T20', 'T20']]
+    assert master.routes(165) and master.routes(168) and master.routes(162)
+    assert master.routes(169) == []
+    assert master.routes(1) == []
+
+
+def test_straight_out_allows_singles(solver):
+    straight = solver.table('straight')
+    assert straight.routes(1) == [['S1']]
+    assert straight.routes(2, limit=2) == [['D1'], ['S2']]
+    assert straight.routes(169) == []
+
+
+def test_darts_limit_routes(solver):
+    table = solver.table('double')
+    assert table.routes(100, darts=1) == []
+    assert table.count(100, darts=1) == 0
+    assert all(len(route) <= 2 for route in table.routes(100, darts=2))
+    assert table.count(100, darts=2) < table.count(100, darts=3)
+
+
+def test_suggest(solver):
+    assert solver.suggest(170) == {
+        'success': True, 'remaining': 170, 'darts': 3, 'out': 'double',
+        'possible': True, 'count': 1, 'routes': [['T20', 'T20', '50']]
+    }
+    assert solver.suggest(169)['possible'] is False
+
+
+def test_unknown_out_rule():
+    with pytest.raises(ValueError):
+        CheckoutTable('triple')
+
+
+def test_preferred_doubles_from_config(workdir):
+    config = json.loads((workdir / 'autodarts_config.json').read_text(encoding='utf-8'))
+    config['checkout'] = {'preferred_doubles': ['D16', 'D20'], 'max_routes': 1}
+    (workdir / 'autodarts_config.json').write_text(json.dumps(config), encoding='utf-8')
+    assert CheckoutSolver().suggest(52, darts=2, limit=1)['routes'] == [['S12', 'D20']]
+    solver = CheckoutSolver.from_config()
+    assert solver.max_routes == 1
+    assert solver.suggest(52, darts=2)['routes'] == [['S20', 'D16']]
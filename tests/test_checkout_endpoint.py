@@ -0,0 +1,21 @@
+from autodarts_bridge_engine import AutodartsBridgeEngine
+
+
+def test_checkout_limit_must_be_positive(workdir):
+    engine = AutodartsBridgeEngine({'sources': {}})
+    try:
+        assert engine.get_checkout(170, 'limit=0') is None
+        assert engine.get_checkout(170, 'limit=-1') is None
+        assert len(engine.get_checkout(100, 'limit=2')['routes']) == 2
+    finally:
+        engine.close()
+
+
+def test_checkout_path_with_unicode_digits_is_400(get):
+    for remaining in ('%C2%B2', '²', '٣', '1٣', 'abc', ''):
+        status, body = get(f'/checkout/{remaining}')
+        assert status == 400
+        assert body['success'] is False
+    status, body = get('/checkout/170')
+    assert status == 200
+    assert body['routes'][0] == ['T20', 'T20', '50']
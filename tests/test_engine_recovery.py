@@ -0,0 +1,50 @@
+import time
+
+from autodarts_bridge_engine import AutodartsBridgeEngine
+from autodarts_journal import ThrowJournal
+from autodarts_score_history import ScoreHistory
+
+
+def make_engine():
+    return AutodartsBridgeEngine({'sources': {'manual': {}}})
+
+
+def test_restart_restores_stats_from_journal(workdir):
+    engine = make_engine()
+    for segment in ('T20', 'T20', 'T20', 'S5', 'D16', 'S1', 'T19', '25', 'S3'):
+        engine.add_score(segment)
+    before = engine.stats.to_dict()
+    engine.close()
+
+    engine = make_engine()
+    try:
+        scores = engine.score_history.to_list()
+        stats = engine.stats.to_dict()
+        assert len(scores) == 9
+        assert stats['count'] == len(scores)
+        assert stats['sum'] == sum(entry['score'] for entry in scores)
+        assert stats['visits'] == before['visits'] == 3
+        assert stats['180'] == 1
+        assert stats['three_dart_average'] == before['three_dart_average']
+        assert stats['since'] == scores[0]['timestamp']
+    finally:
+        engine.close()
+
+
+def test_restart_restores_windows_with_original_timestamps(workdir):
+    journal = ThrowJournal(str(workdir / 'journal' / 'engine'))
+    journal.recover(ScoreHistory())
+    two_hours_ago = time.time() - 2 * 3600
+    for seq, score in enumerate((60, 20, 1), start=1):
+        journal.append({'seq': seq, 'timestamp': two_hours_ago + seq, 'score': score, 'source': 'manual'})
+    journal.close()
+
+    engine = make_engine()
+    try:
+        assert engine.windows.window('1h')['count'] == 0
+        last_three_hours = engine.windows.window('3h')
+        assert last_three_hours['count'] == 3
+        assert last_three_hours['sum'] == 81
+        assert last_three_hours['visits'] == 1
+    finally:
+        engine.close()
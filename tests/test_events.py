@@ -0,0 +1,80 @@
+import io
+from http.client import HTTPMessage
+
+from autodarts_events import EventBus, stream_events
+
+
+class _Stream(io.BytesIO):
+    """wfile, das nach dem ersten Durchlauf der Event-Schleife die Verbindung abbricht"""
+
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        if self.flushes > 1:
+            raise BrokenPipeError
+
+
+class _Handler:
+    def __init__(self, last_event_id=None):
+        self.headers = HTTPMessage()
+        if last_event_id is not None:
+            self.headers['Last-Event-ID'] = last_event_id
+        self.wfile = _Stream()
+
+    def send_response(self, code):
+        pass
+
+    def send_header(self, name, value):
+        pass
+
+    def end_headers(self):
+        pass
+
+
+def stream(bus, last_event_id=None):
+    handler = _Handler(last_event_id)
+    stream_events(handler, bus, heartbeat=0.01)
+    return handler.wfile.getvalue().decode('utf-8')
+
+
+def test_event_ids_carry_the_epoch():
+    bus = EventBus()
+    event = bus.publish('score', {'score': 60})
+    assert event.id == 1
+    assert f"id: {bus.epoch}-1\n".encode('utf-8') in event.frame
+
+
+def test_resume_within_the_same_process():
+    bus = EventBus()
+    for score in (20, 60, 5):
+        bus.publish('score', {'score': score})
+    body = stream(bus, f"{bus.epoch}-1")
+    assert 'event: resync' not in body
+    assert f"id: {bus.epoch}-1\n" not in body
+    assert f"id: {bus.epoch}-2\n" in body and f"id: {bus.epoch}-3\n" in body
+
+
+def test_resume_after_restart_sends_resync_and_the_backlog():
+    old = EventBus()
+    for score in range(5):
+        old.publish('score', {'score': score})
+    old_id = f"{old.epoch}-5"
+
+    restarted = EventBus()
+    restarted.epoch = old.epoch + '0'
+    restarted.publish('score', {'score': 60})
+    body = stream(restarted, old_id)
+    assert body.count('event: resync') == 1
+    assert '"restarted": true' in body
+    assert f"id: {restarted.epoch}-1\n" in body
+
+
+def test_plain_id_ahead_of_the_bus_is_treated_as_restart():
+    bus = EventBus()
+    bus.publish('score', {'score': 60})
+    body = stream(bus, '42')
+    assert body.count('event: resync') == 1
+    assert f"id: {bus.epoch}-1\n" in body
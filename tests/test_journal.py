@@ -0,0 +1,88 @@
+import os
+
+from autodarts_journal import RECORD_HEADER, ThrowJournal, read_segment
+from autodarts_score_history import ScoreHistory
+
+
+def open_journal(directory, **options):
+    journal = ThrowJournal(str(directory), fsync_interval=60, **options)
+    history = ScoreHistory()
+    journal.recover(history)
+    return journal, history
+
+
+def write(journal, seqs, source='manual'):
+    for seq in seqs:
+        journal.append({'seq': seq, 'timestamp': 1000.0 + seq, 'score': seq % 61, 'source': source})
+    journal.sync()
+
+
+def recovered(directory, **options):
+    journal, history = open_journal(directory, **options)
+    journal.close()
+    return history
+
+
+def test_recover_round_trip(tmp_path):
+    journal, _ = open_journal(tmp_path)
+    write(journal, range(1, 4), 'websocket')
+    write(journal, range(4, 6))
+    journal.close()
+
+    history = recovered(tmp_path)
+    assert [(e['seq'], e['score'], e['source']) for e in history.to_list()] == [
+        (1, 1, 'websocket'), (2, 2, 'websocket'), (3, 3, 'websocket'), (4, 4, 'manual'), (5, 5, 'manual')]
+    assert history.append(60, 'manual')['seq'] == 6
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    journal, _ = open_journal(tmp_path)
+    write(journal, range(1, 4))
+    journal.close()
+    (segment,) = [tmp_path / name for name in os.listdir(tmp_path)]
+    valid = segment.stat().st_size
+    with open(segment, 'ab') as f:
+        f.write(RECORD_HEADER.pack(500, 0) + b'\x01\x02\x03')
+
+    history = recovered(tmp_path)
+    assert [e['seq'] for e in history.to_list()] == [1, 2, 3]
+    assert segment.stat().st_size == valid
+
+
+def test_record_with_bad_crc_is_rejected(tmp_path):
+    journal, _ = open_journal(tmp_path)
+    write(journal, range(1, 3))
+    write(journal, range(3, 5))
+    journal.close()
+    (segment,) = [tmp_path / name for name in os.listdir(tmp_path)]
+    data = bytearray(segment.read_bytes())
+    data[-1] ^= 0xFF
+    segment.write_bytes(bytes(data))
+
+    throws, valid, _ = read_segment(segment)
+    assert [throw[0] for throw in throws] == [1, 2]
+    assert valid < len(data)
+    assert [e['seq'] for e in recovered(tmp_path).to_list()] == [1, 2]
+
+
+def test_segments_rotate_and_old_ones_are_pruned(tmp_path):
+    journal, _ = open_journal(tmp_path, segment_bytes=64, max_segments=3)
+    for first in range(1, 16, 3):
+        write(journal, range(first, first + 3))
+    journal.close()
+
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 3
+    assert names[-1] == 'segment-000000000013.log'
+    seqs = [e['seq'] for e in recovered(tmp_path).to_list()]
+    assert seqs == list(range(int(names[0][8:20]), 16))
+
+
+def test_out_of_order_journal_restores_by_seq(tmp_path):
+    journal, _ = open_journal(tmp_path)
+    write(journal, [1, 3, 2])
+    journal.close()
+
+    history = recovered(tmp_path)
+    assert [(e['seq'], e['score']) for e in history.to_list()] == [(1, 1), (2, 2), (3, 3)]
+    assert history.append(20, 'manual')['seq'] == 4
@@ -0,0 +1,32 @@
+from autodarts_poller import AdaptivePoller
+
+
+def throws(texts):
+    statuses = iter(texts)
+    poller = AdaptivePoller(lambda: next(statuses))
+    return [poller.poll().throw for _ in texts]
+
+
+def test_only_new_throws_count_while_the_marker_stays():
+    assert throws([
+        "Board status: Ready",
+        "Board status: Throw detected (T20), cameras=3",
+        "Board status: Throw detected (T20), cameras=2",
+        "Board status: Throw detected (T20), cameras=3 12:00:01",
+        "Takeout in progress",
+        "Board status: Throw detected (T20), cameras=3",
+    ]) == [False, True, False, False, False, True]
+
+
+def test_equal_scores_with_dart_index_are_two_throws():
+    assert throws([
+        "Board status: Ready",
+        "Throw detected: dart=1 segment=S20",
+        "Throw detected: dart=2 segment=S20",
+        "Throw detected: dart=2 segment=S20 ",
+        "Throw detected: dart=3 segment=D10",
+    ]) == [False, True, True, False, True]
+
+
+def test_throw_in_the_first_status_is_old():
+    assert throws(["Throw detected: segment=T20", "Throw detected: segment=T20 cameras=3"]) == [False, False]
@@ -0,0 +1,33 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('requests')
+
+from autodarts_prober import http_probe, probe_all  # noqa: E402
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(0.6)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_parallel_probes_to_one_host_are_not_limited_by_the_poller_pool(workdir):
+    server = ThreadingHTTPServer(('localhost', 0), _SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://localhost:{server.server_address[1]}"
+        endpoints = [f"/api/{i}" for i in range(12)]
+        found = probe_all(endpoints, lambda endpoint: http_probe(base + endpoint, timeout=2), timeout=3)
+        assert [endpoint for endpoint, _ in found] == endpoints
+    finally:
+        server.shutdown()
@@ -0,0 +1,19 @@
+import time
+
+from autodarts_response_cache import MAX_WAIT, _wait_seconds
+
+
+class _Handler:
+    def __init__(self, path, deadline=None):
+        self.path = path
+        self.deadline = deadline
+
+
+def test_long_poll_is_not_capped_by_the_request_deadline():
+    handler = _Handler('/status?wait=25', deadline=time.monotonic() + 10)
+    assert _wait_seconds(handler) == 25.0
+
+
+def test_long_poll_is_capped_by_max_wait():
+    assert _wait_seconds(_Handler('/status?wait=600')) == MAX_WAIT
+    assert _wait_seconds(_Handler('/status?wait=abc')) == 0.0
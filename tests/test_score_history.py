@@ -0,0 +1,91 @@
+import logging
+
+from autodarts_score_history import (BYTES_PER_THROW, DEFAULT_PAGE_LIMIT, UNKNOWN_SOURCE, ScoreHistory,
+                                    parse_cursor_query)
+
+
+def fill(history, n, source='manual'):
+    return [history.append(seq % 61, source, timestamp=1000.0 + seq) for seq in range(1, n + 1)]
+
+
+def test_column_layout_is_13_bytes_per_throw():
+    history = ScoreHistory(100)
+    assert BYTES_PER_THROW == 13
+    assert history._scores.itemsize + history._timestamps.itemsize + history._sources.itemsize == 13
+    assert history.nbytes() == 1300
+
+
+def test_ring_buffer_wraps_and_keeps_the_newest():
+    history = ScoreHistory(5)
+    entries = fill(history, 12)
+    assert [entry['seq'] for entry in entries] == list(range(1, 13))
+    assert len(history) == 5
+    assert history.to_list() == entries[-5:]
+    assert history.last(2) == entries[-2:]
+    assert history.latest() == entries[-1]
+    assert history.last_seq() == 12
+    assert history.append(60, 'manual')['seq'] == 13
+
+
+def test_restore_continues_the_sequence():
+    history = ScoreHistory(3)
+    history.restore([(seq, 1000.0 + seq, seq, 'websocket') for seq in range(7, 12)])
+    assert [entry['seq'] for entry in history.to_list()] == [9, 10, 11]
+    assert history.append(20, 'manual')['seq'] == 12
+
+
+def test_source_table_overflow_is_logged_once(caplog):
+    history = ScoreHistory(1000)
+    for i in range(255):
+        history.append(1, f'source-{i}')
+    with caplog.at_level(logging.WARNING):
+        history.append(1, 'one-too-many')
+        history.append(2, 'one-too-many')
+    assert history.latest()['source'] == UNKNOWN_SOURCE
+    assert history.last(2)[0]['source'] == UNKNOWN_SOURCE
+    assert len([record for record in caplog.records if 'one-too-many' in record.getMessage()]) == 1
+    assert history.last(3)[0]['source'] == 'source-254'
+
+
+def test_since_returns_new_throws_in_pages():
+    history = ScoreHistory(100)
+    entries = fill(history, 10)
+    page = history.since(3, limit=4)
+    assert page['scores'] == entries[3:7]
+    assert page['next'] == 7
+    assert page['truncated'] is False
+    assert history.since(page['next'], limit=100)['scores'] == entries[7:]
+
+
+def test_since_current_cursor_is_empty():
+    history = ScoreHistory(100)
+    fill(history, 10)
+    page = history.since(10)
+    assert page['scores'] == []
+    assert page['next'] == 10
+    assert page['truncated'] is False
+
+
+def test_since_stale_cursor_starts_at_the_oldest_and_is_truncated():
+    history = ScoreHistory(5)
+    entries = fill(history, 12)
+    page = history.since(2)
+    assert page['truncated'] is True
+    assert page['scores'] == entries[-5:]
+    assert page['count'] == 5
+    assert history.since(7)['truncated'] is False
+
+
+def test_since_cursor_ahead_of_the_history_is_empty():
+    history = ScoreHistory(5)
+    fill(history, 3)
+    page = history.since(50)
+    assert page['scores'] == []
+    assert page['next'] == 3
+    assert page['truncated'] is False
+
+
+def test_parse_cursor_query():
+    assert parse_cursor_query('') is None
+    assert parse_cursor_query('since=5&limit=20') == (5, 20)
+    assert parse_cursor_query('since=-3&limit=x') == (0, DEFAULT_PAGE_LIMIT)
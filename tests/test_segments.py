@@ -0,0 +1,34 @@
+import pytest
+
+from autodarts_segments import BULLSEYE, MISS, SEGMENTS, SINGLE_BULL, lookup, segment_points
+
+
+@pytest.mark.parametrize('number', range(1, 21))
+def test_single_double_treble(number):
+    for prefix, multiplier in (('S', 1), ('D', 2), ('T', 3)):
+        segment = SEGMENTS[f'{prefix}{number}']
+        assert (segment.number, segment.multiplier, segment.points) == (number, multiplier, number * multiplier)
+    assert lookup(str(number)) is SEGMENTS[f'S{number}']
+
+
+def test_bull_and_miss_aliases():
+    for alias in ('25', 'S25', 'SB', 'SBULL', 'OB', 'OUTER'):
+        assert lookup(alias) is SINGLE_BULL
+    for alias in ('50', 'D25', 'DB', 'BULL', 'DBULL', 'BULLSEYE', 'IB', 'INNER'):
+        assert lookup(alias) is BULLSEYE
+    for alias in ('M', 'MISS', '0', 'S0'):
+        assert lookup(alias) is MISS
+    assert (SINGLE_BULL.points, BULLSEYE.points, MISS.points) == (25, 50, 0)
+
+
+def test_lookup_ignores_case_and_whitespace():
+    assert lookup(' t20 ') is SEGMENTS['T20']
+    assert lookup('Bull') is SEGMENTS['50']
+
+
+def test_invalid_labels():
+    for label in ('T25', 'D21', 'T0', 'X5', '', '21'):
+        assert lookup(label) is None
+    assert segment_points('T20') == 60
+    assert segment_points('BULL') == 50
+    assert segment_points('T25') is None
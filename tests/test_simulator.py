@@ -0,0 +1,26 @@
+import threading
+
+from autodarts_simulator import DartSimulator, player_model
+from autodarts_throws import VisitTracker
+
+
+def test_stream_ends_the_turn_when_the_tracker_closes_the_visit():
+    tracker = VisitTracker(start_score=40)
+    simulator = DartSimulator([player_model('a'), player_model('b')], seed=1, speed=0)
+    stop = threading.Event()
+    turns = []
+    for seq, dart in enumerate(simulator.stream(stop, turn_over=lambda model: tracker.open_visit(model.name) is None)):
+        entry = {'seq': seq, 'timestamp': float(seq), 'score': dart.segment.points}
+        tracker.ingest(entry, dart.segment.label, dart.player)
+        if not turns or turns[-1][0] != dart.player:
+            turns.append([dart.player, 0])
+        turns[-1][1] += 1
+        if seq >= 200:
+            stop.set()
+
+    visits = tracker.to_list()
+    closed = [visit for visit in visits if visit['closed']]
+    assert any(visit['bust'] or visit['checkout'] for visit in closed)
+    assert any(visit['dart_count'] < 3 for visit in closed)
+    # Jede Aufnahme ist genau ein Zug des Simulators
+    assert [(visit['player'], visit['dart_count']) for visit in visits] == [tuple(turn) for turn in turns]
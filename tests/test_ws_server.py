@@ -0,0 +1,74 @@
+import socket
+import struct
+import time
+
+from autodarts_events import EventBus
+from autodarts_ws_server import CLOSE_MESSAGE_TOO_BIG, OPCODE_CLOSE, OPCODE_PING, OPCODE_PONG, BroadcastServer
+
+
+UPGRADE = (b"GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+           b"Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\nSec-WebSocket-Version: 13\r\n\r\n")
+
+
+def connect(port, first_frame=b''):
+    sock = socket.create_connection(('localhost', port), timeout=5)
+    sock.sendall(UPGRADE + first_frame)
+    response = b''
+    while b'\r\n\r\n' not in response:
+        response += sock.recv(1024)
+    head, _, rest = response.partition(b'\r\n\r\n')
+    assert head.startswith(b'HTTP/1.1 101')
+    return sock, rest
+
+
+def masked(opcode, payload, mask=b'\x01\x02\x03\x04'):
+    data = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return struct.pack('!BB', 0x80 | opcode, 0x80 | len(payload)) + mask + data
+
+
+def test_oversized_frame_is_closed_with_1009(workdir):
+    server = BroadcastServer(EventBus(), port=0, max_frame_bytes=1024)
+    assert server.start()
+    try:
+        sock, _ = connect(server._server_socket.getsockname()[1])
+        # Ping mit angeblich 1 TiB Nutzdaten, die nie gesendet werden
+        sock.sendall(struct.pack('!BBQ', 0x89, 0x80 | 127, 1 << 40))
+        frame = sock.recv(16)
+        assert frame[0] == 0x80 | OPCODE_CLOSE
+        assert struct.unpack('!H', frame[2:4])[0] == CLOSE_MESSAGE_TOO_BIG
+        try:
+            assert sock.recv(16) == b''
+        except ConnectionResetError:
+            pass
+        sock.close()
+    finally:
+        server.stop()
+
+
+def test_silent_client_is_dropped_after_the_handshake_timeout(workdir):
+    server = BroadcastServer(EventBus(), port=0, handshake_timeout=0.2)
+    assert server.start()
+    try:
+        sock = socket.create_connection(('localhost', server._server_socket.getsockname()[1]), timeout=5)
+        start = time.monotonic()
+        try:
+            assert sock.recv(16) == b''
+        except ConnectionResetError:
+            pass
+        assert time.monotonic() - start < 2
+        sock.close()
+    finally:
+        server.stop()
+
+
+def test_frame_sent_with_the_upgrade_is_read(workdir):
+    server = BroadcastServer(EventBus(), port=0)
+    assert server.start()
+    try:
+        sock, rest = connect(server._server_socket.getsockname()[1], masked(OPCODE_PING, b'hi'))
+        while len(rest) < 4:
+            rest += sock.recv(16)
+        assert rest[:4] == bytes((0x80 | OPCODE_PONG, 2)) + b'hi'
+        sock.close()
+    finally:
+        server.stop()